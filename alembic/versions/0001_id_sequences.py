@@ -0,0 +1,46 @@
+"""id sequences
+
+Revision ID: 0001_id_sequences
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_id_sequences'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (sequence, table, prefix)
+ID_SEQUENCES = [
+    ("user_id_seq", "users", "USR"),
+    ("admin_id_seq", "admin_users", "ADM"),
+    ("security_officer_id_seq", "security_officers", "SEC"),
+    ("visitor_id_seq", "visitors", "VIS"),
+    ("booking_id_seq", "bookings", "BK"),
+    ("checkin_id_seq", "checkins", "CHK"),
+    ("laptop_record_id_seq", "laptop_records", "LAP"),
+]
+
+
+def upgrade() -> None:
+    for sequence, table, prefix in ID_SEQUENCES:
+        op.execute(f"CREATE SEQUENCE IF NOT EXISTS {sequence}")
+        # Continue numbering after the highest existing numeric suffix (USR-1000 > USR-999)
+        op.execute(
+            f"SELECT setval('{sequence}', COALESCE(("
+            f"SELECT max(CAST(split_part(id, '-', 2) AS bigint)) FROM {table} "
+            f"WHERE id ~ '^{prefix}-[0-9]+$'), 0) + 1, false)"
+        )
+
+
+def downgrade() -> None:
+    for sequence, _, _ in ID_SEQUENCES:
+        op.execute(f"DROP SEQUENCE IF EXISTS {sequence}")
@@ -0,0 +1,35 @@
+"""user search trigram indexes
+
+Revision ID: 0002_user_search_indexes
+Revises: 0001_id_sequences
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_user_search_indexes'
+down_revision: Union[str, None] = '0001_id_sequences'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Must match USER_FULL_NAME in app/db/models.py for the planner to use it
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_full_name_trgm ON users "
+        "USING gin ((first_name || ' ' || last_name) gin_trgm_ops)"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_users_email_trgm ON users USING gin (email gin_trgm_ops)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_users_phone_trgm ON users USING gin (phone gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_users_phone_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_users_email_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_users_full_name_trgm")
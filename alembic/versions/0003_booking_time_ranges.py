@@ -0,0 +1,56 @@
+"""booking time ranges and overlap constraint
+
+Revision ID: 0003_booking_time_ranges
+Revises: 0002_user_search_indexes
+Create Date: 2026-10-17 11:00:00.000000
+
+Adds typed starts_at/ends_at columns next to the legacy "HH:MM" strings,
+backfills them, and adds an exclusion constraint so no two confirmed
+bookings of a space overlap. Existing overlapping confirmed bookings must be
+cancelled first, otherwise the constraint cannot be created.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_booking_time_ranges'
+down_revision: Union[str, None] = '0002_user_search_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('bookings', sa.Column('starts_at', sa.DateTime(), nullable=True))
+    op.add_column('bookings', sa.Column('ends_at', sa.DateTime(), nullable=True))
+
+    # Bookings without usable times cover the whole day
+    op.execute(
+        """
+        UPDATE bookings SET
+            starts_at = date_trunc('day', booking_date) + CASE
+                WHEN start_time ~ '^[0-9]{1,2}:[0-9]{2}$' THEN start_time::time
+                ELSE time '00:00' END,
+            ends_at = date_trunc('day', booking_date) + CASE
+                WHEN end_time ~ '^[0-9]{1,2}:[0-9]{2}$' AND end_time::time > COALESCE(
+                    CASE WHEN start_time ~ '^[0-9]{1,2}:[0-9]{2}$' THEN start_time::time END, time '00:00')
+                THEN end_time::time
+                ELSE interval '1 day' END
+        """
+    )
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    # Enum columns store member names, hence 'CONFIRMED'
+    op.execute(
+        "ALTER TABLE bookings ADD CONSTRAINT ex_bookings_space_time "
+        "EXCLUDE USING gist (space_id WITH =, tsrange(starts_at, ends_at) WITH &&) "
+        "WHERE (status = 'CONFIRMED')"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE bookings DROP CONSTRAINT IF EXISTS ex_bookings_space_time")
+    op.drop_column('bookings', 'ends_at')
+    op.drop_column('bookings', 'starts_at')
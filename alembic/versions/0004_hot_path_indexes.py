@@ -0,0 +1,64 @@
+"""hot path indexes for checkins, bookings and laptop_records
+
+Revision ID: 0004_hot_path_indexes
+Revises: 0003_booking_time_ranges
+Create Date: 2026-10-17 14:00:00.000000
+
+Foreign key, composite and partial (open check-in) indexes for the queries
+behind bookings, availability, the security desk roster and reporting.
+Built CONCURRENTLY so the entrance check-in path keeps writing meanwhile;
+check_query_plans.py verifies the planner picks them up.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_hot_path_indexes'
+down_revision: Union[str, None] = '0003_booking_time_ranges'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN = "status = 'CHECKED_IN'"
+
+# (name, table, columns, partial WHERE clause)
+INDEXES = [
+    ('ix_users_building_id', 'users', ['building_id'], None),
+    ('ix_visitors_host_employee_id', 'visitors', ['host_employee_id'], None),
+    ('ix_floors_building_id', 'floors', ['building_id'], None),
+    ('ix_blocks_floor_id', 'blocks', ['floor_id'], None),
+    ('ix_spaces_building_floor_block', 'spaces', ['building_id', 'floor', 'block'], None),
+    ('ix_bookings_space_booking_date', 'bookings', ['space_id', 'booking_date'], None),
+    ('ix_bookings_user_starts_at', 'bookings', ['user_id', 'starts_at'], None),
+    ('ix_checkins_user_id', 'checkins', ['user_id'], None),
+    ('ix_checkins_visitor_id', 'checkins', ['visitor_id'], None),
+    ('ix_checkins_building_check_in_time', 'checkins', ['building_id', 'check_in_time'], None),
+    ('ix_checkins_open_building', 'checkins', ['building_id', 'check_in_time'], OPEN),
+    ('ix_checkins_open_user', 'checkins', ['user_id'], OPEN),
+    ('ix_checkins_open_visitor', 'checkins', ['visitor_id'], OPEN),
+    ('ix_laptop_records_user_check_in_date', 'laptop_records', ['user_id', 'check_in_date'], None),
+    ('ix_laptop_records_building_check_in_date', 'laptop_records', ['building_id', 'check_in_date'], None),
+    ('ix_laptop_records_open_user', 'laptop_records', ['user_id'], OPEN),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+        for table in ('users', 'visitors', 'floors', 'blocks', 'spaces', 'bookings', 'checkins', 'laptop_records'):
+            op.execute(f'ANALYZE {table}')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
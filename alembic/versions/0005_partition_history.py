@@ -0,0 +1,137 @@
+"""monthly partitions for checkins and laptop_records
+
+Revision ID: 0005_partition_history
+Revises: 0004_hot_path_indexes
+Create Date: 2026-10-17 16:00:00.000000
+
+Rebuilds both history tables as RANGE-partitioned tables (one partition per
+month plus a DEFAULT catch-all) and copies the existing rows over. The
+partition key joins the primary key, as Postgres requires. Runs in one
+transaction and holds exclusive locks while copying, so schedule it in a
+quiet window. archive_history.py keeps partitions created ahead and moves
+expired months to cold storage, recorded in archived_partitions.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_partition_history'
+down_revision: Union[str, None] = '0004_hot_path_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN = "status = 'CHECKED_IN'"
+MONTHS_AHEAD = 3
+
+# table -> (partition key, foreign keys, indexes as (name, columns, partial WHERE))
+TABLES = {
+    'checkins': (
+        'check_in_time',
+        [('user_id', 'users'), ('visitor_id', 'visitors'), ('building_id', 'buildings')],
+        [
+            ('ix_checkins_id', ['id'], None),
+            ('ix_checkins_user_id', ['user_id'], None),
+            ('ix_checkins_visitor_id', ['visitor_id'], None),
+            ('ix_checkins_building_check_in_time', ['building_id', 'check_in_time'], None),
+            ('ix_checkins_open_building', ['building_id', 'check_in_time'], OPEN),
+            ('ix_checkins_open_user', ['user_id'], OPEN),
+            ('ix_checkins_open_visitor', ['visitor_id'], OPEN),
+        ],
+    ),
+    'laptop_records': (
+        'check_in_date',
+        [('user_id', 'users'), ('building_id', 'buildings')],
+        [
+            ('ix_laptop_records_id', ['id'], None),
+            ('ix_laptop_records_user_check_in_date', ['user_id', 'check_in_date'], None),
+            ('ix_laptop_records_building_check_in_date', ['building_id', 'check_in_date'], None),
+            ('ix_laptop_records_open_user', ['user_id'], OPEN),
+        ],
+    ),
+}
+
+
+def _create_monthly_partitions(table: str, key: str, source: str) -> None:
+    # One partition per month from the oldest row in `source` until MONTHS_AHEAD months from now
+    op.execute(f"""
+        DO $$
+        DECLARE month date;
+        BEGIN
+            FOR month IN SELECT generate_series(
+                date_trunc('month', COALESCE((SELECT min({key}) FROM {source}), now())),
+                date_trunc('month', now()) + interval '{MONTHS_AHEAD} months',
+                interval '1 month'
+            )::date LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                    '{table}_y' || to_char(month, 'YYYY') || 'm' || to_char(month, 'MM'),
+                    month, (month + interval '1 month')::date
+                );
+            END LOOP;
+        END $$
+    """)
+
+
+def _create_indexes(table: str, indexes) -> None:
+    for name, columns, where in indexes:
+        op.create_index(name, table, columns, postgresql_where=sa.text(where) if where else None)
+
+
+def upgrade() -> None:
+    for table, (key, foreign_keys, indexes) in TABLES.items():
+        legacy = f'{table}_legacy'
+        op.rename_table(table, legacy)
+        op.execute(f'ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey')
+        for name, _, _ in indexes:
+            op.execute(f'DROP INDEX IF EXISTS {name}')
+
+        op.execute(
+            f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+            f'PARTITION BY RANGE ({key})'
+        )
+        op.create_primary_key(f'{table}_pkey', table, ['id', key])
+        for column, target in foreign_keys:
+            op.create_foreign_key(f'{table}_{column}_fkey', table, target, [column], ['id'])
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+        _create_monthly_partitions(table, key, legacy)
+
+        op.execute(f'INSERT INTO {table} SELECT * FROM {legacy}')
+        op.drop_table(legacy)
+        _create_indexes(table, indexes)
+        op.execute(f'ANALYZE {table}')
+
+    op.create_table(
+        'archived_partitions',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('table_name', sa.String(100), nullable=False),
+        sa.Column('partition_name', sa.String(100), nullable=False, unique=True),
+        sa.Column('range_start', sa.DateTime(), nullable=False),
+        sa.Column('range_end', sa.DateTime(), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=False),
+        sa.Column('blob_key', sa.String(500), nullable=False),
+        sa.Column('archived_at', sa.DateTime()),
+    )
+
+
+def downgrade() -> None:
+    # Archived months are not restored; load them back from their Parquet files if needed
+    op.drop_table('archived_partitions')
+
+    for table, (key, foreign_keys, indexes) in TABLES.items():
+        partitioned = f'{table}_partitioned'
+        op.rename_table(table, partitioned)
+        op.execute(f'ALTER TABLE {partitioned} RENAME CONSTRAINT {table}_pkey TO {partitioned}_pkey')
+        for name, _, _ in indexes:
+            op.execute(f'DROP INDEX IF EXISTS {name}')
+
+        op.execute(f'CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        op.create_primary_key(f'{table}_pkey', table, ['id'])
+        op.execute(f'INSERT INTO {table} SELECT * FROM {partitioned}')
+        # Drops the partitions (and their foreign keys) with it
+        op.execute(f'DROP TABLE {partitioned} CASCADE')
+        for column, target in foreign_keys:
+            op.create_foreign_key(f'{table}_{column}_fkey', table, target, [column], ['id'])
+        _create_indexes(table, indexes)
@@ -0,0 +1,63 @@
+"""occupancy rollup tables
+
+Revision ID: 0006_occupancy_rollups
+Revises: 0005_partition_history
+Create Date: 2026-10-17 18:00:00.000000
+
+Hourly and daily occupancy aggregates per building/floor plus the watermarks
+app/services/rollups.py uses to fold new rows in incrementally. The first
+refresh_rollups.py run after this backfills all history.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_occupancy_rollups'
+down_revision: Union[str, None] = '0005_partition_history'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _measures():
+    return [
+        sa.Column('check_ins', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('check_outs', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('bookings', sa.Integer(), nullable=False, server_default='0'),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'occupancy_hourly',
+        sa.Column('building_id', sa.String(50), primary_key=True),
+        sa.Column('floor', sa.String(100), primary_key=True),
+        sa.Column('hour', sa.DateTime(), primary_key=True),
+        *_measures(),
+    )
+    op.create_table(
+        'occupancy_daily',
+        sa.Column('building_id', sa.String(50), primary_key=True),
+        sa.Column('floor', sa.String(100), primary_key=True),
+        sa.Column('day', sa.DateTime(), primary_key=True),
+        *_measures(),
+    )
+    op.create_table(
+        'rollup_watermarks',
+        sa.Column('source', sa.String(50), primary_key=True),
+        sa.Column('value', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+    # Watermark columns of the sources
+    op.create_index('ix_checkins_check_out_time', 'checkins', ['check_out_time'])
+    op.create_index('ix_bookings_created_at', 'bookings', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bookings_created_at', table_name='bookings')
+    op.drop_index('ix_checkins_check_out_time', table_name='checkins')
+    op.drop_table('rollup_watermarks')
+    op.drop_table('occupancy_daily')
+    op.drop_table('occupancy_hourly')
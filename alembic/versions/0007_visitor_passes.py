@@ -0,0 +1,34 @@
+"""visitor pre-registration passes
+
+Revision ID: 0007_visitor_passes
+Revises: 0006_occupancy_rollups
+Create Date: 2026-10-17 19:00:00.000000
+
+Access token (looked up on every kiosk scan, hence the unique index), expected
+arrival and pass expiry on visitors.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_visitor_passes'
+down_revision: Union[str, None] = '0006_occupancy_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('visitors', sa.Column('access_token', sa.String(64), nullable=True))
+    op.add_column('visitors', sa.Column('expected_at', sa.DateTime(), nullable=True))
+    op.add_column('visitors', sa.Column('pass_expires_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_visitors_access_token', 'visitors', ['access_token'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_visitors_access_token', table_name='visitors')
+    op.drop_column('visitors', 'pass_expires_at')
+    op.drop_column('visitors', 'expected_at')
+    op.drop_column('visitors', 'access_token')
@@ -0,0 +1,30 @@
+"""users.created_at NOT NULL
+
+Revision ID: 0008_users_created_at_not_null
+Revises: 0007_visitor_passes
+Create Date: 2026-10-18 09:00:00.000000
+
+The user directory pages on (created_at, id), which needs a value on every
+row. Rows created before the column had a default get their updated_at (or
+the migration time) as creation time.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_users_created_at_not_null'
+down_revision: Union[str, None] = '0007_visitor_passes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE users SET created_at = COALESCE(updated_at, CURRENT_TIMESTAMP) WHERE created_at IS NULL")
+    op.alter_column('users', 'created_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('users', 'created_at', existing_type=sa.DateTime(), nullable=True)
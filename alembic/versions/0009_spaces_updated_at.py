@@ -0,0 +1,29 @@
+"""spaces.updated_at
+
+Revision ID: 0009_spaces_updated_at
+Revises: 0008_users_created_at_not_null
+Create Date: 2026-10-18 10:00:00.000000
+
+Part of the availability grid ETag, so renames and attribute edits of a
+space invalidate cached grids on every worker.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009_spaces_updated_at'
+down_revision: Union[str, None] = '0008_users_created_at_not_null'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('spaces', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE spaces SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)")
+
+
+def downgrade() -> None:
+    op.drop_column('spaces', 'updated_at')
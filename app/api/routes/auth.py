@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import undefer
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from typing import Optional
-from app.db.database import get_db
+from app.db.database import get_async_db
+from app.core.ids import id_allocator
 from app.db.models import User, AdminUser, SecurityOfficer
 from app.schemas.auth import Token, AdminLogin, SecurityLogin, UserLogin, PasswordResetRequest
 from app.schemas.users import UserCreate, UserResponse
@@ -14,23 +17,18 @@ router = APIRouter(prefix="/api/v1/auth")
 
 # Security officer registration endpoint
 @router.post("/security/register", status_code=status.HTTP_201_CREATED)
-async def register_security_officer(officer_data: SecurityRegister, db: Session = Depends(get_db)):
+async def register_security_officer(officer_data: SecurityRegister, db: AsyncSession = Depends(get_async_db)):
     """Register a new security officer"""
     # Check if badge number already exists
-    existing = db.query(SecurityOfficer).filter(SecurityOfficer.badge_number == officer_data.badge_number).first()
+    existing = await db.scalar(select(SecurityOfficer).where(SecurityOfficer.badge_number == officer_data.badge_number))
     if existing:
         raise HTTPException(status_code=400, detail="Badge number already registered")
 
     # Generate security officer ID
-    last_officer = db.query(SecurityOfficer).order_by(SecurityOfficer.id.desc()).first()
-    if last_officer:
-        last_num = int(last_officer.id.split("-")[1])
-        officer_id = f"SEC-{last_num + 1:03d}"
-    else:
-        officer_id = "SEC-001"
+    officer_id = await id_allocator.next_id(db, "SEC")
 
-    from app.core.security import get_password_hash
-    hashed_pin = get_password_hash(officer_data.pin)
+    from app.core.security import get_password_hash_async
+    hashed_pin = await get_password_hash_async(officer_data.pin)
 
     new_officer = SecurityOfficer(
         id=officer_id,
@@ -41,8 +39,8 @@ async def register_security_officer(officer_data: SecurityRegister, db: Session
         is_active=officer_data.is_active
     )
     db.add(new_officer)
-    db.commit()
-    db.refresh(new_officer)
+    await db.commit()
+    await db.refresh(new_officer)
     return {
         "id": new_officer.id,
         "badge_number": new_officer.badge_number,
@@ -56,11 +54,11 @@ async def register_security_officer(officer_data: SecurityRegister, db: Session
 
 # Admin registration endpoint
 @router.post("/admin/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register_admin(admin_data: AdminCreate, db: Session = Depends(get_db)):
+async def register_admin(admin_data: AdminCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new admin user (admin creation)"""
 
     # Check if email already exists
-    existing_admin = db.query(AdminUser).filter(AdminUser.email == admin_data.email).first()
+    existing_admin = await db.scalar(select(AdminUser).where(AdminUser.email == admin_data.email))
     if existing_admin:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -68,15 +66,10 @@ async def register_admin(admin_data: AdminCreate, db: Session = Depends(get_db))
         )
 
     # Generate admin ID
-    last_admin = db.query(AdminUser).order_by(AdminUser.id.desc()).first()
-    if last_admin:
-        last_num = int(last_admin.id.split("-")[1])
-        admin_id = generate_id("ADM", last_num + 1)
-    else:
-        admin_id = generate_id("ADM", 1)
+    admin_id = await id_allocator.next_id(db, "ADM")
 
     # Create new admin
-    hashed_password = get_password_hash(admin_data.password)
+    hashed_password = await get_password_hash_async(admin_data.password)
 
     new_admin = AdminUser(
         id=admin_id,
@@ -89,26 +82,33 @@ async def register_admin(admin_data: AdminCreate, db: Session = Depends(get_db))
     )
 
     db.add(new_admin)
-    db.commit()
-    db.refresh(new_admin)
+    await db.commit()
+    await db.refresh(new_admin)
 
     # Return as UserResponse for consistency (id, email, etc.)
     return new_admin
 from app.core.security import (
-    verify_password,
-    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
     create_access_token,
-    decode_access_token,
-    generate_id,
-    is_admin
+    is_admin,
+    is_security_staff
 )
+from app.core.principals import (
+    admin_cache,
+    decode_access_token_cached,
+    restore,
+    snapshot,
+    user_cache,
+)
+from app.services.user_events import user_changed
 from app.core.config import settings
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """Get current authenticated user from JWT token"""
     credentials_exception = HTTPException(
@@ -117,7 +117,7 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    payload = decode_access_token(token)
+    payload = decode_access_token_cached(token)
     if payload is None:
         raise credentials_exception
 
@@ -125,16 +125,22 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
+    # Served from the per-worker snapshot cache when possible (see app.core.principals)
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return restore(User, cached)
+
+    user = await db.get(User, user_id)
     if user is None:
         raise credentials_exception
 
+    user_cache.set(user_id, snapshot(user))
     return user
 
 
 async def get_current_admin(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> AdminUser:
     """Get current authenticated admin from JWT token"""
     credentials_exception = HTTPException(
@@ -143,7 +149,7 @@ async def get_current_admin(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    payload = decode_access_token(token)
+    payload = decode_access_token_cached(token)
     if payload is None:
         raise credentials_exception
 
@@ -158,10 +164,15 @@ async def get_current_admin(
     if admin_id is None:
         raise credentials_exception
 
-    admin = db.query(AdminUser).filter(AdminUser.id == admin_id).first()
+    cached = admin_cache.get(admin_id)
+    if cached is not None:
+        return restore(AdminUser, cached)
+
+    admin = await db.get(AdminUser, admin_id)
     if admin is None:
         raise credentials_exception
 
+    admin_cache.set(admin_id, snapshot(admin))
     return admin
 
 
@@ -173,19 +184,29 @@ async def get_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    payload = decode_access_token(token)
+    payload = decode_access_token_cached(token)
     if payload is None:
         raise credentials_exception
 
     return payload
 
 
+async def require_security_staff(token_payload: dict = Depends(get_token_payload)) -> dict:
+    """Token payload of a security officer or admin"""
+    if not is_security_staff(token_payload):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Security officer access required"
+        )
+    return token_payload
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user (self-registration)"""
 
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User.id).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -193,15 +214,10 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
         )
 
     # Generate user ID
-    last_user = db.query(User).order_by(User.id.desc()).first()
-    if last_user:
-        last_num = int(last_user.id.split("-")[1])
-        user_id = generate_id("USR", last_num + 1)
-    else:
-        user_id = generate_id("USR", 1)
+    user_id = await id_allocator.next_id(db, "USR")
 
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
 
     new_user = User(
         id=user_id,
@@ -218,20 +234,23 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    user_changed(None, snapshot(new_user))
 
     return new_user
 
 
 @router.post("/login", response_model=Token)
-async def login_user(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login_user(user_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login user with email/password and return JWT token"""
 
     # Find user by email
-    user = db.query(User).filter(User.email == user_data.email).first()
+    user = await db.scalar(
+        select(User).options(undefer(User.hashed_password)).where(User.email == user_data.email)
+    )
 
-    if not user or not verify_password(user_data.password, user.hashed_password):
+    if not user or not await verify_password_async(user_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -267,12 +286,12 @@ async def login_user(user_data: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/admin/login", response_model=Token)
-async def login_admin(admin_data: AdminLogin, db: Session = Depends(get_db)):
+async def login_admin(admin_data: AdminLogin, db: AsyncSession = Depends(get_async_db)):
     """Admin login"""
 
-    admin = db.query(AdminUser).filter(AdminUser.email == admin_data.email).first()
+    admin = await db.scalar(select(AdminUser).where(AdminUser.email == admin_data.email))
 
-    if not admin or not verify_password(admin_data.password, admin.hashed_password):
+    if not admin or not await verify_password_async(admin_data.password, admin.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -303,14 +322,14 @@ async def login_admin(admin_data: AdminLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/security/login", response_model=Token)
-async def login_security(security_data: SecurityLogin, db: Session = Depends(get_db)):
+async def login_security(security_data: SecurityLogin, db: AsyncSession = Depends(get_async_db)):
     """Security officer login"""
 
-    officer = db.query(SecurityOfficer).filter(
+    officer = await db.scalar(select(SecurityOfficer).where(
         SecurityOfficer.badge_number == security_data.badge_number
-    ).first()
+    ))
 
-    if not officer or not verify_password(security_data.pin, officer.hashed_pin):
+    if not officer or not await verify_password_async(security_data.pin, officer.hashed_pin):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect badge number or PIN"
@@ -342,11 +361,11 @@ async def login_security(security_data: SecurityLogin, db: Session = Depends(get
 @router.post("/password-reset/request")
 async def request_password_reset(
     reset_request: PasswordResetRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Request password reset (sends email in production)"""
 
-    user = db.query(User).filter(User.email == reset_request.email).first()
+    user = await db.scalar(select(User.id).where(User.email == reset_request.email))
 
     if not user:
         # Don't reveal if email exists or not
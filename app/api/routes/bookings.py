@@ -0,0 +1,140 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.db.database import get_async_db
+from app.db.models import Booking, BookingStatus, Space, User
+from app.schemas.bookings import BookingBatchCreate, BookingBatchResponse, BookingCreate, BookingResponse
+from app.api.routes.auth import get_current_user, get_token_payload
+from app.core.security import can_modify_user
+from app.services.bookings import BookingConflict, create_booking, create_bookings, expand_slots, user_bookings_query
+
+router = APIRouter(prefix="/api/v1/bookings")
+
+
+@router.post("/", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
+async def book_space(
+    booking_data: BookingCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """POST /api/v1/bookings - Book a space for the current user"""
+
+    space = await db.get(Space, booking_data.space_id)
+    if not space or not space.is_available:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Space not found"
+        )
+
+    try:
+        return await create_booking(db, current_user.id, booking_data)
+    except BookingConflict:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Space is already booked for this time"
+        )
+
+
+@router.post("/batch", response_model=BookingBatchResponse)
+async def book_spaces_batch(
+    batch: BookingBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+    token_payload: dict = Depends(get_token_payload)
+):
+    """POST /api/v1/bookings/batch - Book many slots (optionally recurring) in one transaction"""
+
+    user_id = batch.user_id or token_payload.get("sub")
+    if not can_modify_user(token_payload, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to book for this user"
+        )
+
+    if not await db.get(User, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    try:
+        occurrences = expand_slots(batch.slots, batch.recurrence)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+
+    space_ids = {slot.space_id for slot in occurrences}
+    bookable = set((await db.scalars(
+        select(Space.id).where(Space.id.in_(space_ids)).where(Space.is_available == True)
+    )).all())
+    if bookable != space_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Space not found: {', '.join(sorted(space_ids - bookable))}"
+        )
+
+    try:
+        results = await create_bookings(
+            db, user_id, occurrences, batch.guest_emails, batch.notify_guests, batch.skip_conflicts
+        )
+    except BookingConflict:
+        # Lost a race with a concurrent booking after the conflict check
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A space was booked concurrently, please retry"
+        )
+
+    response = BookingBatchResponse(
+        created=sum(result.status == "created" for result in results),
+        conflicts=sum(result.status == "conflict" for result in results),
+        results=results,
+    )
+    if response.conflicts and not batch.skip_conflicts:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=response.model_dump(mode="json")
+        )
+    return response
+
+
+@router.get("/me", response_model=List[BookingResponse])
+async def get_my_bookings(
+    upcoming: bool = True,
+    limit: int = Query(100, le=500),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """GET /api/v1/bookings/me - Current user's bookings"""
+
+    return (await db.scalars(user_bookings_query(current_user.id, upcoming).limit(limit))).all()
+
+
+@router.post("/{booking_id}/cancel", response_model=BookingResponse)
+async def cancel_booking(
+    booking_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    token_payload: dict = Depends(get_token_payload)
+):
+    """POST /api/v1/bookings/{id}/cancel - Cancel a booking (owner/admin)"""
+
+    booking = await db.get(Booking, booking_id)
+    if not booking:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Booking not found"
+        )
+
+    if not can_modify_user(token_payload, booking.user_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to cancel this booking"
+        )
+
+    booking.status = BookingStatus.CANCELLED
+    await db.commit()
+    await db.refresh(booking)
+
+    return booking
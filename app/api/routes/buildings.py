@@ -0,0 +1,161 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from app.db.database import get_async_db
+from app.db.models import Block, Building, Floor, Space, SpaceType
+from app.db.projections import rows_to_dicts, select_for
+from app.schemas.bookings import SpaceResponse
+from app.schemas.buildings import BlockResponse, BuildingResponse, BuildingTree, FloorResponse
+from app.core.response_cache import response_cache
+from app.services.hierarchy import building_tree_blobs
+
+router = APIRouter(prefix="/api/v1/buildings")
+
+# Reference data: identical for every caller, served through ResponseCacheMiddleware
+response_cache.cache_paths(r"^/api/v1/buildings/[^/]+/spaces(/|$)", ("buildings", "spaces"))
+response_cache.cache_paths(r"^/api/v1/buildings(/|$)", ("buildings", "floors", "blocks"))
+
+
+async def _require_building(db: AsyncSession, building_id: str) -> None:
+    if not await db.scalar(select(Building.id).where(Building.id == building_id)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Building not found"
+        )
+
+
+@router.get("/", response_model=List[BuildingResponse])
+async def get_buildings(
+    include_inactive: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """GET /api/v1/buildings - All buildings"""
+
+    query = select_for(Building, BuildingResponse).order_by(Building.name, Building.id)
+    if not include_inactive:
+        query = query.where(Building.is_active == True)
+    return rows_to_dicts(await db.execute(query))
+
+
+@router.get("/tree", response_model=List[BuildingTree])
+async def get_building_tree(
+    db: AsyncSession = Depends(get_async_db)
+):
+    """GET /api/v1/buildings/tree - Every active building with its floors and blocks"""
+
+    blobs = await building_tree_blobs(db)
+    return Response(content=b"[" + b",".join(blobs) + b"]", media_type="application/json")
+
+
+@router.get("/{building_id}", response_model=BuildingResponse)
+async def get_building(
+    building_id: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """GET /api/v1/buildings/{id} - One building"""
+
+    building = rows_to_dicts(await db.execute(
+        select_for(Building, BuildingResponse).where(Building.id == building_id)
+    ))
+    if not building:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Building not found"
+        )
+    return building[0]
+
+
+@router.get("/{building_id}/tree", response_model=BuildingTree)
+async def get_single_building_tree(
+    building_id: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """GET /api/v1/buildings/{id}/tree - One building with its floors and blocks"""
+
+    blobs = await building_tree_blobs(db, building_id)
+    if not blobs:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Building not found"
+        )
+    return Response(content=blobs[0], media_type="application/json")
+
+
+@router.get("/{building_id}/floors", response_model=List[FloorResponse])
+async def get_floors(
+    building_id: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """GET /api/v1/buildings/{id}/floors - Floors of a building, in display order"""
+
+    await _require_building(db, building_id)
+    return rows_to_dicts(await db.execute(
+        select_for(Floor, FloorResponse)
+        .where(Floor.building_id == building_id)
+        .order_by(Floor.order, Floor.name)
+    ))
+
+
+@router.get("/{building_id}/floors/{floor_id}/blocks", response_model=List[BlockResponse])
+async def get_blocks(
+    building_id: str,
+    floor_id: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """GET /api/v1/buildings/{id}/floors/{floor_id}/blocks - Blocks of a floor"""
+
+    if not await db.scalar(select(Floor.id).where(Floor.id == floor_id).where(Floor.building_id == building_id)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Floor not found"
+        )
+    return rows_to_dicts(await db.execute(
+        select_for(Block, BlockResponse).where(Block.floor_id == floor_id).order_by(Block.name)
+    ))
+
+
+@router.get("/{building_id}/spaces", response_model=List[SpaceResponse])
+async def get_building_spaces(
+    building_id: str,
+    floor: Optional[str] = None,
+    block: Optional[str] = None,
+    type: Optional[SpaceType] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """GET /api/v1/buildings/{id}/spaces - Bookable spaces of a building (optionally one floor/block)"""
+
+    await _require_building(db, building_id)
+    query = (
+        select_for(Space, SpaceResponse)
+        .where(Space.building_id == building_id)
+        .where(Space.is_available == True)
+        .order_by(Space.floor, Space.block, Space.name)
+    )
+    if floor:
+        query = query.where(Space.floor == floor)
+    if block:
+        query = query.where(Space.block == block)
+    if type:
+        query = query.where(Space.type == type)
+    return rows_to_dicts(await db.execute(query))
+
+
+@router.get("/{building_id}/spaces/{space_id}", response_model=SpaceResponse)
+async def get_building_space(
+    building_id: str,
+    space_id: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """GET /api/v1/buildings/{id}/spaces/{space_id} - One space"""
+
+    space = rows_to_dicts(await db.execute(
+        select_for(Space, SpaceResponse).where(Space.id == space_id).where(Space.building_id == building_id)
+    ))
+    if not space:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Space not found"
+        )
+    return space[0]
@@ -0,0 +1,92 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from app.db.database import get_async_db
+from app.db.models import SecurityOfficer
+from app.schemas.checkins import CheckInCreate, CheckInResponse, HeadcountResponse, RosterEntry
+from app.api.routes.auth import require_security_staff
+from app.services.checkins import AlreadyCheckedIn, NotCheckedIn, UnknownPerson, check_in, check_out
+from app.services.roster import roster
+
+router = APIRouter(prefix="/api/v1/checkins")
+
+
+@router.post("/", response_model=CheckInResponse, status_code=status.HTTP_201_CREATED)
+async def check_in_person(
+    checkin_data: CheckInCreate,
+    db: AsyncSession = Depends(get_async_db),
+    token_payload: dict = Depends(require_security_staff)
+):
+    """POST /api/v1/checkins - Check an employee or visitor in at a building"""
+
+    try:
+        return await check_in(db, checkin_data)
+    except UnknownPerson:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User or visitor not found"
+        )
+    except AlreadyCheckedIn:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Already checked in"
+        )
+
+
+@router.post("/{person_id}/checkout", response_model=CheckInResponse)
+async def check_out_person(
+    person_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    token_payload: dict = Depends(require_security_staff)
+):
+    """POST /api/v1/checkins/{person_id}/checkout - Check a user or visitor out"""
+
+    officer_name, officer_badge = None, None
+    if token_payload.get("role") == "security":
+        officer = await db.get(SecurityOfficer, token_payload.get("sub"))
+        if officer:
+            officer_name = f"{officer.first_name} {officer.last_name}"
+            officer_badge = officer.badge_number
+
+    try:
+        return await check_out(db, person_id, officer_name, officer_badge)
+    except NotCheckedIn:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No open check-in for this person"
+        )
+
+
+@router.get("/roster", response_model=List[RosterEntry])
+async def get_roster(
+    building_id: str,
+    floor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    token_payload: dict = Depends(require_security_staff)
+):
+    """GET /api/v1/checkins/roster - Everyone currently on site in a building"""
+
+    await roster.ensure_fresh(db)
+    entries = roster.members(building_id)
+    if floor:
+        entries = [entry for entry in entries if entry.floor == floor]
+    return sorted(entries, key=lambda entry: entry.check_in_time)
+
+
+@router.get("/headcount", response_model=HeadcountResponse)
+async def get_headcount(
+    building_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    token_payload: dict = Depends(require_security_staff)
+):
+    """GET /api/v1/checkins/headcount - People on site, per building"""
+
+    await roster.ensure_fresh(db)
+    counts = roster.headcounts()
+    if building_id:
+        counts = {building_id: counts.get(building_id, 0)}
+    return {
+        "total": sum(counts.values()),
+        "buildings": [{"building_id": key, "count": value} for key, value in counts.items()],
+    }
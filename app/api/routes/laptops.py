@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import Optional
+
+from app.db.database import get_async_db
+from app.schemas.laptops import AssetResolution, LaptopReconcileResult
+from app.api.routes.auth import require_security_staff
+from app.services.asset_registry import asset_registry, reconcile_laptop_records
+
+router = APIRouter(prefix="/api/v1/laptops")
+
+
+@router.get("/assets/{asset_number}", response_model=AssetResolution)
+async def resolve_asset(
+    asset_number: str,
+    user_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    token_payload: dict = Depends(require_security_staff)
+):
+    """GET /api/v1/laptops/assets/{asset_number} - Owner of a scanned asset tag (and whether it matches user_id)"""
+
+    await asset_registry.ensure_fresh(db)
+    return asset_registry.resolve(asset_number, user_id)
+
+
+@router.post("/reconcile", response_model=LaptopReconcileResult)
+async def reconcile_laptops(
+    day: date,
+    building_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    token_payload: dict = Depends(require_security_staff)
+):
+    """POST /api/v1/laptops/reconcile - Recheck a day's laptop records (open ones against current registrations)"""
+
+    return await reconcile_laptop_records(db, day, building_id)
@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from app.db.database import get_async_db
+from app.db.models import AdminUser, OccupancyDaily, OccupancyHourly
+from app.api.routes.auth import get_current_admin
+from app.services.rollups import MEASURES, refresh_rollups, rollup_query
+
+router = APIRouter(prefix="/api/v1/occupancy")
+
+MAX_HOURLY_DAYS = 31
+MAX_DAILY_DAYS = 366
+
+
+def _rows(result) -> list:
+    return [
+        {"period": row.period.isoformat(), **{measure: int(getattr(row, measure) or 0) for measure in MEASURES}}
+        for row in result
+    ]
+
+
+def _window(start_date: date, end_date: date, max_days: int):
+    if end_date < start_date or (end_date - start_date).days >= max_days:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"end_date must be on or after start_date and within {max_days} days"
+        )
+    return datetime.combine(start_date, time.min), datetime.combine(end_date + timedelta(days=1), time.min)
+
+
+@router.get("/hourly")
+async def get_hourly_occupancy(
+    building_id: str,
+    start_date: date,
+    end_date: date,
+    floor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    admin: AdminUser = Depends(get_current_admin)
+):
+    """GET /api/v1/occupancy/hourly - Check-ins, check-outs and bookings per hour (from rollups)"""
+
+    start, end = _window(start_date, end_date, MAX_HOURLY_DAYS)
+    result = await db.execute(rollup_query(OccupancyHourly, building_id, start, end, floor))
+    return {"building_id": building_id, "floor": floor, "rows": _rows(result)}
+
+
+@router.get("/daily")
+async def get_daily_occupancy(
+    building_id: str,
+    start_date: date,
+    end_date: date,
+    floor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    admin: AdminUser = Depends(get_current_admin)
+):
+    """GET /api/v1/occupancy/daily - Daily check-ins, check-outs and bookings (from rollups)"""
+
+    start, end = _window(start_date, end_date, MAX_DAILY_DAYS)
+    result = await db.execute(rollup_query(OccupancyDaily, building_id, start, end, floor))
+    return {"building_id": building_id, "floor": floor, "rows": _rows(result)}
+
+
+@router.post("/refresh")
+async def refresh_occupancy(
+    db: AsyncSession = Depends(get_async_db),
+    admin: AdminUser = Depends(get_current_admin)
+):
+    """POST /api/v1/occupancy/refresh - Fold new check-ins and bookings into the rollups now"""
+
+    return await db.run_sync(refresh_rollups)
@@ -0,0 +1,100 @@
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from typing import Optional
+
+from app.schemas.photos import PhotoUpload
+from app.api.routes.auth import get_token_payload
+from app.core.http_cache import etag_matches, not_modified
+from app.services.photos import (
+    DIGEST_PATTERN, IMMUTABLE, PRIVATE_IMMUTABLE, THUMBNAIL_SIZES, ImageTooLarge, InvalidImage,
+    get_original, get_thumbnail, save_photo, sniff_content_type,
+)
+
+router = APIRouter(prefix="/api/v1/photos")
+
+
+async def upload_photo(file: UploadFile, public: bool = False) -> PhotoUpload:
+    """save_photo with upload errors mapped to HTTP errors (shared by the photo endpoints)
+
+    Only pass public=True for photos that may be served without sign-in (space images).
+    """
+    try:
+        return await save_photo(file.file, public)
+    except ImageTooLarge as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(exc)
+        )
+    except InvalidImage as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+
+
+@router.post("/", response_model=PhotoUpload, status_code=status.HTTP_201_CREATED)
+async def create_photo(
+    file: UploadFile = File(...),
+    token_payload: dict = Depends(get_token_payload)
+):
+    """POST /api/v1/photos - Upload a (private) photo; use the returned url as a photo_url"""
+
+    return await upload_photo(file)
+
+
+async def _serve_photo(digest: str, size: Optional[int], request: Request, public: bool) -> Response:
+    if not DIGEST_PATTERN.match(digest):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Photo not found"
+        )
+    if size is not None and size not in THUMBNAIL_SIZES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"size must be one of {', '.join(map(str, THUMBNAIL_SIZES))}"
+        )
+
+    cache_control = IMMUTABLE if public else PRIVATE_IMMUTABLE
+    etag = f'"{digest[:32]}-{size or "original"}"'
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+
+    try:
+        if size is None:
+            data = await get_original(digest, public)
+            media_type = sniff_content_type(data)
+        else:
+            data = await get_thumbnail(digest, size, public)
+            media_type = "image/webp"
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Photo not found"
+        )
+
+    return Response(content=data, media_type=media_type, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+SIZE_QUERY = Query(None, description=f"thumbnail box size, one of {list(THUMBNAIL_SIZES)}")
+
+
+@router.get("/public/{digest}")
+async def get_public_photo(
+    digest: str,
+    request: Request,
+    size: Optional[int] = SIZE_QUERY
+):
+    """GET /api/v1/photos/public/{digest} - A space image, or a WebP thumbnail with ?size="""
+
+    return await _serve_photo(digest, size, request, public=True)
+
+
+@router.get("/{digest}")
+async def get_photo(
+    digest: str,
+    request: Request,
+    size: Optional[int] = SIZE_QUERY,
+    token_payload: dict = Depends(get_token_payload)
+):
+    """GET /api/v1/photos/{digest} - A profile or visitor photo, or a WebP thumbnail with ?size= (signed-in callers)"""
+
+    return await _serve_photo(digest, size, request, public=False)
@@ -1,13 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.db.models import User
 from app.schemas.users import UserResponse, UserProfileUpdate
 from app.api.routes.auth import get_current_user
-
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from app.api.routes.photos import upload_photo
+from app.core.principals import snapshot
+from app.services.user_events import user_changed
 
 router = APIRouter(prefix="/api/v1/profile")
 
@@ -18,31 +18,25 @@ class PasswordChangeRequest(BaseModel):
 @router.post("/reset-password")
 async def reset_password(
     data: PasswordChangeRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    from app.core.security import get_password_hash
+    from app.core.security import get_password_hash_async
     if data.new_password != data.confirm_password:
         raise HTTPException(status_code=400, detail="Passwords do not match")
-    current_user.hashed_password = get_password_hash(data.new_password)
-    db.commit()
-    db.refresh(current_user)
+    db.add(current_user)  # may be a detached snapshot from the user cache
+    before = snapshot(current_user)
+    current_user.hashed_password = await get_password_hash_async(data.new_password)
+    await db.commit()
+    await db.refresh(current_user)
+    user_changed(before, snapshot(current_user))
     return {"message": "Password updated successfully"}
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-
-from app.db.database import get_db
-from app.db.models import User
-from app.schemas.users import UserResponse, UserProfileUpdate
-from app.api.routes.auth import get_current_user
-
-router = APIRouter(prefix="/api/v1/profile")
 
 
 @router.put("/", response_model=UserResponse)
 async def update_profile(
     profile_update: UserProfileUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """PUT /api/v1/profile - Update current user's own profile (self only)"""
@@ -50,10 +44,33 @@ async def update_profile(
     # Update fields - users can only update their own profile
     # Limited to safe fields
     update_data = profile_update.model_dump(exclude_unset=True)
+    db.add(current_user)  # may be a detached snapshot from the user cache
+    before = snapshot(current_user)
     for field, value in update_data.items():
         setattr(current_user, field, value)
 
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
+    user_changed(before, snapshot(current_user))
+
+    return current_user
+
+
+@router.post("/photo", response_model=UserResponse)
+async def upload_profile_photo(
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """POST /api/v1/profile/photo - Upload the current user's photo"""
+
+    photo = await upload_photo(file)
+    db.add(current_user)  # may be a detached snapshot from the user cache
+    before = snapshot(current_user)
+    current_user.photo_url = photo.url
+
+    await db.commit()
+    await db.refresh(current_user)
+    user_changed(before, snapshot(current_user))
 
     return current_user
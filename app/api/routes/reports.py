@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from datetime import date
+from typing import Optional
+
+from app.db.database import job_engine
+from app.db.models import AdminUser
+from app.api.routes.auth import get_current_admin
+from app.services.reports import cached_report, no_show_report, occupancy_report, peak_hours_report
+
+router = APIRouter(prefix="/api/v1/reports")
+
+MAX_REPORT_DAYS = 366
+
+
+def _check_range(start_date: date, end_date: date) -> None:
+    if end_date < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must not be before start_date"
+        )
+    if (end_date - start_date).days >= MAX_REPORT_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Reports cover at most {MAX_REPORT_DAYS} days"
+        )
+
+
+@router.get("/occupancy")
+async def get_occupancy_report(
+    start_date: date,
+    end_date: date,
+    period: str = Query("day", pattern="^(day|week)$"),
+    building_id: Optional[str] = None,
+    programme: Optional[str] = None,
+    admin: AdminUser = Depends(get_current_admin)
+):
+    """GET /api/v1/reports/occupancy - Visits, people and average stay per building per day/week"""
+
+    _check_range(start_date, end_date)
+    key = ("occupancy", start_date, end_date, period, building_id, programme)
+    return await cached_report(key, end_date, occupancy_report, job_engine, start_date, end_date, period, building_id, programme)
+
+
+@router.get("/peak-hours")
+async def get_peak_hours_report(
+    start_date: date,
+    end_date: date,
+    building_id: Optional[str] = None,
+    programme: Optional[str] = None,
+    admin: AdminUser = Depends(get_current_admin)
+):
+    """GET /api/v1/reports/peak-hours - Average people on site per weekday x hour, per building"""
+
+    _check_range(start_date, end_date)
+    key = ("peak-hours", start_date, end_date, building_id, programme)
+    return await cached_report(key, end_date, peak_hours_report, job_engine, start_date, end_date, building_id, programme)
+
+
+@router.get("/no-shows")
+async def get_no_show_report(
+    start_date: date,
+    end_date: date,
+    group_by: str = Query("building", pattern="^(building|programme)$"),
+    building_id: Optional[str] = None,
+    programme: Optional[str] = None,
+    admin: AdminUser = Depends(get_current_admin)
+):
+    """GET /api/v1/reports/no-shows - Booking no-show rate per building or programme"""
+
+    _check_range(start_date, end_date)
+    key = ("no-shows", start_date, end_date, group_by, building_id, programme)
+    return await cached_report(key, end_date, no_show_report, job_engine, start_date, end_date, group_by, building_id, programme)
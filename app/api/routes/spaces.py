@@ -0,0 +1,95 @@
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+
+from app.core.http_cache import etag_matches, json_response, make_etag, not_modified
+from app.db.database import get_async_db
+from app.db.models import AdminUser, Space, SpaceType
+from app.schemas.bookings import AvailabilityGrid, SpaceResponse
+from app.api.routes.auth import get_current_admin
+from app.api.routes.photos import upload_photo
+from app.services.availability import availability_grid, grid_version
+from app.services.bookings import available_spaces, booking_window
+
+router = APIRouter(prefix="/api/v1/spaces")
+
+
+@router.get("/available", response_model=List[SpaceResponse])
+async def get_available_spaces(
+    building_id: str,
+    booking_date: date,
+    start_time: time,
+    end_time: time,
+    floor: Optional[str] = None,
+    block: Optional[str] = None,
+    type: Optional[SpaceType] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """GET /api/v1/spaces/available - Spaces free for the whole time range"""
+
+    if end_time <= start_time:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_time must be after start_time"
+        )
+
+    starts_at, ends_at = booking_window(booking_date, start_time, end_time)
+    return await available_spaces(db, building_id, starts_at, ends_at, floor, block, type)
+
+
+@router.get("/availability-grid", response_model=AvailabilityGrid)
+async def get_availability_grid(
+    request: Request,
+    building_id: str,
+    start_date: date,
+    days: int = Query(1, ge=1, le=7),
+    slot_minutes: int = Query(15, ge=5, le=240),
+    floor: Optional[str] = None,
+    block: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """GET /api/v1/spaces/availability-grid - Booked-slot bitmap for every space on a floor/block
+
+    Supports If-None-Match: an unchanged grid costs one aggregate query and a 304.
+    """
+
+    if (24 * 60) % slot_minutes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="slot_minutes must divide a day evenly"
+        )
+
+    start = datetime.combine(start_date, time.min)
+    end = start + timedelta(days=days)
+
+    version = await grid_version(db, building_id, floor, block, start, end)
+    etag = make_etag("availability-grid", building_id, floor, block, start, days, slot_minutes, version, weak=True)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    grid = await availability_grid(db, building_id, start, days, slot_minutes, floor, block)
+    return json_response(grid.model_dump_json().encode(), etag)
+
+
+@router.post("/{space_id}/image", response_model=SpaceResponse)
+async def upload_space_image(
+    space_id: str,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db),
+    admin: AdminUser = Depends(get_current_admin)
+):
+    """POST /api/v1/spaces/{id}/image - Upload a space's photo (admin only)"""
+
+    space = await db.get(Space, space_id)
+    if not space:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Space not found"
+        )
+
+    space.image_url = (await upload_photo(file, public=True)).url
+    await db.commit()
+    await db.refresh(space)
+
+    return space
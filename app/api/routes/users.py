@@ -1,59 +1,112 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, Form, HTTPException, status, Query, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
 from typing import List, Optional
-
-from app.db.database import get_db
-from app.db.models import User
-from app.schemas.users import UserResponse, UserUpdate, UserProfileUpdate, UserCreate
+import csv
+import io
+import json
+
+from app.db.database import AsyncSessionLocal, JobSessionLocal, get_async_db
+from app.db.models import Building, User
+from app.schemas.users import (
+    UserResponse, UserUpdate, UserProfileUpdate, UserCreate, UserImportResult,
+    UserBulkIds, UserBulkResult, UserBulkUpdate,
+)
 from app.api.routes.auth import get_current_user, get_current_admin, get_token_payload
-from app.core.security import get_password_hash, generate_id, can_access_user, can_modify_user
+from app.core.security import get_password_hash_async, can_access_user, can_modify_user
+from app.core.ids import id_allocator
+from app.core.config import settings
+from app.core.principals import snapshot
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.projections import response_fields, rows_to_dicts, select_for
+from app.services.search import FULL_NAME, escape_like, search_active_users
+from app.services.kiosk_index import kiosk_directory
+from app.services.user_counts import user_counts
+from app.services.user_events import user_changed
+from app.services.user_bulk import bulk_update_users, missing_ids
+from app.services.user_import import ImportFileError, import_users, read_user_file
+
+router = APIRouter(prefix="/api/v1/users")
+
+
+def _filter_users(query, building_id: Optional[str], programme: Optional[str], search: Optional[str]):
+    """Apply the directory filters shared by the list and export endpoints"""
+    query = query.where(User.is_active == True)
 
-router = APIRouter()
+    if building_id:
+        query = query.where(User.building_id == building_id)
+
+    if programme:
+        query = query.where(User.programme == programme)
+
+    if search:
+        # Each branch is backed by a trigram index on Postgres
+        search_term = f"%{escape_like(search)}%"
+        query = query.where(
+            (FULL_NAME.ilike(search_term, escape="\\")) |
+            (User.email.ilike(search_term, escape="\\")) |
+            (User.phone.ilike(search_term, escape="\\"))
+        )
+
+    return query
 
 
 @router.get("/", response_model=List[UserResponse])
 async def get_users(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, le=1000),
+    cursor: Optional[str] = None,
     building_id: Optional[str] = None,
     programme: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     admin: User = Depends(get_current_admin)
 ):
-    """GET /api/v1/users - Get all users with optional filters (admin only)"""
-
-    query = db.query(User).filter(User.is_active == True)
-
-    if building_id:
-        query = query.filter(User.building_id == building_id)
+    """GET /api/v1/users - Get all users with optional filters (admin only)
+
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next
+    page; `skip` is still honoured for older clients but slows down deep pages.
+    """
+
+    query = _filter_users(select_for(User, UserResponse), building_id, programme, search)
+    query = query.order_by(User.created_at, User.id)
+
+    if cursor:
+        try:
+            after_created_at, after_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query = query.where(tuple_(User.created_at, User.id) > tuple_(after_created_at, after_id))
+    else:
+        query = query.offset(skip)
 
-    if programme:
-        query = query.filter(User.programme == programme)
+    users = rows_to_dicts(await db.execute(query.limit(limit)))
 
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            (User.first_name.ilike(search_term)) |
-            (User.last_name.ilike(search_term)) |
-            (User.email.ilike(search_term)) |
-            (User.phone.ilike(search_term))
-        )
+    if len(users) == limit:
+        last = users[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last["created_at"], last["id"])
 
-    users = query.offset(skip).limit(limit).all()
     return users
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     admin: User = Depends(get_current_admin)
 ):
     """POST /api/v1/users - Create a new user (admin only)"""
 
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User.id).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -61,15 +114,10 @@ async def create_user(
         )
 
     # Generate user ID
-    last_user = db.query(User).order_by(User.id.desc()).first()
-    if last_user:
-        last_num = int(last_user.id.split("-")[1])
-        user_id = generate_id("USR", last_num + 1)
-    else:
-        user_id = generate_id("USR", 1)
+    user_id = await id_allocator.next_id(db, "USR")
 
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
 
     new_user = User(
         id=user_id,
@@ -86,8 +134,9 @@ async def create_user(
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    user_changed(None, snapshot(new_user))
 
     return new_user
 
@@ -96,23 +145,153 @@ async def create_user(
 async def search_users(
     q: str = Query(..., min_length=2),
     limit: int = Query(10, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Search users by name for autocomplete (used in visitor kiosk)"""
 
-    search_term = f"%{q}%"
-    users = db.query(User).filter(
-        (User.first_name.ilike(search_term)) |
-        (User.last_name.ilike(search_term))
-    ).filter(User.is_active == True).limit(limit).all()
+    if settings.KIOSK_INDEX_ENABLED:
+        return await kiosk_directory.search(db, q, limit)
+    return await search_active_users(db, q, limit)
 
-    return users
+
+EXPORT_FIELDS = list(response_fields(User, UserResponse))
+EXPORT_CHUNK_SIZE = 500
+
+
+def _export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def _stream_export(query, export_format: str):
+    # Own session: the request-scoped one may be closed before the body is sent
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_FIELDS)
+            yield buffer.getvalue()
+
+        async for rows in result.partitions(EXPORT_CHUNK_SIZE):
+            if export_format == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows(rows)
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    json.dumps({field: _export_value(value) for field, value in zip(EXPORT_FIELDS, row)}) + "\n"
+                    for row in rows
+                )
+
+
+@router.get("/export")
+async def export_users(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    building_id: Optional[str] = None,
+    programme: Optional[str] = None,
+    search: Optional[str] = None,
+    admin: User = Depends(get_current_admin)
+):
+    """GET /api/v1/users/export - Stream the full directory as NDJSON or CSV (admin only)"""
+
+    query = _filter_users(select_for(User, UserResponse), building_id, programme, search)
+    query = query.order_by(User.created_at, User.id)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_export(query, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=users.{format}"}
+    )
+
+
+@router.post("/import", response_model=UserImportResult)
+async def import_users_file(
+    file: UploadFile = File(...),
+    dry_run: bool = Form(False),
+    default_password: Optional[str] = Form(None),
+    admin: User = Depends(get_current_admin)
+):
+    """POST /api/v1/users/import - Create users from a CSV/XLSX file (admin only)
+
+    Valid rows are created, invalid ones are listed in `errors` by line number.
+    Use dry_run to validate without creating anything.
+    """
+
+    def run():
+        frame = read_user_file(file.file, file.filename or "")
+        with JobSessionLocal() as db:
+            return import_users(db, frame, default_password, dry_run)
+
+    try:
+        result, created = await run_in_threadpool(run)
+    except ImportFileError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Some emails were registered while importing, please retry"
+        )
+
+    for user in created:
+        user_changed(None, user)
+    return result
+
+
+@router.post("/bulk/update", response_model=UserBulkResult)
+async def bulk_update(
+    bulk: UserBulkUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    admin: User = Depends(get_current_admin)
+):
+    """POST /api/v1/users/bulk/update - Move many users to a building/programme, or (re)activate them (admin only)"""
+
+    values = bulk.model_dump(include={"building_id", "programme", "is_active"} & bulk.model_fields_set)
+    if values.get("building_id") and not await db.get(Building, values["building_id"]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Building not found"
+        )
+
+    changes = await bulk_update_users(db, bulk.user_ids, values)
+    for before, after in changes:
+        user_changed(before, after)
+
+    return {
+        "updated": len(changes),
+        "user_ids": [after["id"] for _, after in changes],
+        "not_found": missing_ids(bulk.user_ids, changes),
+    }
+
+
+@router.post("/bulk/deactivate", response_model=UserBulkResult)
+async def bulk_deactivate(
+    bulk: UserBulkIds,
+    db: AsyncSession = Depends(get_async_db),
+    admin: User = Depends(get_current_admin)
+):
+    """POST /api/v1/users/bulk/deactivate - Deactivate many users at once (admin only)"""
+
+    changes = await bulk_update_users(db, bulk.user_ids, {"is_active": False}, only_active=True)
+    for before, after in changes:
+        user_changed(before, after)
+
+    return {
+        "updated": len(changes),
+        "user_ids": [after["id"] for _, after in changes],
+        "not_found": missing_ids(bulk.user_ids, changes),
+    }
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token_payload: dict = Depends(get_token_payload)
 ):
     """GET /api/v1/users/{id} - Get user by ID (self/admin/security)"""
@@ -124,7 +303,7 @@ async def get_user(
             detail="Not authorized to access this user"
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -139,7 +318,7 @@ async def get_user(
 async def update_user(
     user_id: str,
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token_payload: dict = Depends(get_token_payload)
 ):
     """PUT /api/v1/users/{id} - Update user (self limited / admin full)"""
@@ -151,7 +330,7 @@ async def update_user(
             detail="Not authorized to update this user"
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -170,11 +349,13 @@ async def update_user(
         allowed_fields = {"first_name", "last_name", "phone", "laptop_model", "laptop_asset_number", "photo_url"}
         update_data = {k: v for k, v in update_data.items() if k in allowed_fields}
 
+    before = snapshot(user)
     for field, value in update_data.items():
         setattr(user, field, value)
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    user_changed(before, snapshot(user))
 
     return user
 
@@ -182,12 +363,12 @@ async def update_user(
 @router.delete("/{user_id}")
 async def delete_user(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     admin: User = Depends(get_current_admin)
 ):
     """DELETE /api/v1/users/{id} - Delete user (admin only)"""
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -195,8 +376,10 @@ async def delete_user(
             detail="User not found"
         )
 
+    before = snapshot(user)
     user.is_active = False
-    db.commit()
+    await db.commit()
+    user_changed(before, {**before, "is_active": False})
 
     return {"message": "User deleted successfully"}
 
@@ -205,18 +388,15 @@ async def delete_user(
 async def get_user_count(
     building_id: Optional[str] = None,
     programme: Optional[str] = None,
-    db: Session = Depends(get_db)
+    group_by: Optional[str] = Query(None, pattern="^(building|programme|building_programme)$"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get user count with optional filters"""
+    """Get user count with optional filters, optionally broken down by building and/or programme"""
 
-    query = db.query(User).filter(User.is_active == True)
-
-    if building_id:
-        query = query.filter(User.building_id == building_id)
-
-    if programme:
-        query = query.filter(User.programme == programme)
+    count = await user_counts.count(db, building_id, programme)
 
-    count = query.count()
+    if group_by:
+        groups = await user_counts.breakdown(db, group_by, building_id, programme)
+        return {"count": count, "groups": groups}
 
     return {"count": count}
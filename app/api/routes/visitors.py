@@ -0,0 +1,145 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Request, Response, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+
+from app.db.database import get_async_db
+from app.db.models import User, Visitor
+from app.schemas.checkins import CheckInResponse
+from app.schemas.visitors import KioskScan, VisitorPass, VisitorPreRegister, VisitorResponse
+from app.api.routes.auth import get_token_payload, require_security_staff
+from app.api.routes.photos import upload_photo
+from app.core.http_cache import etag_matches, not_modified
+from app.core.security import can_modify_user, is_security_staff
+from app.services.checkins import AlreadyCheckedIn
+from app.services.visitors import InvalidPass, pass_payload, pre_register, qr_digest, qr_png, scan_in
+
+router = APIRouter(prefix="/api/v1/visitors")
+
+
+async def _visible_visitor(db: AsyncSession, visitor_id: str, token_payload: dict) -> Visitor:
+    visitor = await db.get(Visitor, visitor_id)
+    if not visitor:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Visitor not found"
+        )
+    if not (is_security_staff(token_payload) or can_modify_user(token_payload, visitor.host_employee_id)):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this visitor"
+        )
+    return visitor
+
+
+@router.post("/pre-register", response_model=VisitorPass, status_code=status.HTTP_201_CREATED)
+async def pre_register_visitor(
+    visitor_data: VisitorPreRegister,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    token_payload: dict = Depends(get_token_payload)
+):
+    """POST /api/v1/visitors/pre-register - Register an expected visitor and issue a QR pass"""
+
+    host_id = visitor_data.host_employee_id or token_payload.get("sub")
+    if not can_modify_user(token_payload, host_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to register visitors for this host"
+        )
+
+    host = await db.get(User, host_id)
+    if not host or not host.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Host employee not found"
+        )
+
+    visitor = await pre_register(db, host, visitor_data)
+    # Render the QR after responding so the first fetch is a cache hit
+    background_tasks.add_task(qr_png, pass_payload(visitor.access_token))
+
+    return {
+        "visitor": visitor,
+        "access_token": visitor.access_token,
+        "qr_code_url": f"/api/v1/visitors/{visitor.id}/qr",
+    }
+
+
+@router.post("/scan", response_model=CheckInResponse, status_code=status.HTTP_201_CREATED)
+async def scan_visitor_pass(
+    scan: KioskScan,
+    db: AsyncSession = Depends(get_async_db),
+    token_payload: dict = Depends(require_security_staff)
+):
+    """POST /api/v1/visitors/scan - Kiosk fast path: check a pre-registered visitor in by QR pass (security staff)"""
+
+    try:
+        return await scan_in(db, scan)
+    except InvalidPass as exc:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str(exc)
+        )
+    except AlreadyCheckedIn:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Already checked in"
+        )
+
+
+@router.get("/{visitor_id}", response_model=VisitorResponse)
+async def get_visitor(
+    visitor_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    token_payload: dict = Depends(get_token_payload)
+):
+    """GET /api/v1/visitors/{id} - Visitor details (host, admin or security)"""
+
+    return await _visible_visitor(db, visitor_id, token_payload)
+
+
+@router.post("/{visitor_id}/photo", response_model=VisitorResponse)
+async def upload_visitor_photo(
+    visitor_id: str,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db),
+    token_payload: dict = Depends(get_token_payload)
+):
+    """POST /api/v1/visitors/{id}/photo - Upload a visitor's photo (host, admin or security)"""
+
+    visitor = await _visible_visitor(db, visitor_id, token_payload)
+    visitor.photo_url = (await upload_photo(file)).url
+    await db.commit()
+    await db.refresh(visitor)
+
+    return visitor
+
+
+@router.get("/{visitor_id}/qr")
+async def get_visitor_qr(
+    visitor_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    token_payload: dict = Depends(get_token_payload)
+):
+    """GET /api/v1/visitors/{id}/qr - PNG of the visitor's QR pass"""
+
+    visitor = await _visible_visitor(db, visitor_id, token_payload)
+    if not visitor.access_token:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Visitor has no pass"
+        )
+
+    # The image never changes for a pass, so clients may keep it until the pass expires
+    max_age = 0
+    if visitor.pass_expires_at:
+        max_age = max(0, int((visitor.pass_expires_at - datetime.utcnow()).total_seconds()))
+    cache_control = f"private, max-age={max_age}"
+
+    payload = pass_payload(visitor.access_token)
+    etag = f'"{qr_digest(payload)[:32]}"'
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    _, png = await qr_png(payload)
+    return Response(content=png, media_type="image/png", headers={"ETag": etag, "Cache-Control": cache_control})
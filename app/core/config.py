@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from sqlalchemy.engine import URL
 from typing import Optional
 
 class Settings(BaseSettings):
@@ -16,6 +17,73 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-here"  # Change this in production!
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+
+    # Password hashing pool ("thread" or "process")
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # Number of IDs each worker reserves from a sequence per round trip
+    ID_BLOCK_SIZE: int = 20
+
+    # Per-worker caches for verified tokens and the users/admins they belong to.
+    # Invalidation is local to a worker, so keep the user TTL short.
+    TOKEN_CACHE_SIZE: int = 10000
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60
+
+    # Serve /users/search from a per-worker in-memory index, rebuilt at least this often
+    KIOSK_INDEX_ENABLED: bool = False
+    KIOSK_INDEX_MAX_STALENESS_SECONDS: int = 300
+
+    # In-memory active-user counts for /users/stats/count, reloaded from the DB this often
+    USER_COUNTS_RECONCILE_SECONDS: int = 300
+
+    # On-site roster for the security desk: resync interval, and optional shared mirror ("" or "local")
+    ROSTER_RESYNC_SECONDS: int = 60
+    ROSTER_SHARED_STORE: str = ""
+
+    # In-memory asset tag -> owner index for the security desk, reloaded from the DB this often
+    ASSET_REGISTRY_RESYNC_SECONDS: int = 300
+
+    # Blob storage for archives and uploads ("local" or "azure")
+    BLOB_STORE: str = "local"
+    BLOB_LOCAL_ROOT: str = "storage"
+    AZURE_STORAGE_CONNECTION_STRING: str = ""
+    AZURE_STORAGE_ACCOUNT_URL: str = ""
+    AZURE_STORAGE_CONTAINER: str = "pconnect"
+
+    # Check-in/laptop history: months kept in the live partitioned tables, partitions created ahead
+    ARCHIVE_KEEP_MONTHS: int = 12
+    PARTITION_MONTHS_AHEAD: int = 3
+
+    # Admin reports: aggregation pool, rows per server-side cursor batch, cached results
+    REPORT_WORKERS: int = 2
+    REPORT_CHUNK_ROWS: int = 50000
+    REPORT_CACHE_SIZE: int = 256
+    REPORT_CACHE_TTL_SECONDS: int = 300  # ranges that include today
+    REPORT_CACHE_CLOSED_TTL_SECONDS: int = 86400  # ranges entirely in the past
+
+    # Occupancy rollups only fold in rows older than this, so slow commits are not skipped
+    ROLLUP_LAG_SECONDS: int = 120
+
+    # Visitor passes: QR rendering pool, in-memory PNG cache, and how long a pass stays valid
+    QR_WORKERS: int = 2
+    QR_CACHE_SIZE: int = 1024
+    VISITOR_PASS_HOURS: int = 24
+
+    # Bulk user import: largest file accepted, and the process pool that hashes its passwords
+    USER_IMPORT_MAX_ROWS: int = 5000
+    USER_IMPORT_HASH_WORKERS: int = 4
+
+    # Photo uploads: size limit, thumbnail pool and in-memory thumbnail cache
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    IMAGE_WORKERS: int = 2
+    THUMBNAIL_CACHE_SIZE: int = 2048
+
+    # Cached GET responses for reference data; versions are per worker with "local"
+    RESPONSE_CACHE_SIZE: int = 512
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_VERSION_STORE: str = "local"
     
     # Database configuration
     DB_HOST: str = "localhost"
@@ -23,11 +91,41 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = "postgres"
     DB_NAME: str = "pconnect"
     DB_PORT: str = "5432"
+    DB_SSLMODE: str = "require"  # "disable" for a local server
+    DB_CONNECT_TIMEOUT: int = 10
+
+    # Connection pool, per worker process. When DB_MAX_CONNECTIONS is set, the
+    # pool is capped so that WEB_CONCURRENCY workers together stay within it,
+    # after each worker's fixed job pool (REPORT_WORKERS + 1 connections, for
+    # reports and user imports) is set aside.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 300
+    DB_POOL_PRE_PING: bool = False  # pool_recycle already retires idle sockets
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 = server default
+    DB_MAX_CONNECTIONS: int = 0
+    WEB_CONCURRENCY: int = 1
+
+    def _database_url(self, drivername: str) -> str:
+        # URL.create escapes special characters in the password
+        return URL.create(
+            drivername,
+            username=self.DB_USER,
+            password=self.DB_PASSWORD,
+            host=self.DB_HOST,
+            port=int(self.DB_PORT),
+            database=self.DB_NAME,
+        ).render_as_string(hide_password=False)
 
     @property
     def DATABASE_URL(self) -> str:
         """Constructs and returns the database URL from individual settings"""
-        return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+        return self._database_url("postgresql+psycopg2")
+
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return self._database_url("postgresql+asyncpg")
 
     class Config:
         env_file = ".env"
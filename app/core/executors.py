@@ -0,0 +1,103 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+from typing import Any, Callable, Deque, Optional
+
+
+class BoundedExecutor:
+    """Fixed-size worker pool that async handlers can await without blocking the event loop"""
+
+    def __init__(self, name: str, max_workers: int, kind: str = "thread", sample_size: int = 512):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.kind = kind
+        self._executor: Optional[Executor] = None
+        self._lock = Lock()
+
+        # Metrics
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._latencies: Deque[float] = deque(maxlen=sample_size)
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so importing the module never forks or spawns threads
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix=self.name,
+                        )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run func(*args, **kwargs) in the pool and await its result"""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        with self._lock:
+            self._pending += 1
+        try:
+            result = await loop.run_in_executor(self._get_executor(), partial(func, *args, **kwargs))
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._pending -= 1
+                self._latencies.append(elapsed)
+        with self._lock:
+            self._completed += 1
+        return result
+
+    def map(self, func: Callable[..., Any], *iterables: Any, chunksize: int = 1) -> list:
+        """Synchronous batch helper for scripts and background jobs"""
+        executor = self._get_executor()
+        if self.kind == "process":
+            return list(executor.map(func, *iterables, chunksize=chunksize))
+        return list(executor.map(func, *iterables))
+
+    def stats(self) -> dict:
+        """Snapshot of queue depth and latency (milliseconds, submit to result)"""
+        with self._lock:
+            pending = self._pending
+            samples = sorted(self._latencies)
+            completed = self._completed
+            failed = self._failed
+
+        def percentile(p: float) -> Optional[float]:
+            if not samples:
+                return None
+            index = min(len(samples) - 1, int(round(p * (len(samples) - 1))))
+            return round(samples[index] * 1000, 2)
+
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "in_flight": pending,
+            "queue_depth": max(0, pending - self.max_workers),
+            "completed": completed,
+            "failed": failed,
+            "latency_ms": {
+                "avg": round(sum(samples) / len(samples) * 1000, 2) if samples else None,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": round(samples[-1] * 1000, 2) if samples else None,
+            },
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -0,0 +1,55 @@
+import hashlib
+import json
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+# Clients may keep a copy but must revalidate with If-None-Match before reuse
+REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: Any, weak: bool = False) -> str:
+    """Stable ETag from any JSON-serialisable parts"""
+    raw = json.dumps(parts, default=str, separators=(",", ":"), sort_keys=True)
+    digest = hashlib.sha256(raw.encode()).hexdigest()[:32]
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for GET)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == wanted:
+            return True
+    return False
+
+
+def not_modified(etag: str, cache_control: str = REVALIDATE) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def json_response(body: bytes, etag: str, cache_control: str = REVALIDATE, status_code: int = 200) -> Response:
+    """Pre-serialised JSON body with validators attached"""
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def conditional_json(request: Request, body: bytes, etag: Optional[str] = None, cache_control: str = REVALIDATE) -> Response:
+    """Serve body, or 304 if the client already has it; etag defaults to a hash of the body"""
+    if etag is None:
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    return json_response(body, etag, cache_control)
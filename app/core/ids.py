@@ -0,0 +1,118 @@
+from collections import deque
+from dataclasses import dataclass
+from threading import Lock
+from typing import Deque, Dict, List
+
+from sqlalchemy import Integer, cast, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import generate_id
+from app.db.models import (
+    AdminUser, Booking, CheckIn, LaptopRecord, SecurityOfficer, User, Visitor,
+    admin_id_seq, booking_id_seq, checkin_id_seq, laptop_record_id_seq,
+    security_officer_id_seq, user_id_seq, visitor_id_seq,
+)
+
+
+@dataclass(frozen=True)
+class IdSpec:
+    sequence: str
+    model: type
+    width: int = 3
+
+
+ID_SPECS: Dict[str, IdSpec] = {
+    "USR": IdSpec(user_id_seq.name, User),
+    "ADM": IdSpec(admin_id_seq.name, AdminUser),
+    "SEC": IdSpec(security_officer_id_seq.name, SecurityOfficer),
+    "VIS": IdSpec(visitor_id_seq.name, Visitor, width=6),
+    "BK": IdSpec(booking_id_seq.name, Booking),
+    "CHK": IdSpec(checkin_id_seq.name, CheckIn),
+    "LAP": IdSpec(laptop_record_id_seq.name, LaptopRecord),
+}
+
+
+class IdAllocator:
+    """Hands out prefixed IDs (USR-001, BK-042, ...) from per-prefix Postgres sequences.
+
+    Each worker reserves a block of sequence values in one round trip and serves
+    IDs from memory until the block runs out. Sequence values are never handed
+    out twice, so blocks stay disjoint across gunicorn workers; unused values are
+    simply skipped when a worker restarts.
+    """
+
+    def __init__(self, block_size: int):
+        self.block_size = max(1, block_size)
+        self._blocks: Dict[str, Deque[int]] = {prefix: deque() for prefix in ID_SPECS}
+        # Fallback counters for databases without sequences (SQLite)
+        self._fallback_next: Dict[str, int] = {}
+        self._fallback_lock = Lock()
+
+    def _take(self, prefix: str, count: int) -> List[int]:
+        block = self._blocks[prefix]
+        numbers = []
+        while len(numbers) < count:
+            try:
+                numbers.append(block.popleft())
+            except IndexError:
+                break
+        return numbers
+
+    def _reserve(self, db: Session, prefix: str, count: int) -> List[int]:
+        spec = ID_SPECS[prefix]
+        if db.get_bind().dialect.name == "postgresql":
+            # Sequence names are module constants, never user input
+            rows = db.execute(
+                text(f"SELECT nextval('{spec.sequence}') FROM generate_series(1, :n)"),
+                {"n": count},
+            )
+            return sorted(row[0] for row in rows)
+
+        # Query before taking the lock: under AsyncSession.run_sync the query runs on the
+        # event loop thread, and blocking on a lock there would stall every other request
+        current = None
+        if prefix not in self._fallback_next:
+            suffix = func.substr(spec.model.id, len(prefix) + 2)
+            current = db.scalar(
+                select(func.max(cast(suffix, Integer)))
+                .where(spec.model.id.like(f"{prefix}-%"))
+            )
+        with self._fallback_lock:
+            if prefix not in self._fallback_next:
+                self._fallback_next[prefix] = (current or 0) + 1
+            start = self._fallback_next[prefix]
+            self._fallback_next[prefix] = start + count
+        return list(range(start, start + count))
+
+    def _allocate(self, db: Session, prefix: str, count: int) -> List[str]:
+        if prefix not in ID_SPECS:
+            raise ValueError(f"Unknown ID prefix: {prefix}")
+        numbers = self._take(prefix, count)
+        missing = count - len(numbers)
+        if missing:
+            reserved = self._reserve(db, prefix, max(self.block_size, missing))
+            numbers.extend(reserved[:missing])
+            self._blocks[prefix].extend(reserved[missing:])
+        width = ID_SPECS[prefix].width
+        return [generate_id(prefix, number, width) for number in numbers]
+
+    async def next_ids(self, db: AsyncSession, prefix: str, count: int) -> List[str]:
+        """Allocate `count` IDs for `prefix`"""
+        return await db.run_sync(self._allocate, prefix, count)
+
+    async def next_id(self, db: AsyncSession, prefix: str) -> str:
+        """Allocate a single ID for `prefix`"""
+        return (await self.next_ids(db, prefix, 1))[0]
+
+    def next_id_sync(self, db: Session, prefix: str) -> str:
+        """Same as next_id, for scripts using the sync SessionLocal"""
+        return self._allocate(db, prefix, 1)[0]
+
+    def next_ids_sync(self, db: Session, prefix: str, count: int) -> List[str]:
+        """Same as next_ids, for scripts and jobs using the sync SessionLocal"""
+        return self._allocate(db, prefix, count)
+
+
+id_allocator = IdAllocator(settings.ID_BLOCK_SIZE)
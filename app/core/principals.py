@@ -0,0 +1,74 @@
+import time
+from typing import Optional, Type, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.services.user_events import subscribe
+
+ModelT = TypeVar("ModelT")
+
+# Never copied into snapshots; routes that need it query the row directly
+EXCLUDED_COLUMNS = {"hashed_password", "hashed_pin"}
+
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+admin_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+
+def decode_access_token_cached(token: str) -> Optional[dict]:
+    """decode_access_token, skipping the signature check for tokens verified recently"""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
+    payload = decode_access_token(token)
+    if payload is None:
+        return None
+
+    # Never serve a cached payload past the token's own expiry
+    exp = payload.get("exp")
+    if exp is not None:
+        remaining = exp - time.time()
+        if remaining > 0:
+            token_cache.set(token, payload, ttl=min(token_cache.ttl, remaining))
+    return payload
+
+
+def snapshot(instance) -> dict:
+    """Column values of an ORM instance, minus credentials"""
+    return {
+        attr.key: getattr(instance, attr.key)
+        for attr in inspect(instance).mapper.column_attrs
+        if attr.key not in EXCLUDED_COLUMNS
+    }
+
+
+def restore(model: Type[ModelT], data: dict) -> ModelT:
+    """Rebuild a detached instance from a snapshot.
+
+    Each call returns a fresh object, so requests never share mutable state.
+    Routes that modify it must db.add() it first; only changed columns are
+    written back.
+    """
+    instance = model(**data)
+    make_transient_to_detached(instance)
+    return instance
+
+
+def invalidate_user(user_id: str) -> None:
+    user_cache.delete(user_id)
+
+
+def invalidate_admin(admin_id: str) -> None:
+    admin_cache.delete(admin_id)
+
+
+@subscribe
+def _evict_changed_user(before: Optional[dict], after: Optional[dict]) -> None:
+    for data in (before, after):
+        if data is not None:
+            invalidate_user(data["id"])
@@ -0,0 +1,229 @@
+"""Response cache for read-mostly GET endpoints (buildings, floors, blocks, spaces).
+
+Cached bodies are keyed by path, query string and the current version of
+every table the response is built from. Versions are bumped when a session
+commits a change to one of those tables, so a write invalidates every
+response built from it without tracking individual keys; the TTL only
+bounds memory and covers writes made outside the application.
+
+Bodies carry a strong ETag (SHA-256 of the bytes); a matching If-None-Match
+is answered with 304 without running the route.
+
+Only register paths whose response does not depend on the caller.
+"""
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from itertools import chain
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.http_cache import REVALIDATE
+
+# Tables whose writes bump a version
+VERSIONED_TABLES = ("buildings", "floors", "blocks", "spaces")
+TOUCHED_KEY = "response_cache_touched"
+
+
+class VersionStore(ABC):
+    """Version counters per table.
+
+    Read on every cached request and bumped after commits, from synchronous
+    ORM event hooks, so implementations must be cheap (e.g. Redis MGET/INCR).
+    A shared implementation lets every gunicorn worker see every worker's
+    writes.
+    """
+
+    @abstractmethod
+    def get_many(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        ...
+
+    @abstractmethod
+    def bump(self, tables: Iterable[str]) -> None:
+        ...
+
+
+class LocalVersionStore(VersionStore):
+    """In-process counters: invalidations reach this worker only (development, tests, single worker)"""
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def get_many(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self._versions.get(table, 0) for table in tables)
+
+    def bump(self, tables: Iterable[str]) -> None:
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+
+VERSION_STORES = {
+    "local": LocalVersionStore,
+}
+
+
+class CachedResponse:
+    __slots__ = ("body", "headers", "etag")
+
+    def __init__(self, body: bytes, headers: List[Tuple[bytes, bytes]], etag: bytes):
+        self.body = body
+        self.headers = headers
+        self.etag = etag
+
+
+class ResponseCache:
+    """LRU + TTL store of rendered GET responses, invalidated through table versions"""
+
+    def __init__(self, maxsize: int, ttl: float, store: VersionStore):
+        self.store = store
+        self._entries = TTLCache(maxsize, ttl)
+        self._rules: List[Tuple[Pattern, Tuple[str, ...]]] = []
+        self.not_modified = 0
+
+    def cache_paths(self, pattern: str, tables: Iterable[str]) -> None:
+        """Cache GETs whose path matches `pattern` (first registered match wins)"""
+        self._rules.append((re.compile(pattern), tuple(tables)))
+
+    def tables_for(self, path: str) -> Optional[Tuple[str, ...]]:
+        for pattern, tables in self._rules:
+            if pattern.match(path):
+                return tables
+        return None
+
+    def key(self, path: str, query_string: bytes, tables: Tuple[str, ...]) -> tuple:
+        return path, query_string, self.store.get_many(tables)
+
+    def get(self, key: tuple) -> Optional[CachedResponse]:
+        return self._entries.get(key)
+
+    def set(self, key: tuple, entry: CachedResponse) -> None:
+        self._entries.set(key, entry)
+
+    def invalidate(self, tables: Iterable[str]) -> None:
+        self.store.bump(tables)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {**self._entries.stats(), "not_modified": self.not_modified, "version_store": type(self.store).__name__}
+
+
+def _etag_matches(if_none_match: Optional[bytes], etag: bytes) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == b"*":
+        return True
+    candidates = [candidate.strip() for candidate in if_none_match.split(b",")]
+    return any(candidate[2:] == etag if candidate.startswith(b"W/") else candidate == etag for candidate in candidates)
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware serving registered GET paths from a ResponseCache"""
+
+    def __init__(self, app, cache: ResponseCache):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return await self.app(scope, receive, send)
+        tables = self.cache.tables_for(scope["path"])
+        if tables is None:
+            return await self.app(scope, receive, send)
+
+        if_none_match = dict(scope["headers"]).get(b"if-none-match")
+        key = self.cache.key(scope["path"], scope["query_string"], tables)
+        entry = self.cache.get(key)
+        if entry is not None:
+            return await self._send(send, entry, if_none_match)
+
+        start: dict = {}
+        chunks: List[bytes] = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body"):
+                return
+            if start["status"] != 200:
+                await send(start)
+                await send({"type": "http.response.body", "body": b"".join(chunks)})
+                return
+            body = b"".join(chunks)
+            etag = b'"' + hashlib.sha256(body).hexdigest()[:32].encode() + b'"'
+            headers = [
+                (name, value) for name, value in start.get("headers", [])
+                if name.lower() not in (b"etag", b"cache-control")
+            ] + [(b"etag", etag), (b"cache-control", REVALIDATE.encode())]
+            cached = CachedResponse(body, headers, etag)
+            self.cache.set(key, cached)
+            await self._send(send, cached, if_none_match)
+
+        await self.app(scope, receive, capture)
+
+    async def _send(self, send, entry: CachedResponse, if_none_match: Optional[bytes]) -> None:
+        if _etag_matches(if_none_match, entry.etag):
+            self.cache.not_modified += 1
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [(b"etag", entry.etag), (b"cache-control", REVALIDATE.encode())],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": 200, "headers": entry.headers})
+        await send({"type": "http.response.body", "body": entry.body})
+
+
+def _configured_store() -> VersionStore:
+    return VERSION_STORES[settings.RESPONSE_CACHE_VERSION_STORE]()
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL_SECONDS, _configured_store())
+
+
+# Bump versions for tables written through any session, once the transaction has committed
+
+def _touch(session: Session, tables: Iterable[str]) -> None:
+    touched = {table for table in tables if table in VERSIONED_TABLES}
+    if touched:
+        session.info.setdefault(TOUCHED_KEY, set()).update(touched)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed(session, flush_context):
+    _touch(session, (
+        getattr(instance, "__tablename__", None)
+        for instance in chain(session.new, session.dirty, session.deleted)
+    ))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk(orm_execute_state):
+    # update()/delete()/insert() statements bypass the flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            _touch(orm_execute_state.session, [table.name])
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed(session):
+    touched = session.info.pop(TOUCHED_KEY, None)
+    if touched:
+        response_cache.invalidate(sorted(touched))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session):
+    session.info.pop(TOUCHED_KEY, None)
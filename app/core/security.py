@@ -15,15 +15,21 @@ def is_admin(token_payload: dict) -> bool:
     """Check if user is an admin"""
     role = token_payload.get("role")
     return role == "admin" or role == "super_admin"
+# Check if caller works the security desk (officers and admins)
+def is_security_staff(token_payload: dict) -> bool:
+    """Check if user is a security officer or an admin"""
+    return token_payload.get("role") == "security" or is_admin(token_payload)
 # Utility: Generate formatted IDs (USR-001, etc)
-def generate_id(prefix: str, counter: int) -> str:
-    """Generate formatted ID (e.g., USR-001, BK-123)"""
-    return f"{prefix}-{counter:03d}"
+# Routes should allocate through app.core.ids.id_allocator rather than pick counters themselves
+def generate_id(prefix: str, counter: int, width: int = 3) -> str:
+    """Generate formatted ID (e.g., USR-001, BK-123, VIS-000001)"""
+    return f"{prefix}-{counter:0{width}d}"
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.executors import BoundedExecutor
 
 pwd_context = CryptContext(
     schemes=["pbkdf2_sha256"],
@@ -39,6 +45,19 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     # optional: if you ever add legacy schemes later, you can rehash here
     return ok
 
+# pbkdf2 is CPU-bound, so async routes hash on a dedicated pool instead of the event loop
+password_hasher = BoundedExecutor(
+    "password-hash",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+)
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.run(get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -0,0 +1,147 @@
+import os
+import shutil
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from app.core.config import settings
+
+
+class BlobStore(ABC):
+    """Minimal object storage interface: keys are '/'-separated paths.
+
+    Blocking I/O; async callers should go through run_in_threadpool.
+    """
+
+    def put_file(self, key: str, path: str, content_type: Optional[str] = None) -> str:
+        with open(path, "rb") as source:
+            return self.put_stream(key, source, content_type)
+
+    @abstractmethod
+    def put_bytes(self, key: str, data: bytes, content_type: Optional[str] = None) -> str:
+        ...
+
+    @abstractmethod
+    def put_stream(self, key: str, stream: BinaryIO, content_type: Optional[str] = None) -> str:
+        ...
+
+    @abstractmethod
+    def get_bytes(self, key: str) -> bytes:
+        ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        ...
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs as files under a local directory (development, single-host deployments)"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Invalid blob key: {key}")
+        return path
+
+    def put_bytes(self, key: str, data: bytes, content_type: Optional[str] = None) -> str:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        return key
+
+    def put_stream(self, key: str, stream: BinaryIO, content_type: Optional[str] = None) -> str:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as target:
+            shutil.copyfileobj(stream, target, 1024 * 1024)
+        os.replace(tmp, path)
+        return key
+
+    def get_bytes(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def url(self, key: str) -> str:
+        return self._path(key).as_uri()
+
+
+class AzureBlobStore(BlobStore):
+    """Blobs in an Azure Storage container.
+
+    Authenticates with a connection string when one is configured, otherwise
+    with DefaultAzureCredential (the AZURE_TENANT_ID/CLIENT_ID/CLIENT_SECRET
+    service principal, or a managed identity).
+    """
+
+    def __init__(self, container: str, connection_string: str = "", account_url: str = ""):
+        from azure.storage.blob import BlobServiceClient
+
+        if connection_string:
+            service = BlobServiceClient.from_connection_string(connection_string)
+        else:
+            from azure.identity import DefaultAzureCredential
+            service = BlobServiceClient(account_url, credential=DefaultAzureCredential())
+        self._container = service.get_container_client(container)
+
+    def _settings(self, content_type: Optional[str]):
+        from azure.storage.blob import ContentSettings
+        return ContentSettings(content_type=content_type) if content_type else None
+
+    def put_bytes(self, key: str, data: bytes, content_type: Optional[str] = None) -> str:
+        self._container.upload_blob(key, data, overwrite=True, content_settings=self._settings(content_type))
+        return key
+
+    def put_stream(self, key: str, stream: BinaryIO, content_type: Optional[str] = None) -> str:
+        self._container.upload_blob(
+            key, stream, overwrite=True, content_settings=self._settings(content_type), max_concurrency=4
+        )
+        return key
+
+    def get_bytes(self, key: str) -> bytes:
+        return self._container.download_blob(key).readall()
+
+    def exists(self, key: str) -> bool:
+        return self._container.get_blob_client(key).exists()
+
+    def delete(self, key: str) -> None:
+        self._container.delete_blob(key, delete_snapshots="include")
+
+    def url(self, key: str) -> str:
+        return self._container.get_blob_client(key).url
+
+
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """The configured store (BLOB_STORE = "local" or "azure"), created on first use"""
+    global _blob_store
+    if _blob_store is None:
+        if settings.BLOB_STORE == "azure":
+            _blob_store = AzureBlobStore(
+                settings.AZURE_STORAGE_CONTAINER,
+                connection_string=settings.AZURE_STORAGE_CONNECTION_STRING,
+                account_url=settings.AZURE_STORAGE_ACCOUNT_URL,
+            )
+        else:
+            _blob_store = LocalBlobStore(settings.BLOB_LOCAL_ROOT)
+    return _blob_store
@@ -1,44 +1,66 @@
 # app/db/database.py
-from sqlalchemy import create_engine, text
+# Single source of engines/sessions for the app, scripts and Alembic.
+# Pool behaviour is configured through the DB_* settings in app/core/config.py.
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from dotenv import load_dotenv
-import os
-import psycopg2
-# Load environment variables
-load_dotenv()
-
-# Get database configuration
-DB_HOST = os.getenv("DB_HOST")
-DB_NAME = os.getenv("DB_NAME")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_PORT = os.getenv("DB_PORT", "5432")
+
+from app.core.config import settings
+from app.db.pool import TimedAsyncQueuePool, TimedQueuePool
 
 Base = declarative_base()
 
-def _connect():
-    return psycopg2.connect(
-        host=DB_HOST,
-        database=DB_NAME,
-        user=DB_USER,
-        password=DB_PASSWORD,
-        port=DB_PORT,
-        sslmode='require',
-        connect_timeout=10
-    )
-
-# 3) Engine from creator (DO NOT pass psycopg2.connect into create_engine)
+
+def job_pool_size() -> int:
+    """Sync connections a web worker keeps for blocking jobs: one per report worker, one for user imports"""
+    return max(1, settings.REPORT_WORKERS) + 1
+
+
+def pool_options(reserved: int = 0) -> dict:
+    """Per-worker pool arguments; DB_MAX_CONNECTIONS is shared across WEB_CONCURRENCY workers.
+
+    `reserved` connections of each worker's share are held back for another pool.
+    """
+    pool_size = settings.DB_POOL_SIZE
+    max_overflow = settings.DB_MAX_OVERFLOW
+    if settings.DB_MAX_CONNECTIONS > 0:
+        per_worker = max(1, settings.DB_MAX_CONNECTIONS // max(1, settings.WEB_CONCURRENCY) - reserved)
+        pool_size = min(pool_size, per_worker)
+        max_overflow = min(max_overflow, per_worker - pool_size)
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,  # avoid long-held sockets
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _sync_connect_args() -> dict:
+    args = {"sslmode": settings.DB_SSLMODE, "connect_timeout": settings.DB_CONNECT_TIMEOUT}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    return args
+
+
+def _async_connect_args() -> dict:
+    args = {"timeout": settings.DB_CONNECT_TIMEOUT}
+    if settings.DB_SSLMODE != "disable":
+        args["ssl"] = settings.DB_SSLMODE
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    return args
+
+
+# Sync engine (psycopg2) for init_db.py, Alembic and other scripts; never used by web workers
 engine = create_engine(
-    "postgresql+psycopg2://",   # empty DSN on purpose
-    creator=_connect,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=5,
-    pool_recycle=300,           # avoid long-held sockets
+    settings.DATABASE_URL,
+    connect_args=_sync_connect_args(),
+    poolclass=TimedQueuePool,
+    **pool_options(),
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
 
 def get_db():
     db = SessionLocal()
@@ -48,3 +70,54 @@ def get_db():
         db.close()
 
 
+# Sync engine (psycopg2) for blocking work web workers hand to threads (report reads,
+# user import COPY).
+# Its fixed size is taken out of the worker's DB_MAX_CONNECTIONS share below.
+job_engine = create_engine(
+    settings.DATABASE_URL,
+    connect_args=_sync_connect_args(),
+    poolclass=TimedQueuePool,
+    pool_size=job_pool_size(),
+    max_overflow=0,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+
+JobSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=job_engine)
+
+
+# Async engine (asyncpg) for the API; with job_engine, the only pools a web worker checks out from
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    connect_args=_async_connect_args(),
+    poolclass=TimedAsyncQueuePool,
+    **pool_options(reserved=job_pool_size()),
+)
+
+# expire_on_commit=False: attributes stay loaded after commit, async sessions cannot lazy-load them
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _pool_metrics(pool) -> dict:
+    # Engines swapped in by tests may use a plain pool without timings
+    if hasattr(pool, "metrics"):
+        return pool.metrics()
+    return {"status": pool.status()}
+
+
+def pool_metrics() -> dict:
+    return {
+        "async": _pool_metrics(async_engine.sync_engine.pool),
+        "sync": _pool_metrics(engine.pool),
+        "jobs": _pool_metrics(job_engine.pool),
+    }
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text, Float, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text, Float, Sequence, Index, DDL, event, func, literal_column, text, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 import enum
 from app.db.database import Base
@@ -28,6 +29,16 @@ class CheckInStatus(str, enum.Enum):
     CHECKED_OUT = "checked_out"
 
 
+# ID sequences - numeric part of prefixed IDs, handed out by app.core.ids
+user_id_seq = Sequence("user_id_seq", metadata=Base.metadata)
+admin_id_seq = Sequence("admin_id_seq", metadata=Base.metadata)
+security_officer_id_seq = Sequence("security_officer_id_seq", metadata=Base.metadata)
+visitor_id_seq = Sequence("visitor_id_seq", metadata=Base.metadata)
+booking_id_seq = Sequence("booking_id_seq", metadata=Base.metadata)
+checkin_id_seq = Sequence("checkin_id_seq", metadata=Base.metadata)
+laptop_record_id_seq = Sequence("laptop_record_id_seq", metadata=Base.metadata)
+
+
 # Models
 class User(Base):
     """Employee/User model"""
@@ -35,24 +46,54 @@ class User(Base):
 
     id = Column(String(50), primary_key=True, index=True)  # USR-001
     email = Column(String(255), unique=True, index=True, nullable=False)
-    hashed_password = Column(String(255), nullable=False)
+    # Only login needs it; load with undefer(User.hashed_password)
+    hashed_password = deferred(Column(String(255), nullable=False), raiseload=True)
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
     phone = Column(String(20))
-    building_id = Column(String(50), ForeignKey("buildings.id"))
+    building_id = Column(String(50), ForeignKey("buildings.id"), index=True)
     programme = Column(String(100))  # Programme 1A, 1B, etc.
     laptop_model = Column(String(200))
     laptop_asset_number = Column(String(100))
     photo_url = Column(String(500))
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    # Relationships
+    # Relationships (collections raise instead of lazy-loading; query the child table instead)
     building = relationship("Building", back_populates="users")
-    check_ins = relationship("CheckIn", back_populates="user")
-    bookings = relationship("Booking", back_populates="user")
-    laptop_records = relationship("LaptopRecord", back_populates="user")
+    check_ins = relationship("CheckIn", back_populates="user", lazy="raise")
+    bookings = relationship("Booking", back_populates="user", lazy="raise")
+    laptop_records = relationship("LaptopRecord", back_populates="user", lazy="raise")
+
+
+# Trigram indexes for directory search and kiosk autocomplete (Postgres only, see app/services/search.py)
+# The separator is a literal so queries render exactly the indexed expression
+USER_FULL_NAME = (User.first_name + literal_column("' '") + User.last_name).label("full_name")
+
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+
+Index(
+    "ix_users_full_name_trgm", USER_FULL_NAME,
+    postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_users_email_trgm", User.email,
+    postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_users_phone_trgm", User.phone,
+    postgresql_using="gin", postgresql_ops={"phone": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
 
 
 class Visitor(Base):
@@ -69,7 +110,7 @@ class Visitor(Base):
 
     # Visit details
     purpose = Column(String(20))  # EmployeeVisit or Other
-    host_employee_id = Column(String(50), ForeignKey("users.id"))
+    host_employee_id = Column(String(50), ForeignKey("users.id"), index=True)
     host_employee_name = Column(String(200))
     other_reason = Column(String(500))
 
@@ -86,6 +127,11 @@ class Visitor(Base):
     device_id = Column(String(100))  # Kiosk device
     registered_at = Column(DateTime, default=datetime.utcnow)
 
+    # Pre-registration: the QR pass carries access_token, valid for a window around expected_at
+    access_token = Column(String(64), unique=True, index=True, nullable=True)
+    expected_at = Column(DateTime, nullable=True)
+    pass_expires_at = Column(DateTime, nullable=True)
+
     # Relationships
     host = relationship("User", foreign_keys=[host_employee_id])
     building = relationship("Building")
@@ -105,7 +151,7 @@ class Building(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
-    users = relationship("User", back_populates="building")
+    users = relationship("User", back_populates="building", lazy="raise")
     floors = relationship("Floor", back_populates="building", cascade="all, delete-orphan")
     spaces = relationship("Space", back_populates="building")
 
@@ -115,7 +161,7 @@ class Floor(Base):
     __tablename__ = "floors"
 
     id = Column(String(50), primary_key=True, index=True)  # FLR-001
-    building_id = Column(String(50), ForeignKey("buildings.id"), nullable=False)
+    building_id = Column(String(50), ForeignKey("buildings.id"), nullable=False, index=True)
     name = Column(String(100), nullable=False)  # Ground Floor, First Floor, etc.
     order = Column(Integer, default=0)  # For sorting
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -130,7 +176,7 @@ class Block(Base):
     __tablename__ = "blocks"
 
     id = Column(String(50), primary_key=True, index=True)  # BLK-001
-    floor_id = Column(String(50), ForeignKey("floors.id"), nullable=False)
+    floor_id = Column(String(50), ForeignKey("floors.id"), nullable=False, index=True)
     name = Column(String(100), nullable=False)  # Block A, North Wing, etc.
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -165,11 +211,17 @@ class Space(Base):
 
     is_available = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     building = relationship("Building", back_populates="spaces")
     bookings = relationship("Booking", back_populates="space")
 
+    # Floor plan / availability lookups filter on building, then floor and block
+    __table_args__ = (
+        Index("ix_spaces_building_floor_block", "building_id", "floor", "block"),
+    )
+
 
 class Booking(Base):
     """Booking model"""
@@ -183,6 +235,10 @@ class Booking(Base):
     start_time = Column(String(10))  # "09:00"
     end_time = Column(String(10))    # "17:00"
 
+    # Typed [starts_at, ends_at) range used for overlap checks (see app/services/bookings.py)
+    starts_at = Column(DateTime)
+    ends_at = Column(DateTime)
+
     status = Column(SQLEnum(BookingStatus), default=BookingStatus.CONFIRMED)
 
     # Meeting room specific
@@ -199,6 +255,21 @@ class Booking(Base):
     user = relationship("User", back_populates="bookings")
     space = relationship("Space", back_populates="bookings")
 
+    # No two confirmed bookings of a space may overlap (Postgres only; the GiST index
+    # behind it also serves availability queries). Enum columns store member names.
+    __table_args__ = (
+        ExcludeConstraint(
+            (space_id, "="),
+            (func.tsrange(starts_at, ends_at), "&&"),
+            name="ex_bookings_space_time",
+            using="gist",
+            where=text("status = 'CONFIRMED'"),
+        ).ddl_if(dialect="postgresql"),
+        Index("ix_bookings_space_booking_date", "space_id", "booking_date"),
+        Index("ix_bookings_user_starts_at", "user_id", "starts_at"),
+        Index("ix_bookings_created_at", "created_at"),  # occupancy rollup watermark
+    )
+
 
 class CheckIn(Base):
     """Check-in/Check-out records"""
@@ -207,8 +278,8 @@ class CheckIn(Base):
     id = Column(String(50), primary_key=True, index=True)  # CHK-001
 
     # Can be either user or visitor
-    user_id = Column(String(50), ForeignKey("users.id"), nullable=True)
-    visitor_id = Column(String(50), ForeignKey("visitors.id"), nullable=True)
+    user_id = Column(String(50), ForeignKey("users.id"), nullable=True, index=True)
+    visitor_id = Column(String(50), ForeignKey("visitors.id"), nullable=True, index=True)
     user_type = Column(SQLEnum(UserType), nullable=False)
 
     # Location
@@ -220,9 +291,9 @@ class CheckIn(Base):
     laptop_model = Column(String(200))
     laptop_asset_number = Column(String(100))
 
-    # Time tracking
-    check_in_time = Column(DateTime, nullable=False, default=datetime.utcnow)
-    check_out_time = Column(DateTime, nullable=True)
+    # Time tracking (partition key, hence part of the table's primary key)
+    check_in_time = Column(DateTime, primary_key=True, nullable=False, default=datetime.utcnow)
+    check_out_time = Column(DateTime, nullable=True, index=True)  # occupancy rollup watermark
     duration_minutes = Column(Integer, nullable=True)
 
     status = Column(SQLEnum(CheckInStatus), default=CheckInStatus.CHECKED_IN)
@@ -235,6 +306,21 @@ class CheckIn(Base):
     visitor = relationship("Visitor", back_populates="check_ins")
     building = relationship("Building")
 
+    # Partial indexes only cover open check-ins (roster rebuild, checkout lookups).
+    # Enum columns store member names.
+    # Monthly range partitions on Postgres (app/services/archive.py); rows are still addressed by id alone
+    __mapper_args__ = {"primary_key": [id]}
+    __table_args__ = (
+        Index("ix_checkins_building_check_in_time", "building_id", "check_in_time"),
+        Index(
+            "ix_checkins_open_building", "building_id", "check_in_time",
+            postgresql_where=text("status = 'CHECKED_IN'"),
+        ),
+        Index("ix_checkins_open_user", "user_id", postgresql_where=text("status = 'CHECKED_IN'")),
+        Index("ix_checkins_open_visitor", "visitor_id", postgresql_where=text("status = 'CHECKED_IN'")),
+        {"postgresql_partition_by": "RANGE (check_in_time)"},
+    )
+
 
 class LaptopRecord(Base):
     """Laptop tracking records"""
@@ -260,7 +346,7 @@ class LaptopRecord(Base):
     block = Column(String(100))
 
     # Time tracking
-    check_in_date = Column(DateTime, nullable=False)
+    check_in_date = Column(DateTime, primary_key=True, nullable=False)  # partition key
     check_in_time = Column(String(10))
     check_out_date = Column(DateTime, nullable=True)
     check_out_time = Column(String(10), nullable=True)
@@ -277,6 +363,72 @@ class LaptopRecord(Base):
     user = relationship("User", back_populates="laptop_records")
     building = relationship("Building")
 
+    __mapper_args__ = {"primary_key": [id]}
+    __table_args__ = (
+        Index("ix_laptop_records_user_check_in_date", "user_id", "check_in_date"),
+        Index("ix_laptop_records_building_check_in_date", "building_id", "check_in_date"),
+        Index("ix_laptop_records_open_user", "user_id", postgresql_where=text("status = 'CHECKED_IN'")),
+        {"postgresql_partition_by": "RANGE (check_in_date)"},
+    )
+
+
+# Partitioned tables need somewhere to put rows before monthly partitions exist
+# (fresh create_all databases); app/services/archive.py creates the monthly ones.
+for _table in (CheckIn.__table__, LaptopRecord.__table__):
+    event.listen(
+        _table,
+        "after_create",
+        DDL(f"CREATE TABLE IF NOT EXISTS {_table.name}_default PARTITION OF {_table.name} DEFAULT")
+        .execute_if(dialect="postgresql"),
+    )
+
+
+class ArchivedPartition(Base):
+    """Monthly history partitions moved to cold storage"""
+    __tablename__ = "archived_partitions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    table_name = Column(String(100), nullable=False)
+    partition_name = Column(String(100), nullable=False, unique=True)
+    range_start = Column(DateTime, nullable=False)
+    range_end = Column(DateTime, nullable=False)
+    row_count = Column(Integer, nullable=False)
+    blob_key = Column(String(500), nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
+class OccupancyHourly(Base):
+    """Check-ins, check-outs and bookings per building/floor per hour (app/services/rollups.py)"""
+    __tablename__ = "occupancy_hourly"
+
+    building_id = Column(String(50), primary_key=True)
+    floor = Column(String(100), primary_key=True, default="")  # "" when unknown
+    hour = Column(DateTime, primary_key=True)
+    check_ins = Column(Integer, nullable=False, default=0)
+    check_outs = Column(Integer, nullable=False, default=0)
+    bookings = Column(Integer, nullable=False, default=0)
+
+
+class OccupancyDaily(Base):
+    """Daily totals of OccupancyHourly"""
+    __tablename__ = "occupancy_daily"
+
+    building_id = Column(String(50), primary_key=True)
+    floor = Column(String(100), primary_key=True, default="")
+    day = Column(DateTime, primary_key=True)
+    check_ins = Column(Integer, nullable=False, default=0)
+    check_outs = Column(Integer, nullable=False, default=0)
+    bookings = Column(Integer, nullable=False, default=0)
+
+
+class RollupWatermark(Base):
+    """How far each rollup source has been folded in"""
+    __tablename__ = "rollup_watermarks"
+
+    source = Column(String(50), primary_key=True)  # checkins.check_in_time, bookings.created_at, ...
+    value = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 
 class SecurityOfficer(Base):
     """Security officer model"""
@@ -0,0 +1,64 @@
+import time
+from collections import deque
+from threading import Lock
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class _TimedPoolMixin:
+    """Records how long each checkout waited for a connection (including connect time)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._wait_samples = deque(maxlen=512)
+        self._wait_lock = Lock()
+        self._timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._wait_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            with self._wait_lock:
+                self._wait_samples.append(time.perf_counter() - started)
+
+    def recreate(self):
+        # Keep metrics across engine.dispose()
+        new_pool = super().recreate()
+        new_pool._wait_samples = self._wait_samples
+        new_pool._timeouts = self._timeouts
+        return new_pool
+
+    def metrics(self) -> dict:
+        with self._wait_lock:
+            samples = sorted(self._wait_samples)
+            timeouts = self._timeouts
+
+        def ms(value: float) -> float:
+            return round(value * 1000, 2)
+
+        return {
+            "pool_size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(0, self.overflow()),
+            "timeouts": timeouts,
+            "wait_ms": {
+                "avg": ms(sum(samples) / len(samples)) if samples else None,
+                "p95": ms(samples[int(0.95 * (len(samples) - 1))]) if samples else None,
+                "max": ms(samples[-1]) if samples else None,
+            },
+        }
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
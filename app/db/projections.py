@@ -0,0 +1,35 @@
+from functools import lru_cache
+from typing import List, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import inspect, select
+from sqlalchemy.sql import Select
+
+
+@lru_cache(maxsize=None)
+def _projection(model: type, schema: Type[BaseModel]) -> Tuple[Tuple[str, ...], tuple]:
+    column_keys = set(inspect(model).column_attrs.keys())
+    fields = tuple(field for field in schema.model_fields if field in column_keys)
+    return fields, tuple(getattr(model, field) for field in fields)
+
+
+def response_fields(model: type, schema: Type[BaseModel]) -> Tuple[str, ...]:
+    """Names of the schema fields that are plain columns on the model"""
+    return _projection(model, schema)[0]
+
+
+def response_columns(model: type, schema: Type[BaseModel]) -> List:
+    """Column attributes for the fields a response schema exposes"""
+    return list(_projection(model, schema)[1])
+
+
+def select_for(model: type, schema: Type[BaseModel]) -> Select:
+    """SELECT of just the columns needed to build `schema`, with no ORM hydration.
+
+    Rows come back as tuples; use rows_to_dicts() to feed them to response_model.
+    """
+    return select(*response_columns(model, schema))
+
+
+def rows_to_dicts(result) -> List[dict]:
+    return [dict(row) for row in result.mappings()]
@@ -0,0 +1,143 @@
+from pydantic import BaseModel, EmailStr, Field, model_validator
+from typing import List, Optional
+from datetime import date, datetime, time
+from enum import Enum
+
+from app.db.models import BookingStatus, SpaceType
+
+
+class BookingCreate(BaseModel):
+    space_id: str
+    booking_date: date
+    start_time: time
+    end_time: time
+    guest_emails: Optional[List[EmailStr]] = None
+    notify_guests: bool = False
+
+    @model_validator(mode="after")
+    def check_times(self):
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time must be after start_time")
+        return self
+
+
+class BookingResponse(BaseModel):
+    id: str
+    user_id: str
+    space_id: str
+    booking_date: datetime
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    starts_at: Optional[datetime] = None
+    ends_at: Optional[datetime] = None
+    status: BookingStatus
+    guest_emails: Optional[str] = None
+    notify_guests: Optional[bool] = None
+    qr_code_url: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class RecurrenceFrequency(str, Enum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+
+
+class Recurrence(BaseModel):
+    frequency: RecurrenceFrequency = RecurrenceFrequency.WEEKLY
+    interval: int = Field(1, ge=1, le=52)
+    weekdays: Optional[List[int]] = None  # 0 = Monday; weekly only, defaults to the first date's weekday
+    until: Optional[date] = None
+    count: Optional[int] = Field(None, ge=1, le=366)
+
+    @model_validator(mode="after")
+    def check_bounds(self):
+        if self.until is None and self.count is None:
+            raise ValueError("recurrence needs until or count")
+        if self.weekdays and any(day < 0 or day > 6 for day in self.weekdays):
+            raise ValueError("weekdays must be between 0 (Monday) and 6 (Sunday)")
+        return self
+
+
+class BookingSlot(BaseModel):
+    space_id: str
+    booking_date: date
+    start_time: time
+    end_time: time
+
+    @model_validator(mode="after")
+    def check_times(self):
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time must be after start_time")
+        return self
+
+
+class BookingBatchCreate(BaseModel):
+    slots: List[BookingSlot] = Field(..., min_length=1)
+    recurrence: Optional[Recurrence] = None  # applied to every slot
+    user_id: Optional[str] = None  # admins may book on behalf of a user
+    guest_emails: Optional[List[EmailStr]] = None
+    notify_guests: bool = False
+    skip_conflicts: bool = False  # default is all-or-nothing
+
+
+class BookingOccurrence(BaseModel):
+    space_id: str
+    booking_date: date
+    start_time: str
+    end_time: str
+    status: str  # created, conflict or skipped
+    booking_id: Optional[str] = None
+    conflicts_with: Optional[str] = None
+
+
+class BookingBatchResponse(BaseModel):
+    created: int
+    conflicts: int
+    results: List[BookingOccurrence]
+
+
+class SpaceResponse(BaseModel):
+    id: str
+    name: str
+    type: SpaceType
+    building_id: str
+    floor: Optional[str] = None
+    block: Optional[str] = None
+    capacity: Optional[int] = None
+    description: Optional[str] = None
+    image_url: Optional[str] = None
+    has_wifi: Optional[bool] = None
+    has_monitor: Optional[bool] = None
+    has_coffee: Optional[bool] = None
+    has_video_conf: Optional[bool] = None
+    has_projector: Optional[bool] = None
+    has_whiteboard: Optional[bool] = None
+    has_power: Optional[bool] = None
+    has_standing_desk: Optional[bool] = None
+    has_conference_phone: Optional[bool] = None
+    is_available: Optional[bool] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SpaceSlots(BaseModel):
+    id: str
+    name: str
+    type: SpaceType
+    floor: Optional[str] = None
+    block: Optional[str] = None
+    booked: str  # base64 bitmap, one bit per slot, most significant bit first, 1 = booked
+
+
+class AvailabilityGrid(BaseModel):
+    building_id: str
+    floor: Optional[str] = None
+    block: Optional[str] = None
+    start: datetime
+    slot_minutes: int
+    slots: int
+    spaces: List[SpaceSlots]
@@ -0,0 +1,55 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+
+class BuildingResponse(BaseModel):
+    id: str
+    name: str
+    address: Optional[str] = None
+    total_floors: Optional[int] = None
+    total_blocks: Optional[int] = None
+    is_active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class FloorResponse(BaseModel):
+    id: str
+    building_id: str
+    name: str
+    order: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+class BlockResponse(BaseModel):
+    id: str
+    floor_id: str
+    name: str
+
+    class Config:
+        from_attributes = True
+
+
+class BlockNode(BaseModel):
+    id: str
+    name: str
+
+
+class FloorNode(BaseModel):
+    id: str
+    name: str
+    order: Optional[int] = None
+    blocks: List[BlockNode] = []
+
+
+class BuildingTree(BaseModel):
+    id: str
+    name: str
+    address: Optional[str] = None
+    is_active: Optional[bool] = None
+    floors: List[FloorNode] = []
@@ -0,0 +1,63 @@
+from pydantic import BaseModel, model_validator
+from typing import List, Optional
+from datetime import datetime
+
+from app.db.models import CheckInStatus, UserType
+
+
+class CheckInCreate(BaseModel):
+    user_id: Optional[str] = None
+    visitor_id: Optional[str] = None
+    building_id: str
+    floor: Optional[str] = None
+    block: Optional[str] = None
+    laptop_model: Optional[str] = None
+    laptop_asset_number: Optional[str] = None
+    qr_code_data: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_person(self):
+        if bool(self.user_id) == bool(self.visitor_id):
+            raise ValueError("exactly one of user_id or visitor_id is required")
+        return self
+
+
+class CheckInResponse(BaseModel):
+    id: str
+    user_id: Optional[str] = None
+    visitor_id: Optional[str] = None
+    user_type: UserType
+    building_id: Optional[str] = None
+    floor: Optional[str] = None
+    block: Optional[str] = None
+    laptop_model: Optional[str] = None
+    laptop_asset_number: Optional[str] = None
+    check_in_time: datetime
+    check_out_time: Optional[datetime] = None
+    duration_minutes: Optional[int] = None
+    status: CheckInStatus
+
+    class Config:
+        from_attributes = True
+
+
+class RosterEntry(BaseModel):
+    checkin_id: str
+    person_id: str
+    user_type: UserType
+    building_id: str
+    floor: Optional[str] = None
+    block: Optional[str] = None
+    check_in_time: datetime
+    laptop_record_id: Optional[str] = None
+    laptop_asset_number: Optional[str] = None
+
+
+class Headcount(BaseModel):
+    building_id: str
+    count: int
+
+
+class HeadcountResponse(BaseModel):
+    total: int
+    buildings: List[Headcount]
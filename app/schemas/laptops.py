@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date
+
+
+class AssetOwner(BaseModel):
+    user_id: str
+    first_name: str
+    last_name: str
+    laptop_model: Optional[str] = None
+    building_id: Optional[str] = None
+    is_active: bool
+
+
+class AssetResolution(BaseModel):
+    asset_number: str
+    registered: bool
+    owner: Optional[AssetOwner] = None
+    is_match: Optional[bool] = None  # only when a user_id was given
+
+
+class LaptopMismatch(BaseModel):
+    id: str
+    user_id: str
+    checked_in_asset_number: Optional[str] = None
+    registered_asset_number: Optional[str] = None
+
+
+class LaptopReconcileResult(BaseModel):
+    day: date
+    records: int
+    matches: int
+    mismatches: int
+    mismatched: List[LaptopMismatch]
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Dict
+
+
+class PhotoUpload(BaseModel):
+    digest: str  # SHA-256 of the original bytes
+    url: str  # original; append ?size=N for a WebP thumbnail
+    thumbnails: Dict[int, str]
+    content_type: str
+    size_bytes: int
+    deduplicated: bool  # the same photo was already stored
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field, model_validator
+from typing import List, Optional
 from datetime import datetime
 
 class UserBase(BaseModel):
@@ -40,4 +40,46 @@ class UserResponse(UserProfile):
 class UserProfileUpdate(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
-    email: Optional[EmailStr] = None
\ No newline at end of file
+    email: Optional[EmailStr] = None
+
+class UserImportRowError(BaseModel):
+    row: int  # line number in the file, header = 1
+    email: Optional[str] = None
+    errors: List[str]
+
+
+class UserImportResult(BaseModel):
+    total_rows: int
+    created: int
+    failed: int
+    dry_run: bool
+    user_ids: List[str]
+    errors: List[UserImportRowError]
+
+
+MAX_BULK_USERS = 10000
+
+
+class UserBulkIds(BaseModel):
+    user_ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_USERS)
+
+
+class UserBulkUpdate(UserBulkIds):
+    # Only the fields sent are changed; an explicit null clears building_id/programme
+    building_id: Optional[str] = None
+    programme: Optional[str] = None
+    is_active: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def check_fields(self):
+        if not self.model_fields_set - {"user_ids"}:
+            raise ValueError("set at least one of building_id, programme or is_active")
+        if "is_active" in self.model_fields_set and self.is_active is None:
+            raise ValueError("is_active cannot be null")
+        return self
+
+
+class UserBulkResult(BaseModel):
+    updated: int
+    user_ids: List[str]
+    not_found: List[str]  # unknown ids (and, for deactivate, users already inactive)
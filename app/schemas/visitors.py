@@ -0,0 +1,74 @@
+from pydantic import BaseModel, EmailStr, field_validator, model_validator
+from typing import Optional
+from datetime import datetime, timezone
+
+
+class VisitorPreRegister(BaseModel):
+    first_name: str
+    last_name: str
+    company: Optional[str] = None
+    mobile: str
+    email: Optional[EmailStr] = None
+    purpose: str = "EmployeeVisit"  # EmployeeVisit or Other
+    host_employee_id: Optional[str] = None  # defaults to the caller; admins may register for any host
+    other_reason: Optional[str] = None
+    building_id: str
+    floor: Optional[str] = None
+    block: Optional[str] = None
+    expected_at: datetime
+    has_weapons: bool = False
+    weapon_details: Optional[str] = None
+
+    @field_validator("expected_at")
+    @classmethod
+    def naive_utc(cls, value: datetime) -> datetime:
+        # Stored in naive UTC DateTime columns and compared with utcnow()
+        if value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @model_validator(mode="after")
+    def check_weapons(self):
+        if self.has_weapons and not self.weapon_details:
+            raise ValueError("weapon_details is required when has_weapons is set")
+        return self
+
+
+class VisitorResponse(BaseModel):
+    id: str
+    first_name: str
+    last_name: str
+    company: Optional[str] = None
+    mobile: str
+    email: Optional[str] = None
+    photo_url: Optional[str] = None
+    purpose: Optional[str] = None
+    host_employee_id: Optional[str] = None
+    host_employee_name: Optional[str] = None
+    other_reason: Optional[str] = None
+    building_id: Optional[str] = None
+    floor: Optional[str] = None
+    block: Optional[str] = None
+    has_weapons: Optional[bool] = None
+    weapon_details: Optional[str] = None
+    expected_at: Optional[datetime] = None
+    pass_expires_at: Optional[datetime] = None
+    registered_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class VisitorPass(BaseModel):
+    visitor: VisitorResponse
+    access_token: str
+    qr_code_url: str  # PNG of the pass, content-addressed
+
+
+class KioskScan(BaseModel):
+    qr_code_data: str  # scanned payload (or the bare access token)
+    building_id: str  # building of the kiosk
+    device_id: Optional[str] = None
+    # Declarations confirmed (or corrected) at the kiosk
+    has_weapons: Optional[bool] = None
+    weapon_details: Optional[str] = None
@@ -0,0 +1,213 @@
+"""Monthly partitions of check-in/laptop history and their archival to Parquet.
+
+Both tables are range-partitioned by month on Postgres (migration
+0005_partition_history). run_maintenance() creates partitions ahead of time
+and moves partitions older than ARCHIVE_KEEP_MONTHS to blob storage as
+zstd-compressed Parquet, then detaches and drops them. It is blocking and
+meant for archive_history.py (cron), not for request handlers.
+"""
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Boolean, DateTime, Enum, Float, Integer, String, column, select, text, table as table_clause
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.storage import BlobStore
+from app.db.models import ArchivedPartition, Base
+
+# table -> partition key column
+PARTITIONED_TABLES = {
+    "checkins": "check_in_time",
+    "laptop_records": "check_in_date",
+}
+
+EXPORT_BATCH_ROWS = 50000
+
+_BOUND = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+@dataclass
+class Partition:
+    table: str
+    name: str
+    start: datetime
+    end: datetime
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def list_partitions(conn: Connection, table: str) -> List[Partition]:
+    """Monthly partitions of `table`, oldest first (the DEFAULT partition is left out)"""
+    rows = conn.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table"
+        ),
+        {"table": table},
+    )
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND.search(bound or "")
+        if match:
+            partitions.append(Partition(
+                table, name, datetime.fromisoformat(match.group(1)), datetime.fromisoformat(match.group(2))
+            ))
+    return sorted(partitions, key=lambda partition: partition.start)
+
+
+def ensure_partition(conn: Connection, table: str, month: date) -> bool:
+    """Create the partition for `month` if missing, moving any rows the DEFAULT partition holds for it"""
+    name = partition_name(table, month)
+    if conn.scalar(text("SELECT to_regclass(:name)"), {"name": name}) is not None:
+        return False
+
+    quote = conn.dialect.identifier_preparer.quote
+    key = PARTITIONED_TABLES[table]
+    start, end = month, add_months(month, 1)
+    # Rows that landed in DEFAULT for this month must leave it before the range can be attached
+    conn.execute(text(f"CREATE TABLE {quote(name)} (LIKE {quote(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    conn.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {quote(table + '_default')} "
+            f"WHERE {key} >= :start AND {key} < :end RETURNING *) "
+            f"INSERT INTO {quote(name)} SELECT * FROM moved"
+        ),
+        {"start": start, "end": end},
+    )
+    # Partition bounds must be literals; they are computed dates, never user input
+    conn.execute(text(
+        f"ALTER TABLE {quote(table)} ATTACH PARTITION {quote(name)} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    return True
+
+
+def _arrow_schema(table: str) -> pa.Schema:
+    fields = []
+    for table_column in Base.metadata.tables[table].columns:
+        if isinstance(table_column.type, DateTime):
+            arrow_type = pa.timestamp("us")
+        elif isinstance(table_column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(table_column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(table_column.type, Float):
+            arrow_type = pa.float64()
+        else:
+            arrow_type = pa.string()  # strings, text and enum names
+        fields.append(pa.field(table_column.name, arrow_type))
+    return pa.schema(fields)
+
+
+def export_partition(engine: Engine, partition: Partition, path: str) -> int:
+    """Stream a partition into a Parquet file in batches; returns the row count"""
+    schema = _arrow_schema(partition.table)
+    # Same columns as the parent table, read from the partition; enums stay as their stored names
+    source = table_clause(partition.name, *[
+        column(col.name, String() if isinstance(col.type, Enum) else col.type)
+        for col in Base.metadata.tables[partition.table].columns
+    ])
+    query = select(*source.columns).order_by(source.c[PARTITIONED_TABLES[partition.table]])
+    written = 0
+    with engine.connect() as conn, pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        result = conn.execution_options(stream_results=True, yield_per=EXPORT_BATCH_ROWS).execute(query)
+        for rows in result.partitions():
+            batch = pa.Table.from_pylist([dict(row._mapping) for row in rows], schema=schema)
+            writer.write_table(batch)
+            written += batch.num_rows
+    return written
+
+
+def archive_partition(engine: Engine, store: BlobStore, partition: Partition) -> Optional[str]:
+    """Copy a closed partition to blob storage, then detach and drop it.
+
+    Returns the blob key, or None when the partition was skipped because it
+    still holds open check-ins.
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    with engine.connect() as conn:
+        open_rows = conn.scalar(
+            text(f"SELECT count(*) FROM {quote(partition.name)} WHERE status = 'CHECKED_IN'")
+        )
+    if open_rows:
+        return None
+
+    key = f"archive/{partition.table}/{partition.name}.parquet"
+    fd, path = tempfile.mkstemp(suffix=".parquet")
+    os.close(fd)
+    try:
+        written = export_partition(engine, partition, path)
+        store.put_file(key, path, content_type="application/vnd.apache.parquet")
+    finally:
+        os.unlink(path)
+
+    with engine.begin() as conn:
+        # The month is closed, but make sure nothing was written while exporting
+        current = conn.scalar(text(f"SELECT count(*) FROM {quote(partition.name)}"))
+        if current != written:
+            raise RuntimeError(f"{partition.name} changed during export ({written} exported, {current} now)")
+        conn.execute(text(f"ALTER TABLE {quote(partition.table)} DETACH PARTITION {quote(partition.name)}"))
+        conn.execute(text(f"DROP TABLE {quote(partition.name)}"))
+        conn.execute(
+            ArchivedPartition.__table__.insert().values(
+                table_name=partition.table,
+                partition_name=partition.name,
+                range_start=partition.start,
+                range_end=partition.end,
+                row_count=written,
+                blob_key=key,
+                archived_at=datetime.utcnow(),
+            )
+        )
+    return key
+
+
+def run_maintenance(
+    engine: Engine,
+    store: BlobStore,
+    keep_months: int,
+    months_ahead: int,
+    dry_run: bool = False,
+    today: Optional[date] = None,
+) -> List[str]:
+    """Create upcoming partitions and archive the expired ones; returns a log of what was done"""
+    this_month = month_start(today or date.today())
+    cutoff = datetime.combine(add_months(this_month, -keep_months), datetime.min.time())
+    log = []
+
+    for table in PARTITIONED_TABLES:
+        for offset in range(months_ahead + 1):
+            month = add_months(this_month, offset)
+            if dry_run:
+                continue
+            with engine.begin() as conn:
+                if ensure_partition(conn, table, month):
+                    log.append(f"created {partition_name(table, month)}")
+
+        with engine.connect() as conn:
+            expired = [partition for partition in list_partitions(conn, table) if partition.end <= cutoff]
+        for partition in expired:
+            if dry_run:
+                log.append(f"would archive {partition.name}")
+                continue
+            key = archive_partition(engine, store, partition)
+            log.append(f"archived {partition.name} -> {key}" if key else f"skipped {partition.name} (open check-ins)")
+    return log
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from datetime import date, datetime, time as day_time, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import CheckInStatus, LaptopRecord, User
+from app.schemas.laptops import AssetOwner, AssetResolution, LaptopMismatch, LaptopReconcileResult
+from app.services.user_events import subscribe
+
+
+def normalize_asset(asset_number: Optional[str]) -> str:
+    return (asset_number or "").strip().upper()
+
+
+def _sql_normalize(column):
+    """normalize_asset in SQL"""
+    return func.upper(func.trim(column))
+
+
+class AssetRegistry:
+    """Per-worker asset tag -> owner index for the security desk.
+
+    Loaded with one query over users with a registered laptop, kept current
+    from user change events (registration, admin and profile updates) and
+    reloaded every `resync_seconds` to pick up writes made by other workers.
+    """
+
+    def __init__(self, resync_seconds: float):
+        self.resync_seconds = resync_seconds
+        self._owners: Optional[Dict[str, AssetOwner]] = None
+        self._assets: Dict[str, str] = {}  # user_id -> normalized asset number
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def is_stale(self) -> bool:
+        return self._owners is None or time.monotonic() - self._loaded_at > self.resync_seconds
+
+    async def refresh(self, db: AsyncSession) -> None:
+        rows = await db.execute(
+            select(
+                User.id, User.first_name, User.last_name, User.laptop_model, User.building_id,
+                User.is_active, User.laptop_asset_number,
+            ).where(User.laptop_asset_number.is_not(None))
+        )
+        owners: Dict[str, AssetOwner] = {}
+        assets: Dict[str, str] = {}
+        for user_id, first_name, last_name, laptop_model, building_id, is_active, asset_number in rows:
+            key = normalize_asset(asset_number)
+            if not key:
+                continue
+            owners[key] = AssetOwner(
+                user_id=user_id, first_name=first_name, last_name=last_name,
+                laptop_model=laptop_model, building_id=building_id, is_active=bool(is_active),
+            )
+            assets[user_id] = key
+        self._owners, self._assets = owners, assets
+        self._loaded_at = time.monotonic()
+
+    async def ensure_fresh(self, db: AsyncSession) -> None:
+        if self.is_stale():
+            async with self._lock:
+                if self.is_stale():
+                    await self.refresh(db)
+
+    def owner_of(self, asset_number: Optional[str]) -> Optional[AssetOwner]:
+        return (self._owners or {}).get(normalize_asset(asset_number))
+
+    def resolve(self, asset_number: str, user_id: Optional[str] = None) -> AssetResolution:
+        owner = self.owner_of(asset_number)
+        return AssetResolution(
+            asset_number=normalize_asset(asset_number),
+            registered=owner is not None,
+            owner=owner,
+            is_match=(owner is not None and owner.user_id == user_id) if user_id else None,
+        )
+
+    def apply(self, before: Optional[dict], after: Optional[dict]) -> None:
+        """Re-key a user's asset after a committed user change"""
+        owners = self._owners
+        if owners is None:
+            return
+        user_id = (after or before)["id"]
+        previous = self._assets.pop(user_id, None)
+        if previous is not None and owners.get(previous) is not None and owners[previous].user_id == user_id:
+            del owners[previous]
+        key = normalize_asset(after.get("laptop_asset_number")) if after is not None else ""
+        if key:
+            owners[key] = AssetOwner(
+                user_id=user_id,
+                first_name=after.get("first_name"),
+                last_name=after.get("last_name"),
+                laptop_model=after.get("laptop_model"),
+                building_id=after.get("building_id"),
+                is_active=bool(after.get("is_active")),
+            )
+            self._assets[user_id] = key
+
+    def stats(self) -> dict:
+        return {
+            "assets": len(self._owners or {}),
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._owners is not None else None,
+        }
+
+
+async def reconcile_laptop_records(
+    db: AsyncSession, day: date, building_id: Optional[str] = None
+) -> LaptopReconcileResult:
+    """Recompute is_match for a day's laptop records in one UPDATE ... FROM users.
+
+    The registered copy is the check-in time snapshot and is only refreshed
+    from the user's current registration while the record is still open;
+    closed records are rechecked against their own snapshot.
+    """
+    day_start = datetime.combine(day, day_time.min)
+    is_open = LaptopRecord.status == CheckInStatus.CHECKED_IN
+    registered_asset_number = case((is_open, User.laptop_asset_number), else_=LaptopRecord.registered_asset_number)
+    statement = (
+        update(LaptopRecord)
+        .where(LaptopRecord.user_id == User.id)
+        .where(LaptopRecord.check_in_date >= day_start)
+        .where(LaptopRecord.check_in_date < day_start + timedelta(days=1))
+        .values(
+            registered_laptop=case((is_open, User.laptop_model), else_=LaptopRecord.registered_laptop),
+            registered_asset_number=registered_asset_number,
+            is_match=func.coalesce(
+                _sql_normalize(LaptopRecord.checked_in_asset_number) == _sql_normalize(registered_asset_number),
+                False,
+            ),
+        )
+        .returning(
+            LaptopRecord.id, LaptopRecord.user_id, LaptopRecord.checked_in_asset_number,
+            LaptopRecord.registered_asset_number, LaptopRecord.is_match,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if building_id:
+        statement = statement.where(LaptopRecord.building_id == building_id)
+
+    rows = (await db.execute(statement)).all()
+    await db.commit()
+
+    mismatched = [
+        LaptopMismatch(id=row[0], user_id=row[1], checked_in_asset_number=row[2], registered_asset_number=row[3])
+        for row in rows if not row[4]
+    ]
+    return LaptopReconcileResult(
+        day=day,
+        records=len(rows),
+        matches=len(rows) - len(mismatched),
+        mismatches=len(mismatched),
+        mismatched=sorted(mismatched, key=lambda record: record.id),
+    )
+
+
+asset_registry = AssetRegistry(settings.ASSET_REGISTRY_RESYNC_SECONDS)
+subscribe(asset_registry.apply)
@@ -0,0 +1,108 @@
+import base64
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Booking, BookingStatus, Space
+from app.schemas.bookings import AvailabilityGrid, SpaceSlots
+from app.services.bookings import overlaps
+
+
+def _space_filters(query, building_id: str, floor: Optional[str], block: Optional[str]):
+    query = query.where(Space.building_id == building_id)
+    if floor:
+        query = query.where(Space.floor == floor)
+    if block:
+        query = query.where(Space.block == block)
+    return query
+
+
+def encode_bitmap(bits: int, slots: int) -> str:
+    """Slot i is bit (width - 1 - i), i.e. MSB-first once packed into bytes"""
+    width = (slots + 7) // 8 * 8
+    return base64.b64encode(bits.to_bytes(width // 8, "big")).decode()
+
+
+async def grid_version(
+    db: AsyncSession, building_id: str, floor: Optional[str], block: Optional[str], start: datetime, end: datetime
+) -> tuple:
+    """Cheap aggregate that changes whenever the grid would: used as the ETag source"""
+    spaces = _space_filters(
+        select(
+            func.count(Space.id), func.max(Space.created_at), func.max(Space.updated_at),
+            func.count(Space.id).filter(Space.is_available == True),
+        ),
+        building_id, floor, block,
+    ).subquery()
+    bookings = _space_filters(
+        select(func.count(Booking.id), func.max(Booking.updated_at))
+        .join(Space, Space.id == Booking.space_id)
+        .where(overlaps(db, start, end)),
+        building_id, floor, block,
+    ).subquery()
+    row = (await db.execute(select(spaces, bookings).select_from(spaces.join(bookings, true())))).one()
+    return tuple(row)
+
+
+async def availability_grid(
+    db: AsyncSession,
+    building_id: str,
+    start: datetime,
+    days: int,
+    slot_minutes: int,
+    floor: Optional[str] = None,
+    block: Optional[str] = None,
+) -> AvailabilityGrid:
+    """Occupancy bitmap per space, from one pass over spaces LEFT JOIN confirmed bookings"""
+    end = start + timedelta(days=days)
+    slot = timedelta(minutes=slot_minutes)
+    slots = int((end - start) / slot)
+
+    query = _space_filters(
+        select(Space.id, Space.name, Space.type, Space.floor, Space.block, Booking.starts_at, Booking.ends_at)
+        .outerjoin(Booking, and_(
+            Booking.space_id == Space.id,
+            Booking.status == BookingStatus.CONFIRMED,
+            overlaps(db, start, end),
+        ))
+        .order_by(Space.floor, Space.block, Space.name, Space.id),
+        building_id, floor, block,
+    )
+
+    width = (slots + 7) // 8 * 8
+    spaces = {}
+    bitmaps = {}
+    for space_id, name, space_type, space_floor, space_block, starts_at, ends_at in await db.execute(query):
+        if space_id not in spaces:
+            spaces[space_id] = (name, space_type, space_floor, space_block)
+            bitmaps[space_id] = 0
+        if starts_at is None or ends_at is None:
+            continue
+        # Any slot the booking touches counts as booked
+        first = max(0, int((starts_at - start) / slot))
+        last = min(slots, -int(-(ends_at - start) // slot))
+        if last > first:
+            mask = ((1 << (last - first)) - 1) << (width - last)
+            bitmaps[space_id] |= mask
+
+    return AvailabilityGrid(
+        building_id=building_id,
+        floor=floor,
+        block=block,
+        start=start,
+        slot_minutes=slot_minutes,
+        slots=slots,
+        spaces=[
+            SpaceSlots(
+                id=space_id,
+                name=name,
+                type=space_type,
+                floor=space_floor,
+                block=space_block,
+                booked=encode_bitmap(bitmaps[space_id], slots),
+            )
+            for space_id, (name, space_type, space_floor, space_block) in spaces.items()
+        ],
+    )
@@ -0,0 +1,257 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, exists, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.ids import id_allocator
+from app.db.models import Booking, BookingStatus, Space, SpaceType
+from app.db.projections import rows_to_dicts, select_for
+from app.schemas.bookings import (
+    BookingCreate, BookingOccurrence, BookingSlot, Recurrence, RecurrenceFrequency, SpaceResponse,
+)
+from app.services.intervals import IntervalTree
+
+EXCLUSION_CONSTRAINT = "ex_bookings_space_time"
+MAX_BATCH_OCCURRENCES = 500
+
+
+class BookingConflict(Exception):
+    """The requested slot overlaps a confirmed booking of the same space"""
+
+
+def booking_window(booking_date: date, start_time: time, end_time: time) -> Tuple[datetime, datetime]:
+    """Typed [starts_at, ends_at) range for a booking on one day"""
+    return datetime.combine(booking_date, start_time), datetime.combine(booking_date, end_time)
+
+
+def is_postgres(db: AsyncSession) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def overlaps(db: AsyncSession, starts_at: datetime, ends_at: datetime):
+    """Booking overlaps [starts_at, ends_at); on Postgres phrased so the exclusion constraint's GiST index applies"""
+    if is_postgres(db):
+        return func.tsrange(Booking.starts_at, Booking.ends_at).op("&&")(func.tsrange(starts_at, ends_at))
+    return and_(Booking.starts_at < ends_at, Booking.ends_at > starts_at)
+
+
+async def confirmed_bookings_tree(
+    db: AsyncSession, space_ids: List[str], window_start: datetime, window_end: datetime
+) -> dict:
+    """One query for all confirmed bookings of `space_ids` in the window, as an IntervalTree per space"""
+    rows = await db.execute(
+        select(Booking.space_id, Booking.starts_at, Booking.ends_at, Booking.id)
+        .where(Booking.space_id.in_(space_ids))
+        .where(Booking.status == BookingStatus.CONFIRMED)
+        .where(overlaps(db, window_start, window_end))
+    )
+    by_space: dict = {space_id: [] for space_id in space_ids}
+    for space_id, starts_at, ends_at, booking_id in rows:
+        by_space[space_id].append((starts_at, ends_at, booking_id))
+    return {space_id: IntervalTree(intervals) for space_id, intervals in by_space.items()}
+
+
+def user_bookings_query(user_id: str, upcoming: bool = True):
+    """A user's bookings: upcoming soonest first, otherwise newest first"""
+    query = select(Booking).where(Booking.user_id == user_id)
+    if upcoming:
+        return query.where(Booking.ends_at >= datetime.utcnow()).order_by(Booking.starts_at)
+    return query.order_by(Booking.starts_at.desc())
+
+
+async def create_booking(db: AsyncSession, user_id: str, data: BookingCreate) -> Booking:
+    """Insert a confirmed booking; raises BookingConflict if the slot is taken"""
+    starts_at, ends_at = booking_window(data.booking_date, data.start_time, data.end_time)
+
+    if not is_postgres(db):
+        # No exclusion constraint here, check against the day's bookings instead
+        trees = await confirmed_bookings_tree(db, [data.space_id], starts_at, ends_at)
+        if trees[data.space_id].overlapping(starts_at, ends_at):
+            raise BookingConflict()
+
+    booking = Booking(
+        id=await id_allocator.next_id(db, "BK"),
+        user_id=user_id,
+        space_id=data.space_id,
+        booking_date=datetime.combine(data.booking_date, time.min),
+        start_time=data.start_time.strftime("%H:%M"),
+        end_time=data.end_time.strftime("%H:%M"),
+        starts_at=starts_at,
+        ends_at=ends_at,
+        status=BookingStatus.CONFIRMED,
+        guest_emails=",".join(data.guest_emails) if data.guest_emails else None,
+        notify_guests=data.notify_guests,
+    )
+    db.add(booking)
+    await _commit_or_conflict(db)
+    await db.refresh(booking)
+    return booking
+
+
+async def _commit_or_conflict(db: AsyncSession) -> None:
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        if EXCLUSION_CONSTRAINT in str(exc.orig):
+            raise BookingConflict() from exc
+        raise
+
+
+def expand_recurrence(first: date, rule: Optional[Recurrence]) -> List[date]:
+    """Dates produced by `rule` starting at `first` (just `first` without a rule)"""
+    if rule is None:
+        return [first]
+
+    dates: List[date] = []
+
+    def accept(day: date) -> bool:
+        if rule.until is not None and day > rule.until:
+            return False
+        if rule.count is not None and len(dates) >= rule.count:
+            return False
+        if len(dates) >= MAX_BATCH_OCCURRENCES:
+            raise ValueError(f"Recurrence expands to more than {MAX_BATCH_OCCURRENCES} bookings")
+        dates.append(day)
+        return True
+
+    if rule.frequency == RecurrenceFrequency.DAILY:
+        day = first
+        while accept(day):
+            day += timedelta(days=rule.interval)
+        return dates
+
+    weekdays = sorted(set(rule.weekdays or [first.weekday()]))
+    week_start = first - timedelta(days=first.weekday())
+    while True:
+        for weekday in weekdays:
+            day = week_start + timedelta(days=weekday)
+            if day >= first and not accept(day):
+                return dates
+        week_start += timedelta(weeks=rule.interval)
+
+
+def expand_slots(slots: List[BookingSlot], rule: Optional[Recurrence]) -> List[BookingSlot]:
+    """Every concrete occurrence of `slots` under `rule`"""
+    occurrences = [
+        slot.model_copy(update={"booking_date": day})
+        for slot in slots
+        for day in expand_recurrence(slot.booking_date, rule)
+    ]
+    if len(occurrences) > MAX_BATCH_OCCURRENCES:
+        raise ValueError(f"Batch expands to more than {MAX_BATCH_OCCURRENCES} bookings")
+    return occurrences
+
+
+async def create_bookings(
+    db: AsyncSession,
+    user_id: str,
+    occurrences: List[BookingSlot],
+    guest_emails: Optional[List[str]] = None,
+    notify_guests: bool = False,
+    skip_conflicts: bool = False,
+) -> List[BookingOccurrence]:
+    """Book many slots in one transaction.
+
+    Conflicts (with confirmed bookings or earlier occurrences in the same
+    batch) are found with one query plus an in-memory interval check; the
+    free occurrences are then inserted with a single executemany. Unless
+    skip_conflicts is set nothing is inserted when any occurrence conflicts.
+    Results are returned in input order.
+    """
+    windows = [booking_window(slot.booking_date, slot.start_time, slot.end_time) for slot in occurrences]
+    space_ids = sorted({slot.space_id for slot in occurrences})
+    trees = await confirmed_bookings_tree(
+        db, space_ids, min(window[0] for window in windows), max(window[1] for window in windows)
+    )
+
+    # Walk each space's occurrences by start time; the last accepted one has the latest end
+    conflicts: Dict[int, Tuple[str, object]] = {}
+    last_accepted: Dict[str, Tuple[datetime, int]] = {}
+    order = sorted(range(len(occurrences)), key=lambda i: (occurrences[i].space_id, windows[i][0]))
+    for i in order:
+        space_id = occurrences[i].space_id
+        starts_at, ends_at = windows[i]
+        existing = trees[space_id].overlapping(starts_at, ends_at)
+        if existing:
+            conflicts[i] = ("booking", existing[0][2])
+        elif space_id in last_accepted and last_accepted[space_id][0] > starts_at:
+            conflicts[i] = ("occurrence", last_accepted[space_id][1])
+        else:
+            last_accepted[space_id] = (ends_at, i)
+
+    accepted = [i for i in range(len(occurrences)) if i not in conflicts]
+    booking_ids: Dict[int, str] = {}
+    if accepted and (skip_conflicts or not conflicts):
+        ids = await id_allocator.next_ids(db, "BK", len(accepted))
+        booking_ids = dict(zip(accepted, ids))
+        guests = ",".join(guest_emails) if guest_emails else None
+        await db.execute(insert(Booking), [
+            {
+                "id": booking_ids[i],
+                "user_id": user_id,
+                "space_id": occurrences[i].space_id,
+                "booking_date": datetime.combine(occurrences[i].booking_date, time.min),
+                "start_time": occurrences[i].start_time.strftime("%H:%M"),
+                "end_time": occurrences[i].end_time.strftime("%H:%M"),
+                "starts_at": windows[i][0],
+                "ends_at": windows[i][1],
+                "status": BookingStatus.CONFIRMED,
+                "guest_emails": guests,
+                "notify_guests": notify_guests,
+            }
+            for i in accepted
+        ])
+        await _commit_or_conflict(db)
+
+    results = []
+    for i, slot in enumerate(occurrences):
+        result = BookingOccurrence(
+            space_id=slot.space_id,
+            booking_date=slot.booking_date,
+            start_time=slot.start_time.strftime("%H:%M"),
+            end_time=slot.end_time.strftime("%H:%M"),
+            status="created" if i in booking_ids else "skipped",
+            booking_id=booking_ids.get(i),
+        )
+        if i in conflicts:
+            kind, other = conflicts[i]
+            result.status = "conflict"
+            # Clashes inside the batch point at the other occurrence's booking, if it was created
+            result.conflicts_with = other if kind == "booking" else booking_ids.get(other)
+        results.append(result)
+    return results
+
+
+async def available_spaces(
+    db: AsyncSession,
+    building_id: str,
+    starts_at: datetime,
+    ends_at: datetime,
+    floor: Optional[str] = None,
+    block: Optional[str] = None,
+    space_type: Optional[SpaceType] = None,
+) -> List[dict]:
+    """Bookable spaces with no confirmed booking overlapping [starts_at, ends_at), in one query"""
+    busy = (
+        select(Booking.id)
+        .where(Booking.space_id == Space.id)
+        .where(Booking.status == BookingStatus.CONFIRMED)
+        .where(overlaps(db, starts_at, ends_at))
+    )
+    query = (
+        select_for(Space, SpaceResponse)
+        .where(Space.building_id == building_id)
+        .where(Space.is_available == True)
+        .where(~exists(busy))
+        .order_by(Space.floor, Space.block, Space.name)
+    )
+    if floor:
+        query = query.where(Space.floor == floor)
+    if block:
+        query = query.where(Space.block == block)
+    if space_type:
+        query = query.where(Space.type == space_type)
+    return rows_to_dicts(await db.execute(query))
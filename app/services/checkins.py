@@ -0,0 +1,172 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.ids import id_allocator
+from app.db.models import CheckIn, CheckInStatus, LaptopRecord, User, UserType, Visitor
+from app.schemas.checkins import CheckInCreate, RosterEntry
+from app.services.asset_registry import normalize_asset
+from app.services.roster import roster
+
+
+class AlreadyCheckedIn(Exception):
+    """The person already has an open check-in"""
+
+
+class NotCheckedIn(Exception):
+    """The person has no open check-in"""
+
+
+class UnknownPerson(Exception):
+    """No user or visitor with that id"""
+
+
+def _format_duration(minutes: int) -> str:
+    return f"{minutes // 60}h {minutes % 60}m"
+
+
+def open_checkin_query(person_id: str):
+    """Latest open check-in of a user or visitor"""
+    person = CheckIn.visitor_id if person_id.startswith("VIS-") else CheckIn.user_id
+    return (
+        select(CheckIn)
+        .where(person == person_id)
+        .where(CheckIn.status == CheckInStatus.CHECKED_IN)
+        .order_by(CheckIn.check_in_time.desc())
+        .limit(1)
+    )
+
+
+def open_laptop_record_query(user_id: str):
+    """Latest open laptop record of a user"""
+    return (
+        select(LaptopRecord)
+        .where(LaptopRecord.user_id == user_id)
+        .where(LaptopRecord.status == CheckInStatus.CHECKED_IN)
+        .order_by(LaptopRecord.check_in_date.desc())
+        .limit(1)
+    )
+
+
+async def check_in(db: AsyncSession, data: CheckInCreate) -> CheckIn:
+    """Open a check-in (plus a laptop record for employees carrying one) and add it to the roster
+
+    The person's users/visitors row is locked for the transaction, so two
+    workers cannot both open a check-in for them (checkins is partitioned, so
+    a unique index on the person is not available).
+    """
+    await roster.ensure_fresh(db)
+    person_id = data.user_id or data.visitor_id
+    person = await db.get(User if data.user_id else Visitor, person_id, with_for_update=True)
+    if person is None:
+        raise UnknownPerson()
+
+    # The roster only knows this worker's check-ins: confirm against the database
+    entry = roster.get(person_id)
+    if entry is not None:
+        open_checkin = await db.get(CheckIn, entry.checkin_id)
+        if open_checkin is not None and open_checkin.status == CheckInStatus.CHECKED_IN:
+            raise AlreadyCheckedIn()
+        # Checked out through another worker since the last resync
+        await roster.remove(person_id)
+    if await db.scalar(open_checkin_query(person_id).with_only_columns(CheckIn.id)) is not None:
+        raise AlreadyCheckedIn()
+
+    now = datetime.utcnow()
+    laptop_record = None
+    if data.user_id:
+        user = person
+        user_type = UserType.EMPLOYEE
+        laptop_model = data.laptop_model or user.laptop_model
+        laptop_asset_number = data.laptop_asset_number or user.laptop_asset_number
+        if laptop_asset_number:
+            laptop_record = LaptopRecord(
+                id=await id_allocator.next_id(db, "LAP"),
+                user_id=user.id,
+                registered_laptop=user.laptop_model,
+                registered_asset_number=user.laptop_asset_number,
+                checked_in_laptop=laptop_model,
+                checked_in_asset_number=laptop_asset_number,
+                is_match=normalize_asset(laptop_asset_number) == normalize_asset(user.laptop_asset_number),
+                building_id=data.building_id,
+                floor=data.floor,
+                block=data.block,
+                check_in_date=now,
+                check_in_time=now.strftime("%H:%M"),
+                status=CheckInStatus.CHECKED_IN,
+            )
+            db.add(laptop_record)
+    else:
+        user_type = UserType.VISITOR
+        laptop_model, laptop_asset_number = data.laptop_model, data.laptop_asset_number
+
+    checkin = CheckIn(
+        id=await id_allocator.next_id(db, "CHK"),
+        user_id=data.user_id,
+        visitor_id=data.visitor_id,
+        user_type=user_type,
+        building_id=data.building_id,
+        floor=data.floor,
+        block=data.block,
+        laptop_model=laptop_model,
+        laptop_asset_number=laptop_asset_number,
+        check_in_time=now,
+        status=CheckInStatus.CHECKED_IN,
+        qr_code_data=data.qr_code_data,
+    )
+    db.add(checkin)
+    await db.commit()
+
+    await roster.add(RosterEntry(
+        checkin_id=checkin.id,
+        person_id=person_id,
+        user_type=user_type,
+        building_id=data.building_id,
+        floor=data.floor,
+        block=data.block,
+        check_in_time=now,
+        laptop_record_id=laptop_record.id if laptop_record else None,
+        laptop_asset_number=laptop_asset_number,
+    ))
+    return checkin
+
+
+async def check_out(
+    db: AsyncSession, person_id: str, officer_name: Optional[str] = None, officer_badge: Optional[str] = None
+) -> CheckIn:
+    """Close the person's open check-in; the roster supplies the row ids, so no scan of checkins"""
+    await roster.ensure_fresh(db)
+    entry = roster.get(person_id)
+
+    if entry is not None:
+        checkin = await db.get(CheckIn, entry.checkin_id)
+        laptop_record = await db.get(LaptopRecord, entry.laptop_record_id) if entry.laptop_record_id else None
+    else:
+        # Checked in through another worker since the last resync
+        checkin = await db.scalar(open_checkin_query(person_id))
+        laptop_record = None
+        if checkin is not None and checkin.user_id:
+            laptop_record = await db.scalar(open_laptop_record_query(person_id))
+
+    if checkin is None or checkin.status != CheckInStatus.CHECKED_IN:
+        await roster.remove(person_id)
+        raise NotCheckedIn()
+
+    now = datetime.utcnow()
+    minutes = int((now - checkin.check_in_time).total_seconds() // 60)
+    checkin.check_out_time = now
+    checkin.duration_minutes = minutes
+    checkin.status = CheckInStatus.CHECKED_OUT
+    if laptop_record is not None and laptop_record.status == CheckInStatus.CHECKED_IN:
+        laptop_record.check_out_date = now
+        laptop_record.check_out_time = now.strftime("%H:%M")
+        laptop_record.duration = _format_duration(minutes)
+        laptop_record.checked_out_by_officer = officer_name
+        laptop_record.officer_badge = officer_badge
+        laptop_record.status = CheckInStatus.CHECKED_OUT
+    await db.commit()
+
+    await roster.remove(person_id)
+    return checkin
@@ -0,0 +1,88 @@
+"""Building -> floor -> block tree for building pickers (kiosk and admin UIs).
+
+The whole tree comes from one LEFT JOIN query and each building is
+serialised once to JSON; the bytes are cached per building under the current
+versions of the buildings/floors/blocks tables (see app/core/response_cache),
+so any write to those tables makes the next request rebuild them. A full
+tree response is just the cached per-building blobs joined together.
+"""
+from typing import Dict, List, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.response_cache import response_cache
+from app.db.models import Block, Building, Floor
+from app.schemas.buildings import BlockNode, BuildingTree, FloorNode
+
+TREE_TABLES = ("buildings", "floors", "blocks")
+ALL_BUILDINGS = "*"
+
+tree_cache = TTLCache(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL_SECONDS)
+_tree_json = TypeAdapter(BuildingTree)
+
+
+def tree_query(building_id: Optional[str] = None):
+    """One row per (building, floor, block), in display order; missing floors/blocks come back as NULLs"""
+    query = (
+        select(
+            Building.id, Building.name, Building.address, Building.is_active,
+            Floor.id, Floor.name, Floor.order,
+            Block.id, Block.name,
+        )
+        .outerjoin(Floor, Floor.building_id == Building.id)
+        .outerjoin(Block, Block.floor_id == Floor.id)
+        .order_by(Building.name, Building.id, Floor.order, Floor.name, Floor.id, Block.name, Block.id)
+    )
+    if building_id is not None:
+        return query.where(Building.id == building_id)
+    return query.where(Building.is_active == True)
+
+
+def build_trees(rows) -> List[BuildingTree]:
+    buildings: Dict[str, BuildingTree] = {}
+    floors: Dict[str, FloorNode] = {}
+    for building_id, name, address, is_active, floor_id, floor_name, order, block_id, block_name in rows:
+        building = buildings.get(building_id)
+        if building is None:
+            building = buildings[building_id] = BuildingTree(
+                id=building_id, name=name, address=address, is_active=is_active, floors=[]
+            )
+        if floor_id is None:
+            continue
+        floor = floors.get(floor_id)
+        if floor is None:
+            floor = floors[floor_id] = FloorNode(id=floor_id, name=floor_name, order=order, blocks=[])
+            building.floors.append(floor)
+        if block_id is not None:
+            floor.blocks.append(BlockNode(id=block_id, name=block_name))
+    return list(buildings.values())
+
+
+async def building_tree_blobs(db: AsyncSession, building_id: Optional[str] = None) -> List[bytes]:
+    """Serialised tree of one building, or of every active building; cached until a location write"""
+    versions = response_cache.store.get_many(TREE_TABLES)
+
+    if building_id is not None:
+        blob = tree_cache.get((building_id, versions))
+        if blob is not None:
+            return [blob]
+    else:
+        building_ids = tree_cache.get((ALL_BUILDINGS, versions))
+        if building_ids is not None:
+            blobs = [tree_cache.get((key, versions)) for key in building_ids]
+            if all(blob is not None for blob in blobs):
+                return blobs
+
+    trees = build_trees(await db.execute(tree_query(building_id)))
+    blobs = []
+    for tree in trees:
+        blob = _tree_json.dump_json(tree)
+        tree_cache.set((tree.id, versions), blob)
+        blobs.append(blob)
+    if building_id is None:
+        tree_cache.set((ALL_BUILDINGS, versions), [tree.id for tree in trees])
+    return blobs
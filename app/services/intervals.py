@@ -0,0 +1,69 @@
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterable, List, Optional, Tuple
+
+Interval = Tuple[Any, Any, Any]  # (start, end, payload), half-open [start, end)
+
+
+class IntervalTree:
+    """Static centered interval tree over half-open [start, end) intervals.
+
+    Built once in O(n log n); overlap queries cost O(log n + k). Used where
+    Postgres would use the GiST range index (SQLite tests, batch conflict
+    checks against rows already fetched).
+    """
+
+    __slots__ = ("center", "by_start", "starts", "by_end", "ends", "left", "right")
+
+    def __init__(self, intervals: Iterable[Interval]):
+        intervals = [interval for interval in intervals if interval[0] < interval[1]]
+        self.left: Optional[IntervalTree] = None
+        self.right: Optional[IntervalTree] = None
+        if not intervals:
+            self.center = None
+            self.by_start, self.starts, self.by_end, self.ends = [], [], [], []
+            return
+
+        # Median start: the interval starting there always stays at this node, so recursion terminates
+        starts = sorted(interval[0] for interval in intervals)
+        self.center = starts[len(starts) // 2]
+
+        here, left, right = [], [], []
+        for interval in intervals:
+            if interval[1] <= self.center:
+                left.append(interval)
+            elif interval[0] > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+
+        # Intervals containing the center, sorted both ways for bisecting
+        self.by_start = sorted(here, key=lambda interval: interval[0])
+        self.starts = [interval[0] for interval in self.by_start]
+        self.by_end = sorted(here, key=lambda interval: interval[1])
+        self.ends = [interval[1] for interval in self.by_end]
+        if left:
+            self.left = IntervalTree(left)
+        if right:
+            self.right = IntervalTree(right)
+
+    def overlapping(self, start: Any, end: Any) -> List[Interval]:
+        """All stored intervals that overlap [start, end)"""
+        found: List[Interval] = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node is None or node.center is None:
+                continue
+            if end <= node.center:
+                # Only intervals here that start before `end` can overlap
+                found.extend(node.by_start[:bisect_left(node.starts, end)])
+                stack.append(node.left)
+            elif start > node.center:
+                # Only intervals here that end after `start` can overlap
+                found.extend(node.by_end[bisect_right(node.ends, start):])
+                stack.append(node.right)
+            else:
+                found.extend(node.by_start)
+                stack.append(node.left)
+                stack.append(node.right)
+        return found
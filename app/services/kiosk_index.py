@@ -0,0 +1,71 @@
+import asyncio
+import time
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import User
+from app.db.projections import response_fields, rows_to_dicts, select_for
+from app.schemas.users import UserResponse
+from app.services.search import UserSearchIndex
+from app.services.user_events import subscribe
+
+ENTRY_FIELDS = response_fields(User, UserResponse)
+
+
+class KioskDirectory:
+    """Per-worker in-memory copy of the active directory for kiosk autocomplete.
+
+    Writes made through this worker are applied incrementally as they commit;
+    a full rebuild every `max_staleness` seconds picks up writes made by other
+    workers, which bounds how stale a result can be.
+    """
+
+    def __init__(self, max_staleness: float):
+        self.max_staleness = max_staleness
+        self._index: Optional[UserSearchIndex] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def is_stale(self) -> bool:
+        return self._index is None or time.monotonic() - self._loaded_at > self.max_staleness
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Rebuild the index from the database and swap it in"""
+        rows = await db.execute(select_for(User, UserResponse).where(User.is_active == True))
+        index = UserSearchIndex()
+        for entry in rows_to_dicts(rows):
+            index.add(entry["id"], entry["first_name"], entry["last_name"], entry)
+        self._index = index
+        self._loaded_at = time.monotonic()
+
+    async def search(self, db: AsyncSession, q: str, limit: int) -> List[dict]:
+        if self.is_stale():
+            async with self._lock:
+                # Another request may have rebuilt it while we waited
+                if self.is_stale():
+                    await self.refresh(db)
+        return self._index.search(q, limit)
+
+    def apply(self, before: Optional[dict], after: Optional[dict]) -> None:
+        """Fold a committed user change into the index"""
+        index = self._index
+        if index is None:
+            return
+        if after is None or not after.get("is_active"):
+            index.remove((after or before)["id"])
+            return
+        entry = {field: after.get(field) for field in ENTRY_FIELDS}
+        index.add(entry["id"], entry["first_name"], entry["last_name"], entry)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.KIOSK_INDEX_ENABLED,
+            "size": len(self._index) if self._index is not None else 0,
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._index is not None else None,
+        }
+
+
+kiosk_directory = KioskDirectory(settings.KIOSK_INDEX_MAX_STALENESS_SECONDS)
+subscribe(kiosk_directory.apply)
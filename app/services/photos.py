@@ -0,0 +1,183 @@
+"""Photo uploads (profile, visitor and space photos) and their thumbnails.
+
+Uploads are streamed to a temporary file while being hashed, then stored in
+the blob store under their SHA-256, so a photo uploaded twice is stored once
+and a photo URL always names the same bytes. WebP thumbnails are rendered in
+a worker pool right after upload (and lazily if one is ever missing), so
+kiosk and directory views never need the camera original. Being
+content-addressed, every URL can be cached by clients forever.
+
+Profile and visitor photos are faces: they are stored privately and only
+served to signed-in callers with a private Cache-Control. Space images are
+uploaded as public and stored (and deduplicated) in a separate namespace,
+so a face can never be fetched through the public URL.
+"""
+import hashlib
+import io
+import os
+import re
+import tempfile
+from typing import BinaryIO, Dict, Iterable, Tuple, Union
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.executors import BoundedExecutor
+from app.core.storage import get_blob_store
+from app.schemas.photos import PhotoUpload
+
+THUMBNAIL_SIZES = (128, 512)  # bounding box, pixels
+IMAGE_TYPES = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp"}
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+CHUNK_SIZE = 1024 * 1024
+# Content-addressed, so a response never changes; only public photos may sit in shared caches
+IMMUTABLE = "public, max-age=31536000, immutable"
+PRIVATE_IMMUTABLE = "private, max-age=31536000, immutable"
+
+image_executor = BoundedExecutor("images", settings.IMAGE_WORKERS)
+thumbnail_cache = TTLCache(settings.THUMBNAIL_CACHE_SIZE, ttl=86400)
+
+
+class InvalidImage(ValueError):
+    """Not a JPEG, PNG or WebP image"""
+
+
+class ImageTooLarge(InvalidImage):
+    """Upload exceeds UPLOAD_MAX_BYTES"""
+
+
+def _namespace(public: bool) -> str:
+    return "public/" if public else ""
+
+
+def original_key(digest: str, public: bool = False) -> str:
+    return f"{_namespace(public)}photos/{digest[:2]}/{digest}"
+
+
+def thumbnail_key(digest: str, size: int, public: bool = False) -> str:
+    return f"{_namespace(public)}thumbnails/{digest[:2]}/{digest}-{size}.webp"
+
+
+def photo_url(digest: str, public: bool = False) -> str:
+    return f"/api/v1/photos/{_namespace(public)}{digest}"
+
+
+def thumbnail_url(digest: str, size: int, public: bool = False) -> str:
+    return f"{photo_url(digest, public)}?size={size}"
+
+
+def sniff_content_type(data: bytes) -> str:
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+def spool_image(source: BinaryIO) -> Tuple[str, str, int, str]:
+    """Copy an upload to a temp file while hashing it; (path, digest, size, content type).
+
+    The caller deletes the file.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    handle, path = tempfile.mkstemp(prefix="upload-")
+    try:
+        with os.fdopen(handle, "wb") as target:
+            while chunk := source.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.UPLOAD_MAX_BYTES:
+                    raise ImageTooLarge(f"Photos are limited to {settings.UPLOAD_MAX_BYTES // (1024 * 1024)} MB")
+                digest.update(chunk)
+                target.write(chunk)
+        try:
+            with Image.open(path) as image:
+                image_format = image.format
+                image.verify()
+        except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError) as exc:
+            raise InvalidImage("Not a readable image") from exc
+        if image_format not in IMAGE_TYPES:
+            raise InvalidImage("Photos must be JPEG, PNG or WebP")
+    except Exception:
+        os.unlink(path)
+        raise
+    return path, digest.hexdigest(), size, IMAGE_TYPES[image_format]
+
+
+def render_thumbnails(source: Union[str, BinaryIO], sizes: Iterable[int]) -> Dict[int, bytes]:
+    """WebP thumbnails fitting each size x size box (CPU-bound, run in image_executor)"""
+    sizes = sorted(sizes, reverse=True)
+    thumbnails = {}
+    with Image.open(source) as image:
+        # JPEG can decode at a reduced scale directly, much cheaper for camera photos
+        image.draft("RGB", (sizes[0], sizes[0]))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        for size in sizes:
+            image.thumbnail((size, size), Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, format="WEBP", quality=80, method=4)
+            thumbnails[size] = buffer.getvalue()
+    return thumbnails
+
+
+async def _store_thumbnails(digest: str, thumbnails: Dict[int, bytes], public: bool) -> None:
+    store = get_blob_store()
+    for size, data in thumbnails.items():
+        await run_in_threadpool(store.put_bytes, thumbnail_key(digest, size, public), data, "image/webp")
+        thumbnail_cache.set((digest, size, public), data)
+
+
+async def save_photo(source: BinaryIO, public: bool = False) -> PhotoUpload:
+    """Store an uploaded photo (once per content and namespace) and its thumbnails"""
+    path, digest, size, content_type = await run_in_threadpool(spool_image, source)
+    store = get_blob_store()
+    try:
+        deduplicated = await run_in_threadpool(store.exists, original_key(digest, public))
+        if not deduplicated:
+            # Thumbnails first: an original in the store means its upload completed
+            thumbnails = await image_executor.run(render_thumbnails, path, THUMBNAIL_SIZES)
+            await _store_thumbnails(digest, thumbnails, public)
+            await run_in_threadpool(store.put_file, original_key(digest, public), path, content_type)
+    finally:
+        os.unlink(path)
+
+    return PhotoUpload(
+        digest=digest,
+        url=photo_url(digest, public),
+        thumbnails={size: thumbnail_url(digest, size, public) for size in THUMBNAIL_SIZES},
+        content_type=content_type,
+        size_bytes=size,
+        deduplicated=deduplicated,
+    )
+
+
+async def get_original(digest: str, public: bool = False) -> bytes:
+    """Original bytes; FileNotFoundError if there is no such photo"""
+    store, key = get_blob_store(), original_key(digest, public)
+    if not await run_in_threadpool(store.exists, key):
+        raise FileNotFoundError(digest)
+    return await run_in_threadpool(store.get_bytes, key)
+
+
+async def get_thumbnail(digest: str, size: int, public: bool = False) -> bytes:
+    """WebP thumbnail from memory or the store, rendered from the original if missing"""
+    data = thumbnail_cache.get((digest, size, public))
+    if data is not None:
+        return data
+
+    store, key = get_blob_store(), thumbnail_key(digest, size, public)
+    if await run_in_threadpool(store.exists, key):
+        data = await run_in_threadpool(store.get_bytes, key)
+        thumbnail_cache.set((digest, size, public), data)
+        return data
+
+    original = await get_original(digest, public)
+    thumbnails = await image_executor.run(render_thumbnails, io.BytesIO(original), [size])
+    await _store_thumbnails(digest, thumbnails, public)
+    return thumbnails[size]
@@ -0,0 +1,246 @@
+"""Attendance and occupancy reports over check-ins, bookings and laptop records.
+
+Rows are read through the sync job engine (a small pool counted in each web
+worker's connection budget) with server-side cursors, REPORT_CHUNK_ROWS at a
+time, into DataFrames holding only the columns a report needs; aggregation
+is vectorized pandas. Reports run in a small thread pool so
+the event loop stays free, and results are cached per (report, parameters).
+"""
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import pandas as pd
+from sqlalchemy import Select, select
+from sqlalchemy.engine import Engine
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.executors import BoundedExecutor
+from app.db.models import Booking, BookingStatus, CheckIn, LaptopRecord, Space, User
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+report_executor = BoundedExecutor("reports", settings.REPORT_WORKERS)
+report_cache = TTLCache(maxsize=settings.REPORT_CACHE_SIZE, ttl=settings.REPORT_CACHE_TTL_SECONDS)
+_in_flight: Dict[Hashable, asyncio.Future] = {}
+
+
+def read_frame(engine: Engine, query: Select, categories=("building_id", "programme")) -> pd.DataFrame:
+    """Stream `query` into one DataFrame, chunk by chunk; low-cardinality columns become categoricals"""
+    with engine.connect() as conn:
+        conn = conn.execution_options(stream_results=True, max_row_buffer=settings.REPORT_CHUNK_ROWS)
+        chunks = list(pd.read_sql(query, conn, chunksize=settings.REPORT_CHUNK_ROWS))
+    if not chunks:
+        return pd.DataFrame(columns=[column.name for column in query.selected_columns])
+    frame = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    for name in categories:
+        if name in frame:
+            frame[name] = frame[name].astype("category")
+    return frame
+
+
+def _window(start: date, end: date):
+    """[start, end] as datetimes, end day inclusive"""
+    return datetime.combine(start, datetime.min.time()), datetime.combine(end + timedelta(days=1), datetime.min.time())
+
+
+def _filtered(query: Select, building_column, building_id: Optional[str], programme: Optional[str]) -> Select:
+    if building_id:
+        query = query.where(building_column == building_id)
+    if programme:
+        query = query.where(User.programme == programme)
+    return query
+
+
+def load_checkins(engine: Engine, start: date, end: date, building_id=None, programme=None) -> pd.DataFrame:
+    window_start, window_end = _window(start, end)
+    query = (
+        select(
+            CheckIn.user_id, CheckIn.visitor_id, CheckIn.building_id, CheckIn.check_in_time,
+            CheckIn.check_out_time, CheckIn.duration_minutes, User.programme,
+        )
+        .outerjoin(User, User.id == CheckIn.user_id)
+        .where(CheckIn.check_in_time >= window_start)
+        .where(CheckIn.check_in_time < window_end)
+    )
+    frame = read_frame(engine, _filtered(query, CheckIn.building_id, building_id, programme))
+    frame["person_id"] = frame["user_id"].fillna(frame["visitor_id"])
+    for name in ("check_in_time", "check_out_time"):
+        frame[name] = pd.to_datetime(frame[name])
+    return frame
+
+
+def load_bookings(engine: Engine, start: date, end: date, building_id=None, programme=None) -> pd.DataFrame:
+    window_start, window_end = _window(start, end)
+    query = (
+        select(Booking.id, Booking.user_id, Booking.starts_at, Booking.ends_at, Booking.status, Space.building_id, User.programme)
+        .join(Space, Space.id == Booking.space_id)
+        .join(User, User.id == Booking.user_id)
+        .where(Booking.starts_at >= window_start)
+        .where(Booking.starts_at < window_end)
+    )
+    frame = read_frame(engine, _filtered(query, Space.building_id, building_id, programme))
+    for name in ("starts_at", "ends_at"):
+        frame[name] = pd.to_datetime(frame[name])
+    return frame
+
+
+def load_laptop_records(engine: Engine, start: date, end: date, building_id=None, programme=None) -> pd.DataFrame:
+    window_start, window_end = _window(start, end)
+    query = (
+        select(LaptopRecord.user_id, LaptopRecord.building_id, LaptopRecord.check_in_date, LaptopRecord.is_match, User.programme)
+        .join(User, User.id == LaptopRecord.user_id)
+        .where(LaptopRecord.check_in_date >= window_start)
+        .where(LaptopRecord.check_in_date < window_end)
+    )
+    frame = read_frame(engine, _filtered(query, LaptopRecord.building_id, building_id, programme))
+    frame["check_in_date"] = pd.to_datetime(frame["check_in_date"])
+    return frame
+
+
+def _records(frame: pd.DataFrame) -> list:
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict(orient="records")
+
+
+def occupancy_report(engine: Engine, start: date, end: date, period: str = "day", building_id=None, programme=None) -> dict:
+    """Visits, distinct people, average stay and laptop mismatches per building per day/week"""
+    checkins = load_checkins(engine, start, end, building_id, programme)
+    laptops = load_laptop_records(engine, start, end, building_id, programme)
+    freq = "W-SUN" if period == "week" else "D"  # weeks run Monday to Sunday
+
+    if checkins.empty:
+        return {"period": period, "rows": []}
+
+    checkins["period"] = checkins["check_in_time"].dt.to_period(freq).dt.start_time
+    grouped = checkins.groupby(["building_id", "period"], observed=True).agg(
+        visits=("person_id", "size"),
+        people=("person_id", "nunique"),
+        employees=("user_id", "nunique"),
+        visitors=("visitor_id", "nunique"),
+        avg_duration_minutes=("duration_minutes", "mean"),
+    )
+    if not laptops.empty:
+        laptops["period"] = laptops["check_in_date"].dt.to_period(freq).dt.start_time
+        laptops["mismatch"] = ~laptops["is_match"].fillna(False).astype(bool)
+        grouped = grouped.join(
+            laptops.groupby(["building_id", "period"], observed=True)["mismatch"].sum().rename("laptop_mismatches"),
+            how="left",
+        )
+    else:
+        grouped["laptop_mismatches"] = 0
+    grouped["laptop_mismatches"] = grouped["laptop_mismatches"].fillna(0).astype(int)
+    grouped["avg_duration_minutes"] = grouped["avg_duration_minutes"].round(1)
+
+    rows = grouped.reset_index().sort_values(["period", "building_id"])
+    rows["period"] = rows["period"].dt.date.astype(str)
+    return {"period": period, "rows": _records(rows)}
+
+
+def peak_hours_report(engine: Engine, start: date, end: date, building_id=None, programme=None) -> dict:
+    """Average number of people on site per weekday and hour, per building.
+
+    Each stay contributes +1 at its arrival hour and -1 after its departure
+    hour (stays never checked out end with their check-in day); a cumulative
+    sum over the hourly index gives presence for every hour without
+    expanding stays.
+    """
+    checkins = load_checkins(engine, start, end, building_id, programme)
+    if checkins.empty:
+        return {"weekdays": WEEKDAYS, "buildings": {}}
+
+    window_start, window_end = _window(start, end)
+    arrivals = checkins["check_in_time"].dt.floor("h")
+    # A forgotten checkout must not count as present for the rest of the range
+    day_end = checkins["check_in_time"].dt.normalize() + pd.Timedelta(days=1)
+    departures = (checkins["check_out_time"].fillna(day_end) - pd.Timedelta(microseconds=1)).dt.floor("h") + pd.Timedelta(hours=1)
+    events = pd.concat([
+        pd.DataFrame({"building_id": checkins["building_id"], "hour": arrivals, "delta": 1}),
+        pd.DataFrame({"building_id": checkins["building_id"], "hour": departures, "delta": -1}),
+    ])
+    hours = pd.date_range(window_start, window_end, freq="h", inclusive="left")
+
+    buildings = {}
+    for building, deltas in events.groupby("building_id", observed=True):
+        presence = deltas.groupby("hour")["delta"].sum().reindex(hours.union(deltas["hour"].unique()), fill_value=0).cumsum()
+        presence = presence.reindex(hours)
+        heatmap = presence.groupby([presence.index.dayofweek, presence.index.hour]).mean().unstack(fill_value=0)
+        heatmap = heatmap.reindex(index=range(7), columns=range(24), fill_value=0).fillna(0).round(2)
+        buildings[str(building)] = {
+            "heatmap": heatmap.values.tolist(),
+            "peak": {
+                "people": float(presence.max()),
+                "at": presence.idxmax().isoformat(),
+            },
+        }
+    return {"weekdays": WEEKDAYS, "buildings": buildings}
+
+
+def no_show_report(engine: Engine, start: date, end: date, group_by: str = "building", building_id=None, programme=None) -> dict:
+    """Share of past, uncancelled bookings whose user never checked in at that building that day"""
+    bookings = load_bookings(engine, start, end, building_id, programme)
+    bookings = bookings[
+        (bookings["status"] != BookingStatus.CANCELLED) & (bookings["ends_at"] <= pd.Timestamp(datetime.utcnow()))
+    ]
+    group_column = "programme" if group_by == "programme" else "building_id"
+    if bookings.empty:
+        return {"group_by": group_by, "rows": []}
+
+    checkins = load_checkins(engine, start, end, building_id, programme)
+    bookings = bookings.assign(day=bookings["starts_at"].dt.normalize())
+    attended = (
+        checkins.dropna(subset=["user_id"])
+        .assign(day=checkins["check_in_time"].dt.normalize())
+        .groupby(["user_id", "building_id", "day"], observed=True)["check_in_time"].min()
+        .rename("first_check_in")
+        .reset_index()
+    )
+    attended["building_id"] = attended["building_id"].astype(str)
+    bookings["building_id"] = bookings["building_id"].astype(str)
+    merged = bookings.merge(attended, on=["user_id", "building_id", "day"], how="left")
+    merged["no_show"] = merged["first_check_in"].isna() | (merged["first_check_in"] >= merged["ends_at"])
+
+    summary = merged.groupby(group_column, observed=True, dropna=False).agg(
+        bookings=("id", "size"),
+        no_shows=("no_show", "sum"),
+    )
+    summary["no_show_rate"] = (summary["no_shows"] / summary["bookings"]).round(3)
+    rows = summary.reset_index().rename(columns={group_column: group_by}).sort_values(group_by)
+    return {"group_by": group_by, "rows": _records(rows)}
+
+
+async def cached_report(key: Hashable, end: date, builder: Callable[..., Any], *args: Any) -> Any:
+    """Run builder(*args) in the report pool, sharing the result with concurrent and later callers"""
+    result = report_cache.get(key)
+    if result is not None:
+        return result
+
+    pending = _in_flight.get(key)
+    if pending is not None:
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise
+            # The caller computing it went away (disconnect, shutdown): take over
+            return await cached_report(key, end, builder, *args)
+
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = future
+    try:
+        result = await report_executor.run(builder, *args)
+        # Past ranges only change through late edits, so they can stay cached much longer
+        closed = end < datetime.utcnow().date()
+        report_cache.set(key, result, ttl=settings.REPORT_CACHE_CLOSED_TTL_SECONDS if closed else None)
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as exc:
+        future.set_exception(exc)
+        future.exception()  # mark retrieved when nobody else was waiting
+        raise
+    finally:
+        del _in_flight[key]
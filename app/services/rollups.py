@@ -0,0 +1,146 @@
+"""Hourly and daily occupancy rollups, folded in incrementally.
+
+Each source (check-ins, check-outs, bookings) has a watermark: a refresh
+aggregates only rows whose timestamp lies between the watermark and
+now - ROLLUP_LAG_SECONDS, adds the counts onto the rollup rows with an
+upsert, and advances the watermark in the same transaction. Dashboards
+read the rollup tables only.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import Booking, CheckIn, OccupancyDaily, OccupancyHourly, RollupWatermark, Space
+
+MEASURES = ("check_ins", "check_outs", "bookings")
+EPOCH = datetime(1970, 1, 1)
+
+Key = Tuple[str, str, datetime]  # (building_id, floor, hour)
+
+
+def _hour_bucket(session: Session, column):
+    if session.get_bind().dialect.name == "postgresql":
+        return func.date_trunc("hour", column)
+    return func.strftime("%Y-%m-%d %H:00:00", column)
+
+
+def _as_datetime(value) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def _checkins_by(column):
+    def query(session: Session, low: datetime, high: datetime):
+        floor = func.coalesce(CheckIn.floor, "")
+        hour = _hour_bucket(session, column)
+        return (
+            select(CheckIn.building_id, floor, hour, func.count())
+            .where(column > low)
+            .where(column <= high)
+            .where(CheckIn.building_id.is_not(None))
+            .group_by(CheckIn.building_id, floor, hour)
+        )
+    return query
+
+
+def _bookings_by_start(session: Session, low: datetime, high: datetime):
+    floor = func.coalesce(Space.floor, "")
+    hour = _hour_bucket(session, Booking.starts_at)
+    return (
+        select(Space.building_id, floor, hour, func.count())
+        .join(Space, Space.id == Booking.space_id)
+        .where(Booking.created_at > low)
+        .where(Booking.created_at <= high)
+        .where(Booking.starts_at.is_not(None))
+        .group_by(Space.building_id, floor, hour)
+    )
+
+
+# watermark source -> (measure it feeds, aggregate query over (low, high] bucketed by hour)
+SOURCES = {
+    "checkins.check_in_time": ("check_ins", _checkins_by(CheckIn.check_in_time)),
+    "checkins.check_out_time": ("check_outs", _checkins_by(CheckIn.check_out_time)),
+    "bookings.created_at": ("bookings", _bookings_by_start),
+}
+
+
+def _upsert(session: Session, model, keys: List[str], rows: List[dict]) -> None:
+    """Add the measures of `rows` onto existing rollup rows, inserting missing ones"""
+    if not rows:
+        return
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Rollup upserts are not implemented for {dialect}")
+    table = model.__table__
+    statement = insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={measure: table.c[measure] + statement.excluded[measure] for measure in MEASURES},
+    )
+    session.execute(statement, rows)
+
+
+def refresh_rollups(session: Session, now: Optional[datetime] = None) -> Dict[str, dict]:
+    """Fold new rows of every source into the rollups; returns what was applied per source"""
+    high = (now or datetime.utcnow()) - timedelta(seconds=settings.ROLLUP_LAG_SECONDS)
+    hourly: Dict[Key, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(MEASURES, 0))
+    report = {}
+
+    for source, (measure, query) in SOURCES.items():
+        # Row lock serialises concurrent refreshes (no-op on SQLite, which locks the whole file)
+        watermark = session.get(RollupWatermark, source, with_for_update=True)
+        if watermark is None:
+            watermark = RollupWatermark(source=source, value=EPOCH)
+            session.add(watermark)
+        low = watermark.value
+        if low >= high:
+            report[source] = {"rows": 0, "watermark": low.isoformat()}
+            continue
+
+        applied = 0
+        for building_id, floor, hour, count in session.execute(query(session, low, high)):
+            hourly[(building_id, floor, _as_datetime(hour))][measure] += count
+            applied += count
+        watermark.value = high
+        report[source] = {"rows": applied, "watermark": high.isoformat()}
+
+    daily: Dict[Key, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(MEASURES, 0))
+    for (building_id, floor, hour), counts in hourly.items():
+        day = daily[(building_id, floor, hour.replace(hour=0))]
+        for measure in MEASURES:
+            day[measure] += counts[measure]
+
+    _upsert(session, OccupancyHourly, ["building_id", "floor", "hour"], [
+        {"building_id": building_id, "floor": floor, "hour": hour, **counts}
+        for (building_id, floor, hour), counts in hourly.items()
+    ])
+    _upsert(session, OccupancyDaily, ["building_id", "floor", "day"], [
+        {"building_id": building_id, "floor": floor, "day": day, **counts}
+        for (building_id, floor, day), counts in daily.items()
+    ])
+    session.commit()
+    return report
+
+
+def rollup_query(model, building_id: str, start: datetime, end: datetime, floor: Optional[str] = None):
+    """Rollup rows of a building in [start, end), per floor when `floor` is given, otherwise summed over floors"""
+    period = model.hour if model is OccupancyHourly else model.day
+    totals = [func.sum(getattr(model, measure)).label(measure) for measure in MEASURES]
+    query = (
+        select(period.label("period"), *totals)
+        .where(model.building_id == building_id)
+        .where(period >= start)
+        .where(period < end)
+        .group_by(period)
+        .order_by(period)
+    )
+    if floor is not None:
+        query = query.where(model.floor == floor)
+    return query
@@ -0,0 +1,183 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import CheckIn, CheckInStatus, LaptopRecord
+from app.schemas.checkins import RosterEntry
+
+
+def open_checkins_query():
+    """Open check-ins with their open laptop record, oldest first (served by the partial indexes)"""
+    return (
+        select(
+            CheckIn.id, func.coalesce(CheckIn.user_id, CheckIn.visitor_id), CheckIn.user_type,
+            CheckIn.building_id, CheckIn.floor, CheckIn.block, CheckIn.check_in_time,
+            LaptopRecord.id, CheckIn.laptop_asset_number,
+        )
+        .outerjoin(LaptopRecord, and_(
+            LaptopRecord.user_id == CheckIn.user_id,
+            LaptopRecord.status == CheckInStatus.CHECKED_IN,
+        ))
+        .where(CheckIn.status == CheckInStatus.CHECKED_IN)
+        .where(CheckIn.building_id.is_not(None))
+        .order_by(CheckIn.check_in_time)
+    )
+
+
+class RosterStore(ABC):
+    """Shared copy of the roster, for other workers and services (e.g. a Redis hash per building).
+
+    Entries are plain JSON dicts keyed by person id. Only written to by
+    Roster; reads never block the check-in path on it.
+    """
+
+    @abstractmethod
+    async def replace(self, entries: List[dict]) -> None:
+        ...
+
+    @abstractmethod
+    async def put(self, entry: dict) -> None:
+        ...
+
+    @abstractmethod
+    async def discard(self, building_id: str, person_id: str) -> None:
+        ...
+
+    @abstractmethod
+    async def members(self, building_id: str) -> List[dict]:
+        ...
+
+
+class LocalRosterStore(RosterStore):
+    """In-process stand-in for a shared store (development and tests)"""
+
+    def __init__(self):
+        self._buildings: Dict[str, Dict[str, dict]] = {}
+
+    async def replace(self, entries: List[dict]) -> None:
+        buildings: Dict[str, Dict[str, dict]] = {}
+        for entry in entries:
+            buildings.setdefault(entry["building_id"], {})[entry["person_id"]] = entry
+        self._buildings = buildings
+
+    async def put(self, entry: dict) -> None:
+        self._buildings.setdefault(entry["building_id"], {})[entry["person_id"]] = entry
+
+    async def discard(self, building_id: str, person_id: str) -> None:
+        self._buildings.get(building_id, {}).pop(person_id, None)
+
+    async def members(self, building_id: str) -> List[dict]:
+        return list(self._buildings.get(building_id, {}).values())
+
+
+ROSTER_STORES = {
+    "local": LocalRosterStore,
+}
+
+
+class Roster:
+    """Who is currently on site, per building, kept in memory per worker.
+
+    Loaded from open check-ins on startup, updated as this worker checks
+    people in and out, and reloaded every `resync_seconds` to pick up
+    check-ins handled by other workers. When a shared store is configured
+    every change is mirrored into it as well.
+    """
+
+    def __init__(self, resync_seconds: float, store: Optional[RosterStore] = None):
+        self.resync_seconds = resync_seconds
+        self.store = store
+        self._buildings: Optional[Dict[str, Dict[str, RosterEntry]]] = None
+        self._where: Dict[str, str] = {}
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def is_stale(self) -> bool:
+        return self._buildings is None or time.monotonic() - self._loaded_at > self.resync_seconds
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """Reload from open check-ins (and their open laptop records) in one query"""
+        rows = await db.execute(open_checkins_query())
+        buildings: Dict[str, Dict[str, RosterEntry]] = {}
+        where: Dict[str, str] = {}
+        for row in rows:
+            entry = RosterEntry(
+                checkin_id=row[0], person_id=row[1], user_type=row[2], building_id=row[3], floor=row[4],
+                block=row[5], check_in_time=row[6], laptop_record_id=row[7], laptop_asset_number=row[8],
+            )
+            # Latest open check-in wins if a person somehow has several
+            previous = where.get(entry.person_id)
+            if previous is not None:
+                buildings[previous].pop(entry.person_id, None)
+            buildings.setdefault(entry.building_id, {})[entry.person_id] = entry
+            where[entry.person_id] = entry.building_id
+
+        self._buildings, self._where = buildings, where
+        self._loaded_at = time.monotonic()
+        if self.store is not None:
+            await self.store.replace([
+                entry.model_dump(mode="json") for members in buildings.values() for entry in members.values()
+            ])
+
+    async def ensure_fresh(self, db: AsyncSession) -> None:
+        if self.is_stale():
+            async with self._lock:
+                if self.is_stale():
+                    await self.rebuild(db)
+
+    def get(self, person_id: str) -> Optional[RosterEntry]:
+        building_id = self._where.get(person_id)
+        if building_id is None or self._buildings is None:
+            return None
+        return self._buildings[building_id].get(person_id)
+
+    def members(self, building_id: str) -> List[RosterEntry]:
+        return list((self._buildings or {}).get(building_id, {}).values())
+
+    def headcounts(self) -> Dict[str, int]:
+        return {
+            building_id: len(members)
+            for building_id, members in sorted((self._buildings or {}).items())
+            if members
+        }
+
+    async def add(self, entry: RosterEntry) -> None:
+        """Record a committed check-in"""
+        if self._buildings is not None:
+            await self.remove(entry.person_id)
+            self._buildings.setdefault(entry.building_id, {})[entry.person_id] = entry
+            self._where[entry.person_id] = entry.building_id
+        if self.store is not None:
+            await self.store.put(entry.model_dump(mode="json"))
+
+    async def remove(self, person_id: str) -> Optional[RosterEntry]:
+        """Record a committed check-out"""
+        building_id = self._where.pop(person_id, None)
+        if building_id is None or self._buildings is None:
+            return None
+        entry = self._buildings[building_id].pop(person_id, None)
+        if self.store is not None:
+            await self.store.discard(building_id, person_id)
+        return entry
+
+    def stats(self) -> dict:
+        return {
+            "on_site": len(self._where),
+            "buildings": len(self.headcounts()),
+            "shared_store": type(self.store).__name__ if self.store is not None else None,
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._buildings is not None else None,
+        }
+
+
+def _configured_store() -> Optional[RosterStore]:
+    if not settings.ROSTER_SHARED_STORE:
+        return None
+    return ROSTER_STORES[settings.ROSTER_SHARED_STORE]()
+
+
+roster = Roster(settings.ROSTER_RESYNC_SECONDS, _configured_store())
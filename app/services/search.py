@@ -0,0 +1,127 @@
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import User, USER_FULL_NAME
+from app.db.projections import rows_to_dicts, select_for
+from app.schemas.users import UserResponse
+
+# Same expression the trigram index is built on; a label renders as the bare expression in WHERE
+FULL_NAME = USER_FULL_NAME.element
+
+
+def normalize(text: Optional[str]) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def match_rank(query: str, first_name: str, last_name: str) -> Optional[int]:
+    """0 = full name starts with query, 1 = last name does, 2 = substring match, None = no match"""
+    full_name = normalize(f"{first_name} {last_name}")
+    if full_name.startswith(query):
+        return 0
+    if normalize(last_name).startswith(query):
+        return 1
+    if query in full_name:
+        return 2
+    return None
+
+
+class UserSearchIndex:
+    """Pure-Python prefix index over user names.
+
+    Every name word and the full name are kept in one sorted token list, so a
+    prefix lookup is a bisect plus a short scan. Substring matches (the tail
+    of what ILIKE '%q%' returns) fall back to a linear pass and are only
+    computed when the prefix matches do not fill the page.
+    """
+
+    def __init__(self):
+        self._tokens: List[Tuple[str, str]] = []
+        self._entries: Dict[str, Tuple[str, str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._entries
+
+    @staticmethod
+    def _tokenize(first_name: str, last_name: str) -> set:
+        full_name = normalize(f"{first_name} {last_name}")
+        return set(full_name.split()) | {full_name}
+
+    def add(self, user_id: str, first_name: str, last_name: str, item: Any) -> None:
+        """Insert or replace the entry for user_id"""
+        self.remove(user_id)
+        first_name, last_name = first_name or "", last_name or ""
+        for token in self._tokenize(first_name, last_name):
+            insort(self._tokens, (token, user_id))
+        self._entries[user_id] = (first_name, last_name, item)
+
+    def remove(self, user_id: str) -> None:
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return
+        for token in self._tokenize(entry[0], entry[1]):
+            position = bisect_left(self._tokens, (token, user_id))
+            if position < len(self._tokens) and self._tokens[position] == (token, user_id):
+                del self._tokens[position]
+
+    def search(self, q: str, limit: int) -> List[Any]:
+        query = normalize(q)
+        if not query:
+            return []
+
+        ranked = []
+        seen = set()
+        position = bisect_left(self._tokens, (query,))
+        while position < len(self._tokens) and self._tokens[position][0].startswith(query):
+            user_id = self._tokens[position][1]
+            position += 1
+            if user_id in seen:
+                continue
+            seen.add(user_id)
+            first_name, last_name, item = self._entries[user_id]
+            rank = match_rank(query, first_name, last_name)
+            if rank is not None:
+                ranked.append((rank, normalize(last_name), normalize(first_name), user_id, item))
+
+        if len(ranked) < limit:
+            for user_id, (first_name, last_name, item) in self._entries.items():
+                if user_id not in seen and query in normalize(f"{first_name} {last_name}"):
+                    ranked.append((2, normalize(last_name), normalize(first_name), user_id, item))
+
+        ranked.sort(key=lambda row: row[:4])
+        return [row[4] for row in ranked[:limit]]
+
+
+async def search_active_users(db: AsyncSession, q: str, limit: int) -> List[dict]:
+    """Ranked name search over active users: prefix matches first, then substring matches"""
+    if db.get_bind().dialect.name != "postgresql":
+        # No pg_trgm (e.g. SQLite in tests): rank in memory with the same rules
+        index = UserSearchIndex()
+        for user in rows_to_dicts(await db.execute(select_for(User, UserResponse).where(User.is_active == True))):
+            index.add(user["id"], user["first_name"], user["last_name"], user)
+        return index.search(q, limit)
+
+    query_text = normalize(q)
+    term = escape_like(query_text)
+    rank = case(
+        (FULL_NAME.ilike(f"{term}%", escape="\\"), 0),
+        (User.last_name.ilike(f"{term}%", escape="\\"), 1),
+        else_=2,
+    )
+    query = (
+        select_for(User, UserResponse)
+        .where(User.is_active == True)
+        .where(FULL_NAME.ilike(f"%{term}%", escape="\\"))
+        .order_by(rank, func.similarity(FULL_NAME, query_text).desc(), User.last_name, User.first_name, User.id)
+        .limit(limit)
+    )
+    return rows_to_dicts(await db.execute(query))
@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import List, Tuple
+
+from sqlalchemy import String, any_, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.principals import EXCLUDED_COLUMNS
+from app.db.models import User
+
+SNAPSHOT_COLUMNS = [column for column in User.__table__.columns if column.key not in EXCLUDED_COLUMNS]
+
+Change = Tuple[dict, dict]  # (before, after) snapshots, as user_changed expects
+
+
+def id_in(db: AsyncSession, column, ids: List[str]):
+    """column IN ids; on Postgres a single array parameter (= ANY(:ids)), whatever the list size"""
+    if db.get_bind().dialect.name == "postgresql":
+        return column == any_(literal(ids, ARRAY(String)))
+    return column.in_(ids)
+
+
+async def bulk_update_users(
+    db: AsyncSession, user_ids: List[str], values: dict, only_active: bool = False
+) -> List[Change]:
+    """Apply `values` to every listed user in one UPDATE ... RETURNING and commit.
+
+    On Postgres the statement joins users to a locked select of the same
+    rows, so RETURNING also carries each row's values from before the
+    update; listeners need both to move users between cached buckets.
+    SQLite evaluates such a join after the update, so there the old values
+    are read with a SELECT first, in the same transaction.
+    """
+    previous = select(*SNAPSHOT_COLUMNS).where(id_in(db, User.id, sorted(set(user_ids))))
+    if only_active:
+        previous = previous.where(User.is_active == True)
+    keys = [column.key for column in SNAPSHOT_COLUMNS]
+    statement = update(User).values(**values, updated_at=datetime.utcnow()).execution_options(synchronize_session=False)
+
+    if db.get_bind().dialect.name == "postgresql":
+        previous = previous.with_for_update().subquery("previous")
+        rows = await db.execute(
+            statement
+            .where(User.id == previous.c.id)
+            .returning(*SNAPSHOT_COLUMNS, *(previous.c[key] for key in keys))
+        )
+        width = len(keys)
+        changes = [(dict(zip(keys, row[width:])), dict(zip(keys, row[:width]))) for row in rows]
+    else:
+        before = {row.id: dict(row._mapping) for row in await db.execute(previous)}
+        rows = await db.execute(statement.where(User.id.in_(list(before))).returning(*SNAPSHOT_COLUMNS))
+        changes = [(before[row.id], dict(row._mapping)) for row in rows]
+
+    await db.commit()
+    return changes
+
+
+def missing_ids(user_ids: List[str], changes: List[Change]) -> List[str]:
+    changed = {after["id"] for _, after in changes}
+    return sorted(set(user_ids) - changed)
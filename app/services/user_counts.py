@@ -0,0 +1,99 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import User
+from app.services.user_events import subscribe
+
+Key = Tuple[Optional[str], Optional[str]]  # (building_id, programme)
+
+GROUP_BY_FIELDS = {
+    "building": ("building_id",),
+    "programme": ("programme",),
+    "building_programme": ("building_id", "programme"),
+}
+
+
+class UserCounts:
+    """Active-user counts per (building_id, programme), kept in memory per worker.
+
+    Loaded with one GROUP BY query, adjusted as this worker commits user
+    changes, and reloaded every `reconcile_seconds` to pick up writes made
+    elsewhere.
+    """
+
+    def __init__(self, reconcile_seconds: float):
+        self.reconcile_seconds = reconcile_seconds
+        self._counts: Optional[Counter] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def is_stale(self) -> bool:
+        return self._counts is None or time.monotonic() - self._loaded_at > self.reconcile_seconds
+
+    async def reconcile(self, db: AsyncSession) -> None:
+        rows = await db.execute(
+            select(User.building_id, User.programme, func.count())
+            .where(User.is_active == True)
+            .group_by(User.building_id, User.programme)
+        )
+        self._counts = Counter({(building_id, programme): count for building_id, programme, count in rows})
+        self._loaded_at = time.monotonic()
+
+    async def _ensure_fresh(self, db: AsyncSession) -> Counter:
+        if self.is_stale():
+            async with self._lock:
+                if self.is_stale():
+                    await self.reconcile(db)
+        return self._counts
+
+    async def count(self, db: AsyncSession, building_id: Optional[str] = None, programme: Optional[str] = None) -> int:
+        counts = await self._ensure_fresh(db)
+        return sum(
+            value for (key_building, key_programme), value in counts.items()
+            if (not building_id or key_building == building_id)
+            and (not programme or key_programme == programme)
+        )
+
+    async def breakdown(
+        self,
+        db: AsyncSession,
+        group_by: str,
+        building_id: Optional[str] = None,
+        programme: Optional[str] = None,
+    ) -> List[dict]:
+        """Counts grouped by building, programme or both, after applying the filters"""
+        counts = await self._ensure_fresh(db)
+        fields = GROUP_BY_FIELDS[group_by]
+        groups: Dict[tuple, int] = Counter()
+        for (key_building, key_programme), value in counts.items():
+            if building_id and key_building != building_id:
+                continue
+            if programme and key_programme != programme:
+                continue
+            row = {"building_id": key_building, "programme": key_programme}
+            groups[tuple(row[field] for field in fields)] += value
+        return [
+            {**dict(zip(fields, key)), "count": value}
+            for key, value in sorted(groups.items(), key=lambda item: tuple(str(part) for part in item[0]))
+            if value > 0
+        ]
+
+    def apply(self, before: Optional[dict], after: Optional[dict]) -> None:
+        """Move a user between buckets as its building/programme/active flag changes"""
+        counts = self._counts
+        if counts is None:
+            return
+        if before is not None and before.get("is_active"):
+            counts[(before.get("building_id"), before.get("programme"))] -= 1
+        if after is not None and after.get("is_active"):
+            counts[(after.get("building_id"), after.get("programme"))] += 1
+
+
+user_counts = UserCounts(settings.USER_COUNTS_RECONCILE_SECONDS)
+subscribe(user_counts.apply)
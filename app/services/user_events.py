@@ -0,0 +1,19 @@
+from typing import Callable, List, Optional
+
+# listener(before, after): column snapshots from app.core.principals.snapshot.
+# before is None for a new user; after is None when the row is gone.
+UserListener = Callable[[Optional[dict], Optional[dict]], None]
+
+_listeners: List[UserListener] = []
+
+
+def subscribe(listener: UserListener) -> UserListener:
+    """Register a per-worker listener for committed user changes"""
+    _listeners.append(listener)
+    return listener
+
+
+def user_changed(before: Optional[dict], after: Optional[dict]) -> None:
+    """Notify listeners after a user write has been committed"""
+    for listener in _listeners:
+        listener(before, after)
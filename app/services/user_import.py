@@ -0,0 +1,205 @@
+"""Bulk user import from CSV/XLSX (POST /api/v1/users/import and import_users.py).
+
+The file is parsed with pandas and every row is validated against
+UserCreate. Duplicate emails (within the file and against the database) and
+unknown buildings are found with one set query each. Passwords of the
+remaining rows are hashed across a process pool, IDs come from one sequence
+reservation, and the rows are loaded with COPY on Postgres (executemany
+elsewhere). Valid rows are imported; invalid ones are reported by line
+number and skipped.
+
+Synchronous on purpose: COPY goes through psycopg2, so callers use a sync
+session (the API runs it in a worker thread on the JobSessionLocal pool,
+scripts use SessionLocal).
+"""
+import csv
+import io
+import math
+import zipfile
+from datetime import datetime
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+import pandas as pd
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.executors import BoundedExecutor
+from app.core.ids import id_allocator
+from app.core.principals import EXCLUDED_COLUMNS
+from app.core.security import get_password_hash
+from app.db.models import Building, User
+from app.schemas.users import UserCreate, UserImportResult, UserImportRowError
+
+REQUIRED_COLUMNS = {"email", "first_name", "last_name"}
+USER_FIELDS = set(UserCreate.model_fields)
+# Column order of the COPY stream; defaults are applied here because COPY bypasses the ORM
+COPY_COLUMNS = [column.key for column in User.__table__.columns]
+LOOKUP_CHUNK = 5000
+
+# pbkdf2 holds the GIL, so imports hash in separate processes
+import_hasher = BoundedExecutor("user-import", settings.USER_IMPORT_HASH_WORKERS, kind="process")
+
+
+class ImportFileError(ValueError):
+    """The file cannot be imported at all (format, size or missing columns)"""
+
+
+def _column_name(header) -> str:
+    return "_".join(str(header).strip().lower().replace("-", " ").split())
+
+
+def read_user_file(source: BinaryIO, filename: str) -> pd.DataFrame:
+    """Every cell as a string ("" when empty), with normalised headers ("First Name" -> first_name)"""
+    suffix = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    try:
+        if suffix == "csv":
+            frame = pd.read_csv(source, dtype=str, keep_default_na=False)
+        elif suffix in ("xlsx", "xlsm"):
+            frame = pd.read_excel(source, dtype=str, keep_default_na=False, engine="openpyxl")
+        else:
+            raise ImportFileError("Unsupported file type, upload a .csv or .xlsx file")
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError, zipfile.BadZipFile) as exc:
+        raise ImportFileError(f"Could not read {filename}: {exc}") from exc
+
+    frame.columns = [_column_name(header) for header in frame.columns]
+    missing = REQUIRED_COLUMNS - set(frame.columns)
+    if missing:
+        raise ImportFileError(f"Missing columns: {', '.join(sorted(missing))}")
+    if len(frame) > settings.USER_IMPORT_MAX_ROWS:
+        raise ImportFileError(f"At most {settings.USER_IMPORT_MAX_ROWS} rows per import")
+    return frame.fillna("")
+
+
+def validate_rows(
+    frame: pd.DataFrame, default_password: Optional[str] = None
+) -> Tuple[List[Tuple[int, UserCreate]], List[UserImportRowError]]:
+    """(line, user) for rows that pass UserCreate and are unique in the file, plus errors for the rest"""
+    valid: List[Tuple[int, UserCreate]] = []
+    errors: List[UserImportRowError] = []
+    seen: Dict[str, int] = {}
+
+    for position, record in enumerate(frame.to_dict("records")):
+        line = position + 2  # header is line 1
+        data = {key: value.strip() for key, value in record.items() if key in USER_FIELDS and value.strip()}
+        if "password" not in data and default_password:
+            data["password"] = default_password
+        try:
+            user = UserCreate(**data)
+        except ValidationError as exc:
+            errors.append(UserImportRowError(row=line, email=data.get("email"), errors=[
+                f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+                for error in exc.errors()
+            ]))
+            continue
+
+        if user.email in seen:
+            errors.append(UserImportRowError(
+                row=line, email=user.email, errors=[f"email: duplicate of line {seen[user.email]}"]
+            ))
+            continue
+        seen[user.email] = line
+        valid.append((line, user))
+
+    return valid, errors
+
+
+def _existing(db: Session, column, values: set) -> set:
+    """Which of `values` exist in `column` (one query per LOOKUP_CHUNK values)"""
+    values = sorted(values)
+    found = set()
+    for start in range(0, len(values), LOOKUP_CHUNK):
+        found.update(db.scalars(select(column).where(column.in_(values[start:start + LOOKUP_CHUNK]))))
+    return found
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash on the import pool, a few chunks per worker to keep them all busy"""
+    if not passwords:
+        return []
+    chunksize = max(1, math.ceil(len(passwords) / (import_hasher.max_workers * 4)))
+    return import_hasher.map(get_password_hash, passwords, chunksize=chunksize)
+
+
+def _copy_value(value):
+    # Unquoted empty field = NULL in COPY's csv format
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def copy_users(db: Session, rows: List[dict]) -> None:
+    """Insert rows with COPY on Postgres/psycopg2, executemany otherwise"""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql" or bind.dialect.driver != "psycopg2":
+        db.execute(insert(User), rows)
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row[column]) for column in COPY_COLUMNS])
+    buffer.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY users ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+
+def import_users(
+    db: Session, frame: pd.DataFrame, default_password: Optional[str] = None, dry_run: bool = False
+) -> Tuple[UserImportResult, List[dict]]:
+    """Validate and load a parsed file; returns the result and snapshots of the created users"""
+    valid, errors = validate_rows(frame, default_password)
+
+    taken = _existing(db, User.email, {user.email for _, user in valid})
+    buildings = {user.building_id for _, user in valid if user.building_id}
+    unknown_buildings = buildings - _existing(db, Building.id, buildings)
+
+    accepted: List[UserCreate] = []
+    for line, user in valid:
+        problems = []
+        if user.email in taken:
+            problems.append("email: already registered")
+        if user.building_id in unknown_buildings:
+            problems.append(f"building_id: unknown building {user.building_id}")
+        if problems:
+            errors.append(UserImportRowError(row=line, email=user.email, errors=problems))
+        else:
+            accepted.append(user)
+    errors.sort(key=lambda error: error.row)
+
+    rows: List[dict] = []
+    if accepted and not dry_run:
+        ids = id_allocator.next_ids_sync(db, "USR", len(accepted))
+        hashes = hash_passwords([user.password for user in accepted])
+        now = datetime.utcnow()
+        rows = [
+            {
+                **dict.fromkeys(COPY_COLUMNS),
+                **user.model_dump(exclude={"password"}),
+                "id": user_id,
+                "hashed_password": hashed_password,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for user, user_id, hashed_password in zip(accepted, ids, hashes)
+        ]
+        copy_users(db, rows)
+        db.commit()
+
+    result = UserImportResult(
+        total_rows=len(frame),
+        created=len(rows),
+        failed=len(errors),
+        dry_run=dry_run,
+        user_ids=[row["id"] for row in rows],
+        errors=errors,
+    )
+    created = [{key: value for key, value in row.items() if key not in EXCLUDED_COLUMNS} for row in rows]
+    return result, created
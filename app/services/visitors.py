@@ -0,0 +1,141 @@
+"""Visitor pre-registration and QR passes.
+
+A host pre-registers a visitor and gets a pass: a random access token,
+encoded in a QR code. At the kiosk a single scan resolves the token through
+the unique index on visitors.access_token and opens the check-in, so the
+kiosk round trip is one indexed lookup plus the insert.
+
+QR images are rendered in a small worker pool (never on the event loop) and
+stored content-addressed (by the SHA-256 of the encoded payload) in the blob
+store, with the hottest ones kept in memory.
+"""
+import hashlib
+import io
+import secrets
+from datetime import datetime, timedelta
+from typing import Tuple
+
+import qrcode
+from qrcode.constants import ERROR_CORRECT_M
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.executors import BoundedExecutor
+from app.core.ids import id_allocator
+from app.core.storage import get_blob_store
+from app.db.models import CheckIn, User, Visitor
+from app.schemas.checkins import CheckInCreate
+from app.schemas.visitors import KioskScan, VisitorPreRegister
+from app.services.checkins import check_in
+
+PASS_PREFIX = "PCONNECT-VISITOR:"
+
+qr_executor = BoundedExecutor("qr", settings.QR_WORKERS)
+# digest -> PNG bytes; entries are immutable, the TTL only bounds memory held by idle passes
+qr_cache = TTLCache(settings.QR_CACHE_SIZE, ttl=settings.VISITOR_PASS_HOURS * 3600)
+
+
+class InvalidPass(Exception):
+    """The scanned pass is unknown, expired or for another building"""
+
+
+def pass_payload(access_token: str) -> str:
+    return f"{PASS_PREFIX}{access_token}"
+
+
+def parse_pass(qr_code_data: str) -> str:
+    """Access token from a scanned payload (kiosks may also send the bare token)"""
+    data = qr_code_data.strip()
+    return data[len(PASS_PREFIX):] if data.startswith(PASS_PREFIX) else data
+
+
+def qr_digest(payload: str) -> str:
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def qr_key(digest: str) -> str:
+    return f"qr/{digest[:2]}/{digest}.png"
+
+
+def render_qr_png(payload: str) -> bytes:
+    """PNG of a QR code for payload (CPU-bound, run in qr_executor)"""
+    code = qrcode.QRCode(error_correction=ERROR_CORRECT_M, box_size=8, border=2)
+    code.add_data(payload)
+    code.make(fit=True)
+    buffer = io.BytesIO()
+    code.make_image().save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+async def qr_png(payload: str) -> Tuple[str, bytes]:
+    """(digest, PNG) for payload: memory, then blob store, then render and store"""
+    digest = qr_digest(payload)
+    png = qr_cache.get(digest)
+    if png is not None:
+        return digest, png
+
+    store, key = get_blob_store(), qr_key(digest)
+    if await run_in_threadpool(store.exists, key):
+        png = await run_in_threadpool(store.get_bytes, key)
+    else:
+        png = await qr_executor.run(render_qr_png, payload)
+        await run_in_threadpool(store.put_bytes, key, png, "image/png")
+    qr_cache.set(digest, png)
+    return digest, png
+
+
+async def pre_register(db: AsyncSession, host: User, data: VisitorPreRegister) -> Visitor:
+    """Create the visitor with a fresh pass valid until VISITOR_PASS_HOURS after expected_at"""
+    visitor = Visitor(
+        id=await id_allocator.next_id(db, "VIS"),
+        first_name=data.first_name,
+        last_name=data.last_name,
+        company=data.company,
+        mobile=data.mobile,
+        email=data.email,
+        purpose=data.purpose,
+        host_employee_id=host.id,
+        host_employee_name=f"{host.first_name} {host.last_name}",
+        other_reason=data.other_reason,
+        building_id=data.building_id,
+        floor=data.floor,
+        block=data.block,
+        has_weapons=data.has_weapons,
+        weapon_details=data.weapon_details,
+        access_token=secrets.token_urlsafe(32),
+        expected_at=data.expected_at,
+        pass_expires_at=data.expected_at + timedelta(hours=settings.VISITOR_PASS_HOURS),
+    )
+    db.add(visitor)
+    await db.commit()
+    await db.refresh(visitor)
+    return visitor
+
+
+async def scan_in(db: AsyncSession, scan: KioskScan) -> CheckIn:
+    """Check a pre-registered visitor in from a scanned pass"""
+    visitor = await db.scalar(select(Visitor).where(Visitor.access_token == parse_pass(scan.qr_code_data)))
+    if visitor is None:
+        raise InvalidPass("Unknown visitor pass")
+    if visitor.pass_expires_at is not None and visitor.pass_expires_at < datetime.utcnow():
+        raise InvalidPass("Visitor pass has expired")
+    if visitor.building_id and visitor.building_id != scan.building_id:
+        raise InvalidPass("Visitor pass is for another building")
+
+    # Declarations confirmed at the kiosk are committed together with the check-in
+    if scan.has_weapons is not None:
+        visitor.has_weapons = scan.has_weapons
+        visitor.weapon_details = scan.weapon_details if scan.has_weapons else None
+    if scan.device_id:
+        visitor.device_id = scan.device_id
+
+    return await check_in(db, CheckInCreate(
+        visitor_id=visitor.id,
+        building_id=scan.building_id,
+        floor=visitor.floor,
+        block=visitor.block,
+        qr_code_data=pass_payload(visitor.access_token),
+    ))
@@ -0,0 +1,38 @@
+"""Partition maintenance for check-in and laptop history (run monthly, e.g. from cron).
+
+Creates the next PARTITION_MONTHS_AHEAD monthly partitions and moves months
+older than ARCHIVE_KEEP_MONTHS to blob storage as Parquet.
+
+Usage: python archive_history.py [--keep-months N] [--months-ahead N] [--dry-run]
+"""
+import argparse
+import sys
+
+from app.core.config import settings
+from app.core.storage import get_blob_store
+from app.db.database import engine
+from app.services.archive import run_maintenance
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keep-months", type=int, default=settings.ARCHIVE_KEEP_MONTHS)
+    parser.add_argument("--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD)
+    parser.add_argument("--dry-run", action="store_true", help="only list the partitions that would be archived")
+    args = parser.parse_args()
+
+    try:
+        log = run_maintenance(engine, get_blob_store(), args.keep_months, args.months_ahead, dry_run=args.dry_run)
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return 1
+
+    for line in log:
+        print(f"✅ {line}")
+    if not log:
+        print("ℹ️ Nothing to do")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
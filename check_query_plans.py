@@ -0,0 +1,127 @@
+"""Query plan regression check: do the hot queries still use their indexes?
+
+Runs EXPLAIN on the statements the app actually issues and fails if the
+expected index does not appear in the plan. Sequential scans are disabled
+for the check, so it reports whether an index *can* serve each query even
+on a small development database where the planner would rather scan.
+
+Usage: python check_query_plans.py   (needs a migrated Postgres, see .env)
+"""
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.db.database import SessionLocal
+from app.db.models import Booking, BookingStatus, CheckIn, LaptopRecord, Space
+from app.services.bookings import overlaps, user_bookings_query
+from app.services.checkins import open_checkin_query, open_laptop_record_query
+from app.services.roster import open_checkins_query
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def used_indexes(db, plan: dict) -> set:
+    """Indexes in the plan, as the parent index for scans of partition indexes
+
+    EXPLAIN on the partitioned checkins/laptop_records tables names the
+    per-partition indexes (checkins_y2026m10_building_id_check_in_time_idx);
+    pg_partition_root maps them back to the index defined in the migrations.
+    """
+    found = set()
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if "Index Name" in node:
+            found.add(node["Index Name"])
+        stack.extend(node.get("Plans", []))
+    if not found:
+        return found
+    rows = db.execute(
+        text(
+            "SELECT COALESCE(pg_partition_root(name::regclass), name::regclass)::text "
+            "FROM unnest(CAST(:names AS text[])) AS name"
+        ),
+        {"names": sorted(found)},
+    )
+    return {root for (root,) in rows}
+
+
+def hot_queries(db):
+    now = datetime.utcnow()
+    window_start, window_end = now, now + timedelta(hours=1)
+    return [
+        ("roster rebuild (open check-ins)", open_checkins_query(), "ix_checkins_open_building"),
+        ("checkout fallback (user)", open_checkin_query("USR-001"), "ix_checkins_open_user"),
+        ("checkout fallback (visitor)", open_checkin_query("VIS-000001"), "ix_checkins_open_visitor"),
+        ("open laptop record", open_laptop_record_query("USR-001"), "ix_laptop_records_open_user"),
+        ("my bookings", user_bookings_query("USR-001").limit(100), "ix_bookings_user_starts_at"),
+        (
+            "space bookings by date",
+            select(Booking.id).where(Booking.space_id == "SPC-001").where(Booking.booking_date >= now),
+            "ix_bookings_space_booking_date",
+        ),
+        (
+            "booking conflicts",
+            select(Booking.id)
+            .where(Booking.space_id == "SPC-001")
+            .where(Booking.status == BookingStatus.CONFIRMED)
+            .where(overlaps(db, window_start, window_end)),
+            "ex_bookings_space_time",
+        ),
+        (
+            "building check-ins by time",
+            select(CheckIn.id).where(CheckIn.building_id == "BLDG-001").where(CheckIn.check_in_time >= now),
+            "ix_checkins_building_check_in_time",
+        ),
+        (
+            "building laptop records by date",
+            select(LaptopRecord.id)
+            .where(LaptopRecord.building_id == "BLDG-001")
+            .where(LaptopRecord.check_in_date >= now),
+            "ix_laptop_records_building_check_in_date",
+        ),
+        (
+            "floor spaces",
+            select(Space.id).where(Space.building_id == "BLDG-001").where(Space.floor == "1"),
+            "ix_spaces_building_floor_block",
+        ),
+    ]
+
+
+def main() -> int:
+    failures = 0
+    with SessionLocal() as db:
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        queries = hot_queries(db)
+        for name, statement, index in queries:
+            plan = db.execute(Explain(statement)).scalar()[0]["Plan"]
+            indexes = used_indexes(db, plan)
+            if index in indexes:
+                print(f"✅ {name}: {index}")
+            else:
+                failures += 1
+                print(f"❌ {name}: expected {index}, plan used {sorted(indexes) or plan['Node Type']}")
+        db.rollback()
+
+    if failures:
+        print(f"\n{failures} of {len(queries)} hot queries no longer use their index")
+    else:
+        print(f"\nAll {len(queries)} hot queries use their indexes")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Create employees in bulk from a CSV or Excel file.
+
+Columns (header names are case-insensitive, spaces allowed): email,
+first_name, last_name, password, and optionally phone, building_id,
+programme, laptop_model, laptop_asset_number, photo_url, is_active.
+Valid rows are created; invalid ones are listed by line number.
+
+Usage: python import_users.py users.xlsx [--default-password PW] [--dry-run]
+"""
+import argparse
+import sys
+
+from app.db.database import SessionLocal
+from app.services.user_import import ImportFileError, import_hasher, import_users, read_user_file
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help=".csv or .xlsx file")
+    parser.add_argument("--default-password", help="password for rows without one")
+    parser.add_argument("--dry-run", action="store_true", help="validate only, create nothing")
+    args = parser.parse_args()
+
+    try:
+        with open(args.path, "rb") as source:
+            frame = read_user_file(source, args.path)
+        with SessionLocal() as db:
+            result, _ = import_users(db, frame, args.default_password, args.dry_run)
+    except (OSError, ImportFileError) as e:
+        print(f"❌ {str(e)}")
+        return 1
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return 1
+    finally:
+        import_hasher.shutdown()
+
+    for error in result.errors:
+        print(f"❌ Line {error.row} ({error.email or 'no email'}): {'; '.join(error.errors)}")
+    if result.dry_run:
+        print(f"ℹ️ Dry run: {result.total_rows - result.failed} of {result.total_rows} rows would be imported")
+    else:
+        print(f"✅ Created {result.created} of {result.total_rows} users")
+    return 0 if not result.errors else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
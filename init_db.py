@@ -7,7 +7,8 @@ from app.db.models import (
     Space, Booking, CheckIn, LaptopRecord
 )
 from app.db.database import engine, SessionLocal
-from app.core.security import get_password_hash, generate_id
+from app.core.security import get_password_hash
+from app.core.ids import id_allocator
 
 ADMIN_EMAIL = "admin@pconnect.com"
 ADMIN_PASSWORD = "Admin2354"   # Using same password as in .env for testing
@@ -18,7 +19,7 @@ def init_db():
     
     try:
         print("1. Creating all tables...")
-        # This will create all tables for all models imported above
+        # This will create all tables (and ID sequences) for all models imported above
         Base.metadata.create_all(bind=engine)
         print("✅ All tables created successfully:")
         # List all tables that were created
@@ -37,7 +38,7 @@ def init_db():
             # Create new admin user
             hashed_password = get_password_hash(ADMIN_PASSWORD)
             admin_user = AdminUser(
-                id=generate_id("ADM", 1),  # First admin
+                id=id_allocator.next_id_sync(db, "ADM"),
                 email=ADMIN_EMAIL,
                 first_name="Admin",
                 last_name="User",
@@ -1,14 +1,49 @@
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api.routes import auth, users, profile
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.api.routes import auth, users, profile, bookings, spaces, checkins, laptops, reports, occupancy, visitors, photos, buildings
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import AsyncSessionLocal, async_engine, get_async_db, pool_metrics
+from app.core.security import password_hasher
+from app.core.principals import admin_cache, token_cache, user_cache
+from app.core.response_cache import ResponseCacheMiddleware, response_cache
+from app.services.kiosk_index import kiosk_directory
+from app.services.asset_registry import asset_registry
+from app.services.reports import report_cache, report_executor
+from app.services.roster import roster
+from app.services.visitors import qr_cache, qr_executor
+from app.services.user_import import import_hasher
+from app.services.photos import image_executor, thumbnail_cache
+from app.services.hierarchy import tree_cache
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the on-site roster; if the DB is not reachable yet, the first request loads it
+    try:
+        async with AsyncSessionLocal() as db:
+            await roster.rebuild(db)
+    except Exception:
+        logger.warning("roster warm-up failed; it will be loaded on first use", exc_info=True)
+    yield
+    password_hasher.shutdown(wait=False)
+    report_executor.shutdown(wait=False)
+    qr_executor.shutdown(wait=False)
+    import_hasher.shutdown(wait=False)
+    image_executor.shutdown(wait=False)
+    await async_engine.dispose()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
-    description="P-Connect API - Employee and Visitor Management System"
+    description="P-Connect API - Employee and Visitor Management System",
+    lifespan=lifespan
 )
 
 # Include routers with tags
@@ -24,6 +59,45 @@ app.include_router(
     profile.router,
     tags=["Profile"]
 )
+app.include_router(
+    bookings.router,
+    tags=["Bookings"]
+)
+app.include_router(
+    spaces.router,
+    tags=["Spaces"]
+)
+app.include_router(
+    checkins.router,
+    tags=["Check-ins"]
+)
+app.include_router(
+    laptops.router,
+    tags=["Laptops"]
+)
+app.include_router(
+    reports.router,
+    tags=["Reports"]
+)
+app.include_router(
+    occupancy.router,
+    tags=["Occupancy"]
+)
+app.include_router(
+    visitors.router,
+    tags=["Visitors"]
+)
+app.include_router(
+    photos.router,
+    tags=["Photos"]
+)
+app.include_router(
+    buildings.router,
+    tags=["Buildings"]
+)
+
+# Reference-data GETs (registered by the routers) are answered from memory; CORS wraps it
+app.add_middleware(ResponseCacheMiddleware, cache=response_cache)
 
 # Configure CORS
 app.add_middleware(
@@ -32,6 +106,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 @app.get("/")
@@ -46,13 +121,32 @@ async def root():
 async def health_check():
     return {"status": "healthy", "version": settings.APP_VERSION}
 
+@app.get("/metrics")
+async def metrics():
+    """Worker pool metrics for this process"""
+    return {
+        "password_hashing": password_hasher.stats(),
+        "token_cache": token_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "admin_cache": admin_cache.stats(),
+        "kiosk_index": kiosk_directory.stats(),
+        "roster": roster.stats(),
+        "asset_registry": asset_registry.stats(),
+        "reports": {"pool": report_executor.stats(), "cache": report_cache.stats()},
+        "user_import": import_hasher.stats(),
+        "response_cache": response_cache.stats(),
+        "building_tree_cache": tree_cache.stats(),
+        "photos": {"pool": image_executor.stats(), "cache": thumbnail_cache.stats()},
+        "visitor_passes": {"pool": qr_executor.stats(), "cache": qr_cache.stats()},
+        "db_pool": pool_metrics(),
+    }
+
 @app.get("/db-test")
-async def test_db(db: Session = Depends(get_db)):
+async def test_db(db: AsyncSession = Depends(get_async_db)):
     """Test database connection"""
     try:
-        from sqlalchemy import text
         # Try to execute a simple query using proper SQLAlchemy text()
-        result = db.execute(text("SELECT 1"))
+        result = await db.execute(text("SELECT 1"))
         result.scalar()  # Actually fetch the result
         return {"status": "Database connection successful"}
     except Exception as e:
@@ -0,0 +1,28 @@
+"""Fold new check-ins, check-outs and bookings into the occupancy rollups.
+
+Cheap to run often (each run only reads rows newer than the stored
+watermarks), e.g. every few minutes from cron.
+
+Usage: python refresh_rollups.py
+"""
+import sys
+
+from app.db.database import SessionLocal
+from app.services.rollups import refresh_rollups
+
+
+def main() -> int:
+    try:
+        with SessionLocal() as db:
+            report = refresh_rollups(db)
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return 1
+
+    for source, applied in report.items():
+        print(f"✅ {source}: {applied['rows']} rows, watermark {applied['watermark']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())